@@ -0,0 +1,263 @@
+# benchmarks/bench_e2e.py
+# End-to-end benchmark against a local fixture server (never hits cei.org):
+#   crawl    listing pagination + detail fetch/parse through cei6.http → pages/s
+#   parse    per-page listing and detail parse time (median ms)
+#   storage  JSONL write throughput and URL-index rebuild via cei6.storage
+#   rss      peak resident set size of the run
+# Results are compared against a saved baseline to catch regressions.
+#
+#   python -m benchmarks.bench_e2e                                  # synthetic fixtures
+#   python -m benchmarks.bench_e2e --fixtures benchmarks/fixtures/recorded --latency 0.05
+#   python -m benchmarks.bench_e2e --save-baseline                  # record a new baseline
+#   python -m benchmarks.bench_e2e --fail-on-regression             # exit 1 if >10% worse
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks import fixtures
+from benchmarks.server import FixtureServer
+from cei6 import http, storage
+from cei6.details import DETAIL_PARSERS, iter_details
+from cei6.indexers import (
+    iter_blogs_pages,
+    iter_news_releases_pages,
+    iter_opeds_pages,
+    iter_studies_pages,
+)
+from cei6.indexers.blogs_indexer import parse_blogs_listing
+from cei6.indexers.news_indexer import parse_news_releases_listing
+from cei6.indexers.opeds_indexer import parse_opeds_listing
+from cei6.indexers.studies_indexer import parse_studies_listing
+from cei6.models import ListingItem
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+CRAWLERS = {
+    "blogs": iter_blogs_pages,
+    "news_releases": iter_news_releases_pages,
+    "op_eds": iter_opeds_pages,
+    "studies": iter_studies_pages,
+}
+LISTING_PARSERS = {
+    "blogs": parse_blogs_listing,
+    "news_releases": parse_news_releases_listing,
+    "op_eds": parse_opeds_listing,
+    "studies": parse_studies_listing,
+}
+LISTING_PATHS = {t: urlsplit(u).path for t, u in fixtures.LISTINGS.items()}
+
+
+def _classify(path: str) -> Tuple[Optional[str], bool]:
+    """(content type, is_listing_page) for a fixture path."""
+    for t, base in LISTING_PATHS.items():
+        if path.startswith(base):
+            rest = path[len(base):]
+            return t, rest == "" or rest.startswith("page/")
+    return None, False
+
+
+def bench_crawl(pages: Dict[str, bytes], concurrency: int) -> Dict[str, float]:
+    t0 = time.perf_counter()
+    before = http.connection_stats()["requests"]
+    listing_pages = 0
+    items: List[ListingItem] = []
+    for t, crawler in CRAWLERS.items():
+        if LISTING_PATHS[t] not in pages:
+            continue
+        for _, page_items in crawler(max_pages=None):
+            listing_pages += 1
+            # only details we have fixtures for; the rest would just 404
+            items.extend(it for it in page_items if urlsplit(it.url).path in pages)
+    details = sum(1 for _ in iter_details(items, concurrency=concurrency))
+    elapsed = time.perf_counter() - t0
+    return {
+        "crawl_pages_per_s": (listing_pages + details) / elapsed,
+        "crawl_listing_pages": listing_pages,
+        "crawl_detail_pages": details,
+        "crawl_requests": http.connection_stats()["requests"] - before,
+    }
+
+
+def _median_ms(fn: Callable[[], object], repeat: int) -> float:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def bench_parse(pages: Dict[str, bytes], repeat: int) -> Dict[str, float]:
+    listing_ms: List[float] = []
+    detail_ms: List[float] = []
+    for path, body in pages.items():
+        t, is_listing = _classify(path)
+        if t is None:
+            continue
+        html = body.decode("utf-8", "replace")
+        if is_listing:
+            listing_ms.append(_median_ms(lambda: LISTING_PARSERS[t](html), repeat))
+        elif t in DETAIL_PARSERS:
+            parse = DETAIL_PARSERS[t][1]
+            url = fixtures.ORIGIN + path
+            detail_ms.append(_median_ms(lambda: parse(html, url), repeat))
+    return {
+        "parse_listing_ms": statistics.median(listing_ms) if listing_ms else 0.0,
+        "parse_detail_ms": statistics.median(detail_ms) if detail_ms else 0.0,
+    }
+
+
+def bench_storage(records: int) -> Dict[str, float]:
+    tmp = tempfile.mkdtemp(prefix="cei6-bench-")
+    saved = storage.OUT_INDEX_DIR, storage.OUT_DETAILS_DIR
+    storage.OUT_INDEX_DIR = os.path.join(tmp, "index")
+    storage.OUT_DETAILS_DIR = os.path.join(tmp, "details")
+    try:
+        paragraphs = ["Body text " * 60] * 12
+        details = (
+            {
+                "content_type": "blogs",
+                "url": f"https://cei.org/blog/bench-{i}/",
+                "title": f"Bench post {i}",
+                "date_published": "2025-06-01T09:00:00",
+                "authors": [f"Author {i % 50}"],
+                "paragraphs": paragraphs,
+                "documents": [],
+            }
+            for i in range(records)
+        )
+        t0 = time.perf_counter()
+        written = storage.write_details_jsonl("blogs", details, batch_size=500)
+        write_s = time.perf_counter() - t0
+        path = os.path.join(storage.OUT_DETAILS_DIR, "blogs.jsonl")
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+
+        t0 = time.perf_counter()
+        scanned = len(storage._iter_existing_urls(path))
+        scan_s = time.perf_counter() - t0
+    finally:
+        storage.forget_url_index()
+        storage.OUT_INDEX_DIR, storage.OUT_DETAILS_DIR = saved
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {
+        "storage_write_records_per_s": written / write_s,
+        "storage_write_mb_per_s": size_mb / write_s,
+        "storage_scan_urls_per_s": scanned / scan_s,
+    }
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+# ---- baseline comparison -------------------------------------------------------
+
+def _higher_is_better(name: str) -> bool:
+    return name.endswith("_per_s")
+
+
+def _compared(name: str) -> bool:
+    return name.endswith(("_per_s", "_ms", "_mb")) and not name.startswith("crawl_requests")
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    """Print a comparison table; return names of metrics that regressed beyond tolerance."""
+    regressed = []
+    print(f"{'metric':<30} {'now':>12} {'baseline':>12} {'change':>9}")
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None or not _compared(name) or not base:
+            print(f"{name:<30} {value:>12.2f} {'-':>12}")
+            continue
+        change = (value - base) / base
+        worse = -change if _higher_is_better(name) else change
+        flag = ""
+        if worse > tolerance:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        elif worse < -tolerance:
+            flag = "  improved"
+        print(f"{name:<30} {value:>12.2f} {base:>12.2f} {change:>+8.1%}{flag}")
+    return regressed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="End-to-end cei6 benchmark against a local fixture server.")
+    ap.add_argument("--fixtures", default=None, help="Recorded fixture dir (default: synthetic pages).")
+    ap.add_argument("--synthetic-pages", type=int, default=3, help="Listing pages per type when synthetic (default: 3).")
+    ap.add_argument("--latency", type=float, default=0.0, help="Server latency per response, seconds.")
+    ap.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random latency, seconds.")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses that fail (default: 0).")
+    ap.add_argument("--error-status", type=int, default=503)
+    ap.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds sent with injected errors.")
+    ap.add_argument("--concurrency", type=int, default=4, help="Detail fetch concurrency (default: 4).")
+    ap.add_argument("--adaptive", action="store_true", help="Keep the adaptive rate limiter on (default: unthrottled).")
+    ap.add_argument("--repeat", type=int, default=5, help="Parse timing repetitions per page (default: 5).")
+    ap.add_argument("--records", type=int, default=20000, help="Records for the storage benchmark (default: 20000).")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE, help=f"Baseline JSON (default: {DEFAULT_BASELINE}).")
+    ap.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline.")
+    ap.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown before flagging (default: 0.10).")
+    ap.add_argument("--fail-on-regression", action="store_true", help="Exit 1 when any metric regresses.")
+    ap.add_argument("--json", action="store_true", help="Print results as JSON only.")
+    args = ap.parse_args(argv)
+
+    pages = fixtures.load(args.fixtures) if args.fixtures else fixtures.synthesize(pages=args.synthetic_pages)
+
+    results: Dict[str, float] = {}
+    with FixtureServer(
+        pages,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+    ) as srv:
+        http.configure(
+            pool_size=args.concurrency + 1,
+            origins={fixtures.ORIGIN: srv.origin},
+            adaptive=args.adaptive,
+            backoff=0.05,
+        )
+        try:
+            results.update(bench_crawl(pages, args.concurrency))
+        finally:
+            http.configure(origins={})
+        results["server_errors_injected"] = srv.errors
+    results.update(bench_parse(pages, args.repeat))
+    results.update(bench_storage(args.records))
+    results["peak_rss_mb"] = peak_rss_mb()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        baseline: Dict[str, float] = {}
+        if os.path.exists(args.baseline) and not args.save_baseline:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        regressed = compare(results, baseline, args.tolerance)
+        if regressed:
+            print(f"[bench] regressions: {', '.join(regressed)}")
+            if args.fail_on_regression:
+                return 1
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({k: round(v, 4) for k, v in results.items()}, f, indent=2)
+        print(f"[bench] baseline saved to {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+# benchmarks/bench_models.py
+# Construct + serialize N ListingItems: the old plain dataclass (per-instance
+# __dict__, regex normalization per construction, asdict) vs the slotted,
+# frozen model with cached author normalization and hand-written to_dict.
+#
+#   python -m benchmarks.bench_models              # 1,000,000 records
+#   python -m benchmarks.bench_models -n 200000
+from __future__ import annotations
+
+import argparse
+import gc
+import re
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cei6.models import ListingItem
+from cei6.storage import _to_record
+
+
+# --- the pre-slots model, kept here verbatim for comparison -----------------
+
+def _legacy_normalize_author(name: str) -> str:
+    name = re.sub(r"\s+", " ", name).strip()
+    name = re.sub(r"[,\s]+$", "", name)
+    return name
+
+
+def _legacy_normalize_authors(authors: List[str]) -> List[str]:
+    out: List[str] = []
+    seen = set()
+    for a in authors:
+        if not isinstance(a, str):
+            continue
+        clean = _legacy_normalize_author(a)
+        if clean and clean not in seen:
+            seen.add(clean)
+            out.append(clean)
+    return out
+
+
+@dataclass
+class LegacyListingItem:
+    content_type: str
+    title: str
+    url: str
+    date_published: Optional[datetime] = None
+    issue: Optional[str] = None
+    authors: List[str] = None
+
+    def __post_init__(self):
+        if self.authors is None:
+            self.authors = []
+        self.authors = _legacy_normalize_authors(self.authors)
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        if self.date_published and isinstance(self.date_published, datetime):
+            d["date_published"] = self.date_published.isoformat()
+        return d
+
+
+def _legacy_to_record(obj: Any) -> dict:
+    d = asdict(obj)
+    dp = d.get("date_published")
+    if isinstance(dp, datetime):
+        d["date_published"] = dp.isoformat()
+    return d
+
+
+# -----------------------------------------------------------------------------
+
+_AUTHORS = [[f"Author  {i}, "] if i % 3 else [f"Author {i}", f"Co Author {i % 11}"] for i in range(300)]
+_DATE = datetime(2025, 6, 1, 9, 0)
+
+
+def _build(cls: type, n: int) -> List[Any]:
+    return [
+        cls(
+            "blogs",
+            f"Post title {i}",
+            f"https://cei.org/blog/post-{i}/",
+            _DATE,
+            "Energy",
+            _AUTHORS[i % len(_AUTHORS)],
+        )
+        for i in range(n)
+    ]
+
+
+def _measure(cls: type, to_record: Callable[[Any], dict], n: int) -> Tuple[float, float, float]:
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    items = _build(cls, n)
+    built = time.perf_counter() - t0
+    mem, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    for it in items:
+        to_record(it)
+    ser = time.perf_counter() - t0
+    del items
+    return built, ser, mem / n
+
+
+def run(n: int) -> None:
+    print(f"{n:,} records")
+    print(f"{'model':<12} {'construct s':>12} {'serialize s':>12} {'bytes/record':>13}")
+    rows = [
+        ("legacy", LegacyListingItem, _legacy_to_record),
+        ("slotted", ListingItem, _to_record),
+    ]
+    base = None
+    for label, cls, ser in rows:
+        built, sert, per = _measure(cls, ser, n)
+        if base is None:
+            base = (built, sert, per)
+        print(
+            f"{label:<12} {built:>12.2f} {sert:>12.2f} {per:>13.0f}"
+            f"  x{base[0] / built:.1f} / x{base[1] / sert:.1f} / x{base[2] / per:.1f}"
+        )
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="ListingItem construction/serialization benchmark")
+    ap.add_argument("-n", type=int, default=1_000_000, help="Records to build (default: 1,000,000)")
+    args = ap.parse_args()
+    run(args.n)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+# benchmarks/bench_parse.py
+# Per-page parse time: html.parser (old path) vs lxml vs lxml + targeted subtree.
+#
+#   python -m benchmarks.bench_parse                      # synthetic CEI-like pages
+#   python -m benchmarks.bench_parse --listing a.html --detail b.html -n 50
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Callable, List, Tuple
+
+from cei6 import parsing
+from cei6.details.blogs_details import parse_blog_html
+from cei6.indexers.blogs_indexer import parse_blogs_listing
+
+MODES: List[Tuple[str, str, bool]] = [
+    ("html.parser (full)", "html.parser", False),
+    ("lxml (full)", "lxml", False),
+    ("lxml (targeted)", "lxml", True),
+]
+
+_CHROME = (
+    "<header class='site-header'><nav>"
+    + "".join(f"<a href='/issues/topic-{i}/'>Topic {i}</a>" for i in range(120))
+    + "</nav></header>"
+    + "<aside class='sidebar'>"
+    + "".join(f"<div class='widget'><p>Widget text {i} " + "lorem " * 30 + "</p></div>" for i in range(40))
+    + "</aside>"
+)
+_FOOTER = "<footer>" + "".join(f"<p><a href='/about/{i}/'>Footer {i}</a></p>" for i in range(80)) + "</footer>"
+
+
+def synthetic_listing(cards: int = 30) -> str:
+    body = "".join(
+        f"""<article class="post card">
+  <h2 class="entry-title"><a href="https://cei.org/blog/post-{i}/">Post title {i}</a></h2>
+  <time datetime="2025-0{1 + i % 9}-1{i % 10}T09:00:00">June 1, 2025</time>
+  <a href="/issues/energy/">Energy</a>
+  <a href="/experts/author-{i % 7}/">Author {i % 7}</a>
+  <p>{"Summary text " * 20}</p>
+</article>"""
+        for i in range(cards)
+    )
+    return f"<html><head><title>Blog</title></head><body>{_CHROME}<main id='main'>{body}</main>{_FOOTER}</body></html>"
+
+
+def synthetic_detail(paragraphs: int = 40) -> str:
+    paras = "".join(f"<p>Paragraph {i}. {'Body text ' * 40}</p>" for i in range(paragraphs))
+    return f"""<html><head><title>Post</title></head><body>{_CHROME}<main id="main"><article>
+<header class="entry-header"><h1 class="entry-title">A detail page</h1>
+<div class="entry-meta"><a href="/experts/jane-doe/">Jane Doe</a>
+<time datetime="2025-06-01T09:00:00">June 1, 2025</time><span class="badge">Energy</span></div></header>
+<div class="entry-content">{paras}<p><a href="/wp-content/uploads/x.pdf">PDF</a></p></div>
+</article></main>{_FOOTER}</body></html>"""
+
+
+def _time(fn: Callable[[], object], n: int) -> Tuple[float, float]:
+    fn()  # warm-up
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples), statistics.mean(samples)
+
+
+def run(listing_html: str, detail_html: str, n: int) -> None:
+    print(f"{'mode':<22} {'listing ms (med/mean)':>24} {'detail ms (med/mean)':>24}")
+    baseline = None
+    for label, parser, targeted in MODES:
+        parsing.configure(parser=parser, targeted=targeted)
+        lm = _time(lambda: parse_blogs_listing(listing_html), n)
+        dm = _time(lambda: parse_blog_html(detail_html, "https://cei.org/blog/x/"), n)
+        if baseline is None:
+            baseline = (lm[0], dm[0])
+        speed = f"  x{baseline[0] / lm[0]:.1f} / x{baseline[1] / dm[0]:.1f}"
+        print(f"{label:<22} {lm[0]:>11.2f} / {lm[1]:<10.2f} {dm[0]:>11.2f} / {dm[1]:<10.2f}{speed}")
+    parsing.configure(parser=parsing.DEFAULT_PARSER, targeted=True)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Parse-time benchmark for cei6 parsers.")
+    ap.add_argument("--listing", help="Saved listing page HTML (default: synthetic).")
+    ap.add_argument("--detail", help="Saved detail page HTML (default: synthetic).")
+    ap.add_argument("-n", type=int, default=30, help="Iterations per mode (default: 30).")
+    args = ap.parse_args()
+
+    def _read(path: str) -> str:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    listing = _read(args.listing) if args.listing else synthetic_listing()
+    detail = _read(args.detail) if args.detail else synthetic_detail()
+    run(listing, detail, args.n)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
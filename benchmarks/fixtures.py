@@ -0,0 +1,141 @@
+# benchmarks/fixtures.py
+# Page fixtures for the benchmark server: record real listing/detail pages once,
+# or synthesize CEI-like ones, then replay them locally.
+#
+#   python -m benchmarks.fixtures record --types blogs studies --pages 2 --details 10
+#   python -m benchmarks.fixtures synth --pages 5          # no network
+#
+# A fixture set is a directory with manifest.json ({"origin", "pages": {path: file}})
+# and one HTML file per page.
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from benchmarks.bench_parse import _CHROME, _FOOTER, synthetic_detail
+
+ORIGIN = "https://cei.org"
+DEFAULT_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "recorded")
+
+# type -> listing URL (as in the cei6.indexers modules)
+LISTINGS = {
+    "blogs": "https://cei.org/blog/",
+    "news_releases": "https://cei.org/news_releases/",
+    "op_eds": "https://cei.org/opeds_articles/",
+    "studies": "https://cei.org/studies/",
+}
+
+
+def _file_name(path: str) -> str:
+    name = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+    return name + ".html"
+
+
+def save(pages: Dict[str, bytes], out_dir: str, origin: str = ORIGIN) -> str:
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {"origin": origin, "pages": {}}
+    for path, body in sorted(pages.items()):
+        fname = _file_name(path)
+        with open(os.path.join(out_dir, fname), "wb") as f:
+            f.write(body)
+        manifest["pages"][path] = fname
+    mpath = os.path.join(out_dir, "manifest.json")
+    with open(mpath, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return mpath
+
+
+def load(fixture_dir: str) -> Dict[str, bytes]:
+    with open(os.path.join(fixture_dir, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    pages: Dict[str, bytes] = {}
+    for path, fname in manifest["pages"].items():
+        with open(os.path.join(fixture_dir, fname), "rb") as f:
+            pages[path] = f.read()
+    return pages
+
+
+def synthesize(pages: int = 3, cards: int = 30, types: Iterable[str] = LISTINGS) -> Dict[str, bytes]:
+    """CEI-like listing pages (cards link to detail pages on the same origin) and their details."""
+    from cei6.indexers.pagination import page_url
+
+    out: Dict[str, bytes] = {}
+    detail = synthetic_detail().encode("utf-8")
+    for t in types:
+        listing_url = LISTINGS[t]
+        for n in range(1, pages + 1):
+            body = "".join(
+                f"""<article class="post card">
+  <h2 class="entry-title"><a href="{listing_url}{t}-{n}-{i}/">{t} {n}.{i}</a></h2>
+  <time datetime="2025-0{1 + i % 9}-1{i % 10}T09:00:00">June 1, 2025</time>
+  <a href="/issues/energy/">Energy</a>
+  <a href="/experts/author-{i % 7}/">Author {i % 7}</a>
+  <p>{"Summary text " * 20}</p>
+</article>"""
+                for i in range(cards)
+            )
+            html = f"<html><body>{_CHROME}<main id='main'>{body}</main>{_FOOTER}</body></html>"
+            out[urlsplit(page_url(listing_url, n)).path] = html.encode("utf-8")
+            for i in range(cards):
+                out[urlsplit(f"{listing_url}{t}-{n}-{i}/").path] = detail
+    return out
+
+
+def record(types: Iterable[str], pages: int = 2, details: int = 10) -> Dict[str, bytes]:
+    """Fetch real pages through cei6.http (rate limited) for offline replay."""
+    from cei6 import http
+    from cei6.indexers import blogs_indexer, news_indexer, opeds_indexer, studies_indexer
+    from cei6.indexers.pagination import page_url
+
+    parsers = {
+        "blogs": blogs_indexer.parse_blogs_listing,
+        "news_releases": news_indexer.parse_news_releases_listing,
+        "op_eds": opeds_indexer.parse_opeds_listing,
+        "studies": studies_indexer.parse_studies_listing,
+    }
+    out: Dict[str, bytes] = {}
+    for t in types:
+        urls: List[str] = []
+        for n in range(1, pages + 1):
+            url = page_url(LISTINGS[t], n)
+            resp = http.get(url, timeout=30)
+            out[urlsplit(url).path] = resp.content
+            urls.extend(it.url for it in parsers[t](resp.text))
+            print(f"[record] {t}: {url}")
+        for url in [u for u in urls if u.startswith(ORIGIN)][:details]:
+            try:
+                out[urlsplit(url).path] = http.get(url, timeout=30).content
+                print(f"[record] {t}: {url}")
+            except Exception as e:
+                print(f"[warn] {url}: {e}")
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Record or synthesize benchmark page fixtures.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rec = sub.add_parser("record", help="Fetch real pages from cei.org.")
+    rec.add_argument("--types", nargs="+", default=list(LISTINGS), choices=list(LISTINGS))
+    rec.add_argument("--pages", type=int, default=2, help="Listing pages per type (default: 2).")
+    rec.add_argument("--details", type=int, default=10, help="Detail pages per type (default: 10).")
+    syn = sub.add_parser("synth", help="Generate synthetic pages (no network).")
+    syn.add_argument("--pages", type=int, default=3)
+    syn.add_argument("--cards", type=int, default=30)
+    for p in (rec, syn):
+        p.add_argument("--out", default=DEFAULT_DIR, help=f"Fixture directory (default: {DEFAULT_DIR}).")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "record":
+        pages = record(args.types, pages=args.pages, details=args.details)
+    else:
+        pages = synthesize(pages=args.pages, cards=args.cards)
+    print(f"[fixtures] {len(pages)} page(s) → {save(pages, args.out)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
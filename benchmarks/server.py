@@ -0,0 +1,120 @@
+# benchmarks/server.py
+# Local stand-in for cei.org: serves fixture pages by path, with injected
+# latency and errors. Point cei6 at it with http.configure(origins={...}).
+from __future__ import annotations
+
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+
+class FixtureServer:
+    """
+    with FixtureServer(pages, latency=0.05, error_rate=0.02) as srv:
+        http.configure(origins={"https://cei.org": srv.origin})
+
+    latency/jitter are seconds per response (uniform jitter on top); error_rate
+    is the chance of answering error_status instead (with Retry-After if set).
+    Unknown paths are 404s, which is how listing pagination finds its end.
+    Pages carry an ETag and answer a matching If-None-Match with 304.
+    """
+
+    def __init__(
+        self,
+        pages: Dict[str, bytes],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: Optional[float] = None,
+        seed: int = 0,
+    ):
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.served = 0
+        self.errors = 0
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _roll(self) -> tuple[float, bool]:
+        with self._rng_lock:
+            delay = self.latency + (self._rng.random() * self.jitter if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            else:
+                self.served += 1
+        return delay, fail
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real origin
+
+            def do_GET(self) -> None:
+                delay, fail = server._roll()
+                if delay:
+                    time.sleep(delay)
+                path = self.path.split("?", 1)[0]
+                body = server.pages.get(path)
+                if fail:
+                    self.send_response(server.error_status)
+                    if server.retry_after is not None:
+                        self.send_header("Retry-After", f"{server.retry_after:g}")
+                    body, ctype = b"", "text/plain"
+                elif body is None:
+                    self.send_response(404)
+                    body, ctype = b"not found", "text/plain"
+                else:
+                    etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+                    if self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        body = b""
+                    else:
+                        self.send_response(200)
+                    self.send_header("ETag", etag)
+                    ctype = "text/html; charset=utf-8"
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+    @property
+    def origin(self) -> str:
+        assert self._httpd is not None, "server not started"
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FixtureServer":
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="bench-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,97 @@
+# cei6/backends.py
+# Pluggable storage: the CLI writes listings/details through a backend.
+#   "jsonl"  -> outputs/{index,details}/{type}.jsonl (cei6.storage)
+#   "sqlite" -> outputs/cei6.sqlite (cei6.sqlite_store)
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from . import jsonio, storage
+
+
+class StorageBackend:
+    name = "base"
+    # Optional cei6.search.SearchIndex; detail writes are indexed as they pass through.
+    search = None
+
+    def write_listings(self, type_name: str, items: Iterable[Any]) -> int:
+        """Insert listings not yet stored (by URL). Returns rows/lines added."""
+        raise NotImplementedError
+
+    def write_details(self, type_name: str, details: Iterable[Any]) -> int:
+        """Insert detail records not yet stored (by URL). Returns rows/lines added."""
+        raise NotImplementedError
+
+    def replace_details(self, type_name: str, details: Iterable[Any]) -> int:
+        """Insert detail records, replacing stored ones with the same URL. Returns records written."""
+        raise NotImplementedError
+
+    def iter_records(self, kind: str, type_name: str) -> Iterator[Dict[str, Any]]:
+        """Stored records of one type, as dicts."""
+        raise NotImplementedError
+
+    def known_urls(self, type_name: str, kind: str = "index") -> set[str]:
+        raise NotImplementedError
+
+    def describe(self, kind: str, type_name: str) -> str:
+        """Human-readable location, for log lines."""
+        return self.name
+
+    def _tap(self, type_name: str, details: Iterable[Any], replace: bool = False) -> Iterable[Any]:
+        if self.search is None:
+            return details
+        return self.search.tap(type_name, details, replace=replace)
+
+    def close(self) -> None:
+        if self.search is not None:
+            self.search.close()
+            self.search = None
+
+
+class JsonlBackend(StorageBackend):
+    name = "jsonl"
+
+    def write_listings(self, type_name: str, items: Iterable[Any]) -> int:
+        return storage.write_index_jsonl(type_name, items)
+
+    def write_details(self, type_name: str, details: Iterable[Any]) -> int:
+        return storage.write_details_jsonl(type_name, self._tap(type_name, details))
+
+    def replace_details(self, type_name: str, details: Iterable[Any]) -> int:
+        return storage.replace_details_jsonl(type_name, self._tap(type_name, details, replace=True))
+
+    def iter_records(self, kind: str, type_name: str) -> Iterator[Dict[str, Any]]:
+        return jsonio.iter_jsonl(storage._jsonl_path(kind, type_name))
+
+    def known_urls(self, type_name: str, kind: str = "index") -> set[str]:
+        if kind == "index":
+            return storage.load_index_urls(type_name)
+        return storage.load_detail_urls(type_name)
+
+    def describe(self, kind: str, type_name: str) -> str:
+        return f"outputs/{kind}/{type_name}.jsonl"
+
+
+DEFAULT_DB_PATH = os.path.join(storage.ROOT_DIR, "outputs", "cei6.sqlite")
+
+
+def get_backend(
+    name: str = "jsonl",
+    db_path: Optional[str] = None,
+    search_path: Optional[str] = None,
+) -> StorageBackend:
+    """search_path attaches a full-text index that is updated as details are written."""
+    if name == "jsonl":
+        backend: StorageBackend = JsonlBackend()
+    elif name == "sqlite":
+        from .sqlite_store import SqliteBackend
+
+        backend = SqliteBackend(db_path or DEFAULT_DB_PATH)
+    else:
+        raise ValueError(f"unknown storage backend: {name}")
+    if search_path:
+        from .search import SearchIndex
+
+        backend.search = SearchIndex(search_path)
+    return backend
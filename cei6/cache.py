@@ -0,0 +1,207 @@
+# cei6/cache.py
+# On-disk HTTP response cache used by cei6.http.
+#
+# Layout under the cache dir:
+#   meta/<sha256(url)>.json    url, etag, last_modified, encoding, body hash
+#   blobs/<hh>/<sha256(body)>  raw body bytes (content-addressed, shared by URLs)
+#
+# Recency is kept in memory (an LRU order loaded once from the meta files'
+# mtimes, which every hit also touches so it survives restarts). When the blob
+# total exceeds max_bytes the least recently used entries are evicted down to
+# LOW_WATER of the cap, so a full cache doesn't evict on every store.
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+LOW_WATER = 0.9  # evict down to this fraction of max_bytes
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    final_url: str
+    body_sha: str
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    encoding: Optional[str] = None
+    content_type: Optional[str] = None
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max(0, int(max_bytes))
+        self._meta_dir = os.path.join(root, "meta")
+        self._blob_dir = os.path.join(root, "blobs")
+        os.makedirs(self._meta_dir, exist_ok=True)
+        os.makedirs(self._blob_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        # body_sha -> (size, refcount)
+        self._blobs: Dict[str, Tuple[int, int]] = {}
+        # url key -> body_sha, least recently used first
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+        self._total = 0
+        self._load()
+
+    # ---- paths ----
+    def _meta_path(self, url: str) -> str:
+        return os.path.join(self._meta_dir, _url_key(url) + ".json")
+
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self._blob_dir, sha[:2], sha)
+
+    def _load(self) -> None:
+        metas = []
+        for name in os.listdir(self._meta_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self._meta_dir, name)
+            try:
+                metas.append((os.path.getmtime(path), name[:-5], path))
+            except OSError:
+                continue
+        metas.sort()  # oldest access first
+        for _, key, path in metas:
+            entry = self._read_meta(path)
+            if entry is None:
+                continue
+            self._lru[key] = entry.body_sha
+            self._add_ref(entry.body_sha, entry.size)
+
+    @staticmethod
+    def _read_meta(path: str) -> Optional[CacheEntry]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return CacheEntry(**json.load(f))
+        except Exception:
+            return None
+
+    # ---- API ----
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        path = self._meta_path(url)
+        entry = self._read_meta(path)
+        if entry is None or not os.path.exists(self._blob_path(entry.body_sha)):
+            return None
+        key = _url_key(url)
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+        try:
+            os.utime(path)  # recency for the next process
+        except OSError:
+            pass
+        return entry
+
+    def read_body(self, entry: CacheEntry) -> Optional[bytes]:
+        """The cached body; None (and the entry dropped) if the blob is gone or unreadable."""
+        try:
+            with open(self._blob_path(entry.body_sha), "rb") as f:
+                return f.read()
+        except OSError:
+            # evicted or replaced by another thread since lookup(): a miss
+            with self._lock:
+                self._drop(_url_key(entry.url), entry.body_sha)
+            return None
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        final_url: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        encoding: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> CacheEntry:
+        sha = hashlib.sha256(body).hexdigest()
+        entry = CacheEntry(
+            url=url,
+            final_url=final_url or url,
+            body_sha=sha,
+            size=len(body),
+            etag=etag,
+            last_modified=last_modified,
+            encoding=encoding,
+            content_type=content_type,
+        )
+        key = _url_key(url)
+        with self._lock:
+            blob = self._blob_path(sha)
+            if sha not in self._blobs or not os.path.exists(blob):
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                _atomic_write(blob, body)
+            old = self._lru.get(key)
+            if old != sha:  # same body: refcount unchanged
+                if old is not None:
+                    self._release(old)
+                self._add_ref(sha, len(body))
+            self._lru[key] = sha
+            self._lru.move_to_end(key)
+            _atomic_write(
+                self._meta_path(url),
+                json.dumps(asdict(entry), ensure_ascii=False).encode("utf-8"),
+            )
+            self._evict()
+        return entry
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": sum(r for _, r in self._blobs.values()), "bytes": self._total}
+
+    # ---- eviction ----
+    def _add_ref(self, sha: str, size: int) -> None:
+        size, refs = self._blobs.get(sha, (size, 0))
+        if refs == 0:
+            self._total += size
+        self._blobs[sha] = (size, refs + 1)
+
+    def _drop(self, key: str, sha: str) -> None:
+        # forget one URL's entry, unless it was re-stored with another body since
+        current = self._lru.get(key)
+        if current is not None and current != sha:
+            return
+        if current is not None:
+            del self._lru[key]
+            self._release(sha)
+        try:
+            os.remove(os.path.join(self._meta_dir, key + ".json"))
+        except OSError:
+            pass
+
+    def _release(self, sha: str) -> None:
+        size, refs = self._blobs.get(sha, (0, 0))
+        if refs <= 1:
+            self._blobs.pop(sha, None)
+            self._total -= size
+            try:
+                os.remove(self._blob_path(sha))
+            except OSError:
+                pass
+        else:
+            self._blobs[sha] = (size, refs - 1)
+
+    def _evict(self) -> None:
+        if not self.max_bytes or self._total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * LOW_WATER)
+        while self._lru and self._total > target:
+            key, sha = next(iter(self._lru.items()))
+            self._drop(key, sha)
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
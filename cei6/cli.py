@@ -1,36 +1,268 @@
 import argparse
-from typing import Dict, Iterable, List
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
 
-from .models import ListingItem
+from . import http, metrics, parsing
+from .dates import normalize_date
+from .models import DateWindow, ListingItem
 from .indexers import (
     fetch_blogs_first_page,
     fetch_news_releases_first_page,
     fetch_opeds_first_page,
     fetch_studies_first_page,
+    iter_blogs_pages,
+    iter_news_releases_pages,
+    iter_opeds_pages,
+    iter_studies_pages,
 )
-from .storage import write_index_jsonl
+from .console import say
+from .crawl import ListingCrawl, run_per_type, stream_type
+from .details import HostLimiter
+from .pipeline import default_parse_workers
+from .revalidate import DEFAULT_LIMIT, DEFAULT_MAX_AGE_DAYS
+from .state import load_state, save_state
+from .backends import DEFAULT_DB_PATH, StorageBackend, get_backend
+from .search import DEFAULT_SEARCH_DB
+from .storage import ROOT_DIR
 
+DEFAULT_CACHE_DIR = os.path.join(ROOT_DIR, "outputs", "cache")
+DEFAULT_SEGMENTS_DIR = os.path.join(ROOT_DIR, "outputs", "segments")
+ALL_TYPES = ("blogs", "news_releases", "op_eds", "studies")
 
-def _print_items(label: str, items: Iterable[ListingItem]) -> None:
-    items = list(items)
-    print(f"== {label} — {len(items)} item(s) ==")
-    for i, it in enumerate(items, 1):
+
+def _print_items(label: str, items: Sequence[ListingItem], start: int = 1) -> None:
+    # one block, so output from concurrently crawled types doesn't interleave
+    lines = [f"== {label} — {len(items)} item(s) =="]
+    for i, it in enumerate(items, start):
         author_str = ""
         if it.authors:
             author_str = " • By " + ", ".join(it.authors)
         issue_str = f" • {it.issue}" if it.issue else ""
-        print(f"{i:02d}. {it.title} | {it.url} | {it.date_published}{issue_str}{author_str}")
+        lines.append(f"{i:02d}. {it.title} | {it.url} | {it.date_published}{issue_str}{author_str}")
+    say("\n".join(lines))
+
+
+def _date_arg(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an ISO date: {value!r} (e.g. 2024-01-01)")
+
+
+def _cmd_pack(argv: Sequence[str]) -> int:
+    from .segments import CODECS, DEFAULT_FRAME_RECORDS, SegmentReader, pack_jsonl
+    from .storage import OUT_DETAILS_DIR, OUT_INDEX_DIR
+
+    parser = argparse.ArgumentParser(
+        prog="cei6 pack",
+        description="Convert outputs/{index,details}/*.jsonl into compressed segment files with a URL index.",
+    )
+    parser.add_argument("--types", nargs="+", default=list(ALL_TYPES), help="Types to pack (default: all).")
+    parser.add_argument("--kind", choices=["index", "details", "both"], default="both")
+    parser.add_argument("--codec", choices=CODECS, default="gzip", help="Frame compression (zstd needs 'zstandard').")
+    parser.add_argument(
+        "--frame-records",
+        type=int,
+        default=DEFAULT_FRAME_RECORDS,
+        help=f"Records per compressed frame; smaller = faster lookups, larger = better ratio (default: {DEFAULT_FRAME_RECORDS}).",
+    )
+    parser.add_argument("--out", default=DEFAULT_SEGMENTS_DIR, help=f"Output directory (default: {DEFAULT_SEGMENTS_DIR}).")
+    parser.add_argument("--get", metavar="URL", default=None, help="Print one record from the packed files instead of packing.")
+    args = parser.parse_args(argv)
+
+    kinds = ("index", "details") if args.kind == "both" else (args.kind,)
+    for kind in kinds:
+        src_dir = OUT_INDEX_DIR if kind == "index" else OUT_DETAILS_DIR
+        for t in args.types:
+            dest = os.path.join(args.out, kind, f"{t}.seg")
+            if args.get:
+                if os.path.exists(dest):
+                    with SegmentReader(dest) as r:
+                        rec = r.get(args.get)
+                    if rec is not None:
+                        print(f"[{kind}/{t}]")
+                        print(json.dumps(rec, ensure_ascii=False, indent=2))
+                continue
+            src = os.path.join(src_dir, f"{t}.jsonl")
+            if not os.path.exists(src):
+                continue
+            n = pack_jsonl(src, dest, codec=args.codec, frame_records=args.frame_records)
+            before, after = os.path.getsize(src), os.path.getsize(dest)
+            ratio = f" ({after * 100 // max(1, before)}% of {before // 1024} KiB)" if before else ""
+            print(f"[pack] {kind}/{t}: {n} record(s) → {dest}{ratio}")
+    return 0
+
+
+def _cmd_export(argv: Sequence[str]) -> int:
+    from .parquet_export import DEFAULT_BATCH_SIZE, DEFAULT_PARQUET_DIR, export_parquet
+
+    parser = argparse.ArgumentParser(
+        prog="cei6 export",
+        description="Export outputs/{index,details}/*.jsonl to Parquet partitioned by content_type and year.",
+    )
+    parser.add_argument("--format", choices=["parquet"], default="parquet")
+    parser.add_argument("--types", nargs="+", default=list(ALL_TYPES), help="Types to export (default: all).")
+    parser.add_argument("--kind", choices=["index", "details", "both"], default="both")
+    parser.add_argument("--out", default=DEFAULT_PARQUET_DIR, help=f"Output directory (default: {DEFAULT_PARQUET_DIR}).")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Records converted per batch; bounds memory (default: {DEFAULT_BATCH_SIZE}).",
+    )
+    parser.add_argument("--compression", default="zstd", help="Parquet compression codec (default: zstd).")
+    args = parser.parse_args(argv)
+
+    kinds = ("index", "details") if args.kind == "both" else (args.kind,)
+    for kind in kinds:
+        for t in args.types:
+            try:
+                counts = export_parquet(
+                    kind, t, out_dir=args.out, batch_size=args.batch_size, compression=args.compression
+                )
+            except RuntimeError as e:
+                print(f"[error] {e}")
+                return 2
+            if counts:
+                years = ", ".join(f"{y}: {n}" for y, n in sorted(counts.items()))
+                print(f"[export] {kind}/{t}: {sum(counts.values())} row(s) → {args.out} ({years})")
+    return 0
 
 
-def main() -> int:
+def _cmd_compact(argv: Sequence[str]) -> int:
+    from .compact import DEFAULT_CHUNK_BYTES, compact_jsonl
+    from .storage import OUT_DETAILS_DIR, OUT_INDEX_DIR
+
+    parser = argparse.ArgumentParser(
+        prog="cei6 compact",
+        description=(
+            "Rewrite outputs/{index,details}/*.jsonl: one line per URL (newest version), "
+            "corrupt lines dropped, sorted by date_published. Files are replaced atomically."
+        ),
+    )
+    parser.add_argument("--types", nargs="+", default=list(ALL_TYPES), help="Types to compact (default: all).")
+    parser.add_argument("--kind", choices=["index", "details", "both"], default="both")
+    parser.add_argument(
+        "--chunk-mb",
+        type=int,
+        default=DEFAULT_CHUNK_BYTES // (1024 * 1024),
+        help=f"Sort this much in memory before spilling to temp files (default: {DEFAULT_CHUNK_BYTES // (1024 * 1024)}).",
+    )
+    args = parser.parse_args(argv)
+
+    kinds = ("index", "details") if args.kind == "both" else (args.kind,)
+    for kind in kinds:
+        src_dir = OUT_INDEX_DIR if kind == "index" else OUT_DETAILS_DIR
+        for t in args.types:
+            path = os.path.join(src_dir, f"{t}.jsonl")
+            if not os.path.exists(path):
+                continue
+            st = compact_jsonl(path, chunk_bytes=max(1, args.chunk_mb) * 1024 * 1024)
+            print(
+                f"[compact] {kind}/{t}: {st.read} → {st.kept} line(s)"
+                f" • duplicates: {st.duplicates} • corrupt: {st.corrupt}"
+                f" • {st.bytes_before / 1e6:.1f} MB → {st.bytes_after / 1e6:.1f} MB"
+            )
+    return 0
+
+
+def _cmd_search(argv: Sequence[str]) -> int:
+    from . import jsonio
+    from .search import SearchIndex
+    from .storage import OUT_DETAILS_DIR
+
+    parser = argparse.ArgumentParser(
+        prog="cei6 search",
+        description="Full-text search over detail paragraphs, ranked by relevance.",
+    )
+    parser.add_argument("query", nargs="?", default="", help="Words to search for (all must appear in the document).")
+    parser.add_argument("--type", choices=ALL_TYPES, default=None, help="Restrict to one content type.")
+    parser.add_argument("--author", default=None, help="Restrict to authors matching this text.")
+    parser.add_argument(
+        "--since", type=_date_arg, default=None, help="Published on/after this ISO date (e.g. 2024-01-01)."
+    )
+    parser.add_argument("--until", type=_date_arg, default=None, help="Published before this ISO date.")
+    parser.add_argument("--limit", type=int, default=20, help="Max documents (default: 20).")
+    parser.add_argument("--raw", action="store_true", help="Treat the query as FTS5 syntax (OR, NEAR, \"phrases\", prefix*).")
+    parser.add_argument("--db", default=DEFAULT_SEARCH_DB, help=f"Index path (default: {DEFAULT_SEARCH_DB}).")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="(Re)index stored details first (from --backend) for --type, or all types.",
+    )
+    parser.add_argument("--backend", choices=["jsonl", "sqlite"], default="jsonl", help="Source for --rebuild.")
+    parser.add_argument("--backend-db", default=None, help=f"SQLite database for --backend sqlite (default: {DEFAULT_DB_PATH}).")
+    args = parser.parse_args(argv)
+
+    if not args.rebuild and not os.path.exists(args.db):
+        print(f"[search] no index at {args.db}; run 'cei6 search --rebuild' or crawl with --search-index")
+        return 1
+    index = SearchIndex(args.db)
+    try:
+        if args.rebuild:
+            source = get_backend(args.backend, db_path=args.backend_db) if args.backend == "sqlite" else None
+            for t in [args.type] if args.type else ALL_TYPES:
+                if source is not None:
+                    recs = source.iter_records("details", t)
+                else:
+                    recs = jsonio.iter_jsonl(os.path.join(OUT_DETAILS_DIR, f"{t}.jsonl"))
+                print(f"[search] indexed {t}: {index.rebuild(t, recs)} document(s)")
+            if source is not None:
+                source.close()
+        if not args.query:
+            return 0
+        hits = index.search(
+            args.query,
+            content_type=args.type,
+            author=args.author,
+            # stored dates are normalized ISO UTC; dates without an offset are site-local
+            since=normalize_date(args.since),
+            until=normalize_date(args.until),
+            limit=args.limit,
+            raw=args.raw,
+        )
+    except sqlite3.OperationalError as e:
+        # bad --raw FTS syntax lands here
+        print(f"[error] search failed: {e}")
+        return 2
+    finally:
+        index.close()
+
+    print(f"== {len(hits)} hit(s) for {args.query!r} ==")
+    for i, h in enumerate(hits, 1):
+        by = f" • By {', '.join(h.authors)}" if h.authors else ""
+        print(f"{i:02d}. [{h.score:.2f}] {h.title} | {h.url} | {h.content_type} | {h.date_published}{by}")
+        for n, snip in h.snippets:
+            print(f"      ¶{n + 1}: {snip}")
+    return 0
+
+
+COMMANDS = {
+    "pack": _cmd_pack,
+    "export": _cmd_export,
+    "search": _cmd_search,
+    "compact": _cmd_compact,
+}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+
     parser = argparse.ArgumentParser(
         prog="cei6",
         description="CEI Archive Engine 6 – fresh start (indexers per type).",
+        epilog=f"Other commands: {', '.join(COMMANDS)} (see 'cei6 <command> --help').",
     )
     parser.add_argument(
         "--types",
         nargs="+",
-        default=["blogs", "news_releases", "op_eds", "studies"],
+        default=list(ALL_TYPES),
         help="One or more source types to fetch (default: blogs news_releases op_eds studies).",
     )
     parser.add_argument(
@@ -38,29 +270,241 @@ def main() -> int:
         action="store_true",
         help="Fetch only the first listing page for each type.",
     )
+    parser.add_argument(
+        "--pages",
+        type=int,
+        default=0,
+        help="Crawl up to N listing pages per type (/page/N/), stopping early at already-indexed pages.",
+    )
+    parser.add_argument(
+        "--all-pages",
+        action="store_true",
+        help="Crawl listing pages until the end of the archive or an already-indexed page.",
+    )
     parser.add_argument(
         "--write-jsonl",
         action="store_true",
-        help="Append listings to outputs/index/{type}.jsonl (dedup by URL).",
+        help="Append listings to the storage backend (JSONL: outputs/index/{type}.jsonl; dedup by URL).",
     )
     parser.add_argument(
         "--details",
         action="store_true",
-        help="Fetch detail pages (currently blogs only) using the first-page results.",
+        help="Fetch detail pages for the requested types using the listing results.",
     )
     parser.add_argument(
         "--max-details",
         type=int,
         default=0,
-        help="Cap number of detail pages to fetch (blogs only for now). 0 = no cap.",
+        help="Cap number of detail pages to fetch (across all types). 0 = no cap.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help=(
+            "Number of detail pages to fetch in parallel, across all types (default: 1 = serial)."
+            " Requests are still paced by the adaptive per-host rate (see --rate, --no-adaptive)."
+        ),
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=0,
+        help="Max in-flight requests per host during detail fetch, across all types. 0 = same as --concurrency.",
+    )
+    parser.add_argument(
+        "--as-completed",
+        action="store_true",
+        help="Write detail records as they finish instead of in listing order.",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=-1,
+        help="Parse detail HTML in N worker processes (0 = auto: CPUs-1). Default: parse inline.",
+    )
+    parser.add_argument(
+        "--type-workers",
+        type=int,
+        default=0,
+        help="Crawl this many types at the same time (default: 0 = all requested types; 1 = one after another).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream listings page by page into the detail pipeline, writing records as they arrive.",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=64,
+        help="Max listings buffered between the crawl and detail stages in --stream mode (default: 64).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted backfill from outputs/state/{type}.json (listing page + pending details).",
+    )
+    parser.add_argument(
+        "--since",
+        type=_date_arg,
+        default=None,
+        help="Only items published on/after this ISO date; pagination stops once listings pass it.",
+    )
+    parser.add_argument(
+        "--until",
+        type=_date_arg,
+        default=None,
+        help="Only items published before this ISO date; newer listing pages are skipped by a page search.",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--revalidate",
+        action="store_true",
+        help="Re-check stored details not fetched within --revalidate-age days (conditional GET) and rewrite only those that changed.",
+    )
+    parser.add_argument(
+        "--revalidate-age",
+        type=float,
+        default=DEFAULT_MAX_AGE_DAYS,
+        metavar="DAYS",
+        help=f"With --revalidate: re-check records last fetched/checked over DAYS ago (default: {DEFAULT_MAX_AGE_DAYS}).",
+    )
+    parser.add_argument(
+        "--revalidate-max",
+        type=int,
+        default=DEFAULT_LIMIT,
+        metavar="N",
+        help=f"With --revalidate: re-check at most N records per type, oldest first (default: {DEFAULT_LIMIT}).",
+    )
+
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help=(
+            "Starting requests/second per host; raised while responses stay healthy"
+            " (default: --concurrency, at least 2, at most --max-rate)."
+        ),
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=10.0,
+        help="Ceiling for the adaptive per-host request rate (default: 10).",
+    )
+    parser.add_argument(
+        "--no-adaptive",
+        action="store_true",
+        help="Disable rate control; only Retry-After and retry backoff pace requests.",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Cache responses on disk here and revalidate with conditional GET (ETag/Last-Modified).",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=512,
+        help="Response cache size cap in MB; least recently used pages are evicted (default: 512).",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help=f"Replay from the response cache only; no network (default cache dir: {DEFAULT_CACHE_DIR}).",
+    )
+
+    parser.add_argument(
+        "--backend",
+        choices=["jsonl", "sqlite"],
+        default="jsonl",
+        help="Where listings/details are stored (default: jsonl).",
+    )
+    parser.add_argument(
+        "--db",
+        default=None,
+        help=f"SQLite database path for --backend sqlite (default: {DEFAULT_DB_PATH}).",
+    )
+    parser.add_argument(
+        "--export-jsonl",
+        action="store_true",
+        help="With --backend sqlite: also export the requested types to outputs/{index,details}/*.jsonl.",
+    )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help=f"Add written details to the full-text index (on automatically once {DEFAULT_SEARCH_DB} exists).",
+    )
+    parser.add_argument(
+        "--search-db",
+        default=DEFAULT_SEARCH_DB,
+        help=f"Full-text index path (default: {DEFAULT_SEARCH_DB}).",
+    )
+
+    parser.add_argument(
+        "--metrics",
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="PATH",
+        help="Collect per-stage timings/counters; print a digest, or write them to PATH (.json, or .prom for Prometheus text).",
+    )
+    parser.add_argument(
+        "--metrics-format",
+        choices=["json", "prometheus"],
+        default=None,
+        help="Format for --metrics PATH (default: from the file extension).",
+    )
+
+    parser.add_argument(
+        "--parser",
+        choices=["lxml", "html.parser", "html5lib"],
+        default=None,
+        help=f"BeautifulSoup parser (default: {parsing.DEFAULT_PARSER}).",
+    )
+    parser.add_argument(
+        "--full-parse",
+        action="store_true",
+        help="Parse whole pages instead of only the <main>/<article> subtree.",
+    )
+
+    args = parser.parse_args(argv)
+    parsing.configure(parser=args.parser, targeted=not args.full_parse)
+    if args.metrics:
+        metrics.reset()
+        metrics.enable()
+
+    # One pooled transport for every fetch; size the pool to what can be in
+    # flight (the shared detail fetch slots plus one listing prefetch per
+    # concurrently crawled type).
+    type_workers = max(1, min(args.type_workers or len(args.types), len(args.types)))
+    cache_dir = args.cache_dir or (DEFAULT_CACHE_DIR if args.offline else None)
+    http.configure(
+        pool_size=max(1, args.concurrency) + type_workers,
+        cache_dir=cache_dir,
+        cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+        offline=args.offline,
+        rate=args.rate if args.rate is not None else min(max(2.0, float(args.concurrency)), args.max_rate),
+        max_rate=args.max_rate,
+        adaptive=not args.no_adaptive,
+    )
+
+    # One set of in-flight caps for every detail pipeline, whichever type it serves
+    limiter = HostLimiter(args.per_host or args.concurrency, total=args.concurrency)
 
     types = args.types
     print("CEI6 v0.1.0")
     print(f"Types (requested): {', '.join(types)}")
-    print("Mode: first-page" if args.first_page else "Mode: (listing fetch not specified)")
+    paginate = args.all_pages or args.pages > 0
+    if paginate:
+        print("Mode: all-pages" if args.all_pages else f"Mode: up to {args.pages} page(s)")
+    else:
+        print("Mode: first-page" if args.first_page else "Mode: (listing fetch not specified)")
+    window = _window(args)
+    if window:
+        print(f"Window: {window.since or '…'} → {window.until or '…'}")
 
     # Map for indexers
     indexers: Dict[str, callable] = {
@@ -70,51 +514,286 @@ def main() -> int:
         "studies": fetch_studies_first_page,
     }
 
+    page_crawlers: Dict[str, callable] = {
+        "blogs": iter_blogs_pages,
+        "news_releases": iter_news_releases_pages,
+        "op_eds": iter_opeds_pages,
+        "studies": iter_studies_pages,
+    }
+
+    search_path = args.search_db if args.search_index or os.path.exists(args.search_db) else None
+    backend = get_backend(args.backend, db_path=args.db, search_path=search_path)
+
     listings_by_type: Dict[str, List[ListingItem]] = {}
 
-    if args.first_page:
+    if args.stream:
+        _run_stream(args, types, page_crawlers, backend, limiter)
+    elif args.first_page or paginate:
+
+        def _listing_job(t: str):
+            def _job():
+                if paginate:
+                    crawl = ListingCrawl(
+                        t,
+                        page_crawlers[t],
+                        backend,
+                        max_pages=None if args.all_pages else args.pages,
+                        write=args.write_jsonl,
+                        resume=args.resume,
+                        window=window,
+                    )
+                    items = crawl.collect()
+                    wrote = crawl.wrote  # already appended page by page
+                else:
+                    items = list(indexers[t]())
+                    if window:
+                        items = [it for it in items if window.contains(it.date_published)]
+                    wrote = 0
+                    if args.write_jsonl and items:
+                        try:
+                            wrote = backend.write_listings(t, items)
+                        except Exception as e:
+                            # keep the listings for details even if the write failed
+                            say(f"[error] write_jsonl failed for {t}: {e}")
+                _print_items(t, items)
+                if args.write_jsonl and items:
+                    say(f"[wrote] {t}: {wrote} new line(s) to {backend.describe('index', t)}")
+                return items, wrote
+
+            return _job
+
+        jobs = {}
         for t in types:
-            fetcher = indexers.get(t)
-            if not fetcher:
+            if t not in indexers:
                 print(f"[warn] unknown type: {t}")
                 continue
-            items = fetcher()
-            listings_by_type[t] = list(items)
-            _print_items(t, listings_by_type[t])
-
-        # write JSONL if requested
+            jobs[t] = _listing_job(t)
+        # Types crawl side by side; a failing type is logged and the rest carry on.
+        total_new = 0
+        for t, (result, err) in run_per_type(jobs, workers=type_workers).items():
+            if err is not None:
+                continue
+            listings_by_type[t], wrote = result
+            total_new += wrote
         if args.write_jsonl:
-            total_new = 0  # <-- IMPORTANT: initialize before using it
-            for t in types:
-                items = listings_by_type.get(t, [])
-                if not items:
-                    continue
-                try:
-                    wrote = write_index_jsonl(t, items)  # content_type first, items second
-                    total_new += wrote
-                    print(f"[wrote] {t}: {wrote} new line(s) to outputs/index/{t}.jsonl")
-                except Exception as e:
-                    # Never reference total_new here; just show the error
-                    print(f"[error] write_jsonl failed for {t}: {e}")
             print(f"[summary] total new lines written: {total_new}")
 
-        # details (blogs only for now)
+        # details (all requested types, one shared pipeline)
         if args.details:
-            blogs = listings_by_type.get("blogs", [])
-            from .details import fetch_blog_details_batch
-            if not blogs:
-                print("[details] no blogs to fetch.")
-                return 0
-            cap = args.max_details if args.max_details and args.max_details > 0 else None
-            try:
-                wrote = fetch_blog_details_batch(blogs, cap=cap)
-                if wrote:
-                    print(f"[details] wrote {wrote} blog detail record(s).")
-                else:
-                    print("[details] nothing to write for blogs.")
-            except Exception as e:
-                print(f"[error] details failed (blogs): {e}")
+            _run_details(args, types, listings_by_type, backend, limiter)
+
+    if args.revalidate:
+        _run_revalidate(args, types, backend, type_workers, limiter)
+
+    return _finish(args, backend, cache_dir)
+
+
+def _window(args) -> Optional[DateWindow]:
+    window = DateWindow(since=args.since, until=args.until)
+    if window.since and window.until and window.since >= window.until:
+        raise SystemExit("--since must be before --until")
+    return window or None
+
+
+def _detail_options(args, limiter: HostLimiter) -> Dict[str, object]:
+    parse_workers = None  # inline parse in the fetch threads
+    if args.parse_workers >= 0:
+        parse_workers = args.parse_workers or default_parse_workers()
+    return {
+        "max_details": args.max_details if args.max_details and args.max_details > 0 else None,
+        "concurrency": args.concurrency,
+        "per_host": args.per_host or None,
+        "ordered": not args.as_completed,
+        "parse_workers": parse_workers,
+        "window": _window(args),
+        "limiter": limiter,
+    }
+
+
+def _run_stream(
+    args,
+    types: List[str],
+    page_crawlers: Dict[str, object],
+    backend: StorageBackend,
+    limiter: HostLimiter,
+) -> None:
+    from .details import DETAIL_TYPES
+
+    max_pages = None if args.all_pages else (args.pages or 1)
+
+    def _on_page(label: str, page: int, items: List[ListingItem]) -> None:
+        _print_items(f"{label} page {page}", items)
+
+    def _stream_job(t: str, crawler):
+        def _job() -> Dict[str, int]:
+            crawl = ListingCrawl(
+                t,
+                crawler,
+                backend,
+                max_pages=max_pages,
+                write=args.write_jsonl,
+                resume=args.resume,
+                window=_window(args),
+            )
+            stats = stream_type(
+                crawl,
+                details=args.details and t in DETAIL_TYPES,
+                detail_options=_detail_options(args, limiter),
+                queue_size=args.queue_size,
+                on_page=_on_page,
+            )
+            say(
+                f"[stream] {t}: {stats['pages']} page(s) • {stats['listings']} new listing(s)"
+                f" • {stats['details']} new detail(s)"
+            )
+            return stats
+
+        return _job
+
+    jobs = {}
+    for t in types:
+        crawler = page_crawlers.get(t)
+        if not crawler:
+            print(f"[warn] unknown type: {t}")
+            continue
+        jobs[t] = _stream_job(t, crawler)
+    run_per_type(jobs, workers=args.type_workers or None)
+
+
+def _run_details(
+    args,
+    types: List[str],
+    listings_by_type: Dict[str, List[ListingItem]],
+    backend: StorageBackend,
+    limiter: HostLimiter,
+) -> None:
+    from .details import DETAIL_TYPES, iter_details
+
+    queue: List[ListingItem] = []
+    states = {}
+    for t in types:
+        if t not in DETAIL_TYPES:
+            continue
+        items = listings_by_type.get(t, [])
+        state = load_state(t)
+        if args.resume and state.pending_details:
+            queued = {it.url for it in items}
+            carried = [
+                ListingItem(content_type=t, title="", url=u)
+                for u in state.pending_details
+                if u not in queued
+            ]
+            if carried:
+                print(f"[state] {t}: {len(carried)} pending detail(s) from last run")
+            items = carried + items
+        states[t] = state
+        queue.extend(items)
+    if not queue:
+        print("[details] nothing to fetch.")
+        return
+
+    # Checkpoint each type's queue; URLs are dropped as their records land on disk.
+    pending: Dict[str, Dict[str, None]] = {t: {} for t in states}
+    for it in queue:
+        pending[it.content_type][it.url] = None
+    for t, state in states.items():
+        state.pending_details = list(pending[t])
+        save_state(state)
+
+    wrote: Dict[str, int] = {t: 0 for t in states}
+    done = 0
+    try:
+        for detail in iter_details(queue, **_detail_options(args, limiter)):
+            t = detail.content_type
+            wrote[t] += backend.write_details(t, [detail])
+            pending[t].pop(detail.url, None)
+            done += 1
+            if done % 10 == 0:
+                states[t].pending_details = list(pending[t])
+                save_state(states[t])
+    except Exception as e:
+        print(f"[error] details failed: {e}")
+    finally:
+        for t, state in states.items():
+            state.pending_details = list(pending[t])
+            save_state(state)
+    for t in states:
+        if wrote[t]:
+            print(f"[details] {t}: wrote {wrote[t]} detail record(s) to {backend.describe('details', t)}")
+        else:
+            print(f"[details] {t}: nothing to write.")
+
+
+def _run_revalidate(
+    args,
+    types: List[str],
+    backend: StorageBackend,
+    type_workers: int,
+    limiter: HostLimiter,
+) -> None:
+    from .details import DETAIL_TYPES
+    from .revalidate import revalidate_type
+
+    def _revalidate_job(t: str):
+        def _job():
+            stats = revalidate_type(
+                backend,
+                t,
+                max_age_days=args.revalidate_age,
+                limit=args.revalidate_max,
+                concurrency=args.concurrency,
+                per_host=args.per_host or None,
+                limiter=limiter,
+            )
+            say(
+                f"[revalidate] {t}: checked {stats.checked} • 304: {stats.not_modified}"
+                f" • unchanged: {stats.unchanged} • rewritten: {stats.changed}"
+                f" • gone: {stats.gone} • failed: {stats.failed}"
+            )
+            return stats
+
+        return _job
+
+    jobs = {t: _revalidate_job(t) for t in types if t in DETAIL_TYPES}
+    run_per_type(jobs, workers=type_workers)
+
+
+def _finish(args, backend: StorageBackend, cache_dir: Optional[str]) -> int:
+    if args.export_jsonl and args.backend == "sqlite":
+        for t in args.types:
+            for kind in ("index", "details"):
+                n = backend.export_jsonl(kind, t)
+                if n:
+                    print(f"[export] {t}: {n} new line(s) to outputs/{kind}/{t}.jsonl")
+    backend.close()
 
+    st = http.connection_stats()
+    if st["requests"]:
+        print(
+            f"[http] requests: {st['requests']} • connections opened: {st['connections_opened']}"
+            f" • reused: {st['reused']}"
+        )
+    for host, rs in http.rate_stats().items():
+        print(
+            f"[rate] {host}: {rs['achieved_rps']:.2f} req/s achieved • limit now {rs['rate_limit']:.2f}/s"
+            f" • throttled: {rs['throttled']}"
+        )
+    if cache_dir:
+        cs = http.cache_stats()
+        print(
+            f"[cache] hits: {cs['cache_hits']} • 304 revalidated: {cs['cache_revalidated']}"
+            f" • downloaded: {cs['cache_misses']} • size: {cs.get('bytes', 0) // 1024} KiB"
+        )
+    if args.metrics:
+        if args.metrics == "-":
+            for line in metrics.summary_lines():
+                print(f"[metrics] {line}")
+            rate = metrics.snapshot()["derived"].get("cache_hit_rate")
+            if rate is not None:
+                print(f"[metrics] cache_hit_rate: {rate:.1%}")
+        else:
+            metrics.write(args.metrics, fmt=args.metrics_format)
+            print(f"[metrics] wrote {args.metrics}")
     return 0
 
 
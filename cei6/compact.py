@@ -0,0 +1,160 @@
+# cei6/compact.py
+# Rewrite an append-only JSONL dataset into its canonical form: one line per
+# URL (the newest version), corrupt lines dropped, sorted by date_published
+# (oldest first, undated last). Works in bounded memory: lines are sorted in
+# chunks spilled to temporary run files and merged back (external sort), once
+# by URL to drop duplicates and once by date. The result replaces the file
+# atomically (temp file + rename).
+from __future__ import annotations
+
+import heapq
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+from . import jsonio, storage
+from .dates import parse_date
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+_UNDATED = b"\x7f"  # sorts after any ISO date
+
+
+@dataclass
+class CompactStats:
+    path: str
+    read: int = 0
+    kept: int = 0
+    duplicates: int = 0
+    corrupt: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+def _key_part(value: object) -> bytes:
+    # key fields are joined with \x00 and end at the first \t
+    text = value if isinstance(value, str) else ""
+    return text.replace("\x00", " ").replace("\t", " ").replace("\n", " ").encode("utf-8")
+
+
+def _sorted(
+    lines: Iterable[bytes],
+    chunk_bytes: int,
+    tmp_dir: str,
+) -> Iterator[bytes]:
+    """
+    Yield `lines` (each b"key\\traw\\n") in byte order. Chunks of up to
+    chunk_bytes are sorted in memory and spilled to run files when more than
+    one chunk is needed; the runs are then merged.
+    """
+    runs: List[str] = []
+    chunk: List[bytes] = []
+    size = 0
+
+    def _spill() -> None:
+        chunk.sort()
+        fd, run = tempfile.mkstemp(prefix="run-", suffix=".tmp", dir=tmp_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.writelines(chunk)
+        runs.append(run)
+
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            _spill()
+            chunk, size = [], 0
+    if not runs:
+        chunk.sort()
+        yield from chunk
+        return
+    if chunk:
+        _spill()
+        chunk = []
+    files: List[IO[bytes]] = [open(run, "rb") for run in runs]
+    try:
+        yield from heapq.merge(*files)
+    finally:
+        for f in files:
+            f.close()
+        for run in runs:
+            os.remove(run)
+
+
+def _split(line: bytes) -> Tuple[bytes, bytes]:
+    key, _, raw = line.partition(b"\t")
+    return key, raw
+
+
+def compact_jsonl(
+    path: str,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> CompactStats:
+    """
+    Compact one JSONL file in place. The newest version of a URL is the one
+    with the latest fetched_at (detail records), else the one appended last.
+    """
+    stats = CompactStats(path=path)
+    if not os.path.exists(path):
+        return stats
+    stats.bytes_before = os.path.getsize(path)
+    directory = os.path.dirname(path) or "."
+    tmp_dir = tempfile.mkdtemp(prefix=".compact-", dir=directory)
+    out_tmp = path + ".compact.tmp"
+    try:
+        # 1. url \x00 fetched_at \x00 line number \x00 date  ->  newest line last per URL
+        def _by_url() -> Iterator[bytes]:
+            with open(path, "rb") as f:
+                for n, line in enumerate(f):
+                    raw = line.strip()
+                    if not raw:
+                        continue
+                    stats.read += 1
+                    try:
+                        obj = jsonio.loads(raw)
+                    except Exception:
+                        obj = None
+                    url = obj.get("url") if isinstance(obj, dict) else None
+                    if not isinstance(url, str) or not url:
+                        stats.corrupt += 1
+                        continue
+                    dt = parse_date(obj.get("date_published"))
+                    date = dt.isoformat().encode("ascii") if dt is not None else _UNDATED
+                    key = b"\x00".join((_key_part(url), _key_part(obj.get("fetched_at")), b"%012d" % n, date))
+                    yield key + b"\t" + raw + b"\n"
+
+        # 2. keep the last line of each URL group, re-keyed as date \x00 url
+        def _newest() -> Iterator[bytes]:
+            prev: Optional[bytes] = None
+            prev_url = b""
+            for line in _sorted(_by_url(), chunk_bytes, tmp_dir):
+                key, raw = _split(line)
+                url, _, _, date = key.split(b"\x00")
+                if prev is not None:
+                    if url == prev_url:
+                        stats.duplicates += 1
+                    else:
+                        yield prev
+                prev_url, prev = url, date + b"\x00" + url + b"\t" + raw
+            if prev is not None:
+                yield prev
+
+        # in-process writers wait, so no append lands in the file being replaced
+        with storage._URL_LOCK:
+            with open(out_tmp, "wb") as out:
+                for line in _sorted(_newest(), chunk_bytes, tmp_dir):
+                    out.write(_split(line)[1])
+                    stats.kept += 1
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(out_tmp, path)
+            storage.rebuild_url_index(path)
+        stats.bytes_after = os.path.getsize(path)
+    finally:
+        if os.path.exists(out_tmp):
+            os.remove(out_tmp)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return stats
+
@@ -0,0 +1,15 @@
+# cei6/console.py
+# Progress output shared by the per-type threads. print() writes the text and
+# the line end separately, so lines from concurrently crawled types (and the
+# stream producers) can splice into each other; say() serializes them.
+from __future__ import annotations
+
+import threading
+
+_lock = threading.Lock()
+
+
+def say(text: str) -> None:
+    """Print one line (or a multi-line block) without interleaving with other threads."""
+    with _lock:
+        print(text, flush=True)
@@ -0,0 +1,233 @@
+# cei6/crawl.py
+# Listing crawl orchestration: checkpointed pagination per type, the
+# streaming mode where listings flow page by page into the detail pipeline
+# through a bounded queue and are written as they arrive, and running the
+# per-type crawls side by side.
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .backends import StorageBackend
+from .console import say
+from .models import DateWindow, ListingItem
+from .state import CrawlState, load_state, save_state
+
+PageCallback = Callable[[str, int, List[ListingItem]], None]
+
+
+class ListingCrawl:
+    """
+    One type's paginated crawl. When writing, listings are appended page by
+    page and the crawl state is checkpointed after each page.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        crawler,
+        backend: StorageBackend,
+        max_pages: Optional[int] = None,
+        write: bool = False,
+        resume: bool = False,
+        window: Optional[DateWindow] = None,
+    ):
+        self.label = label
+        self.crawler = crawler
+        self.backend = backend
+        self.max_pages = max_pages
+        self.write = write
+        self.resume = resume
+        # a date window is a one-off slice: it neither resumes nor moves the backfill checkpoint
+        self.window = window or None
+        self.state: CrawlState = load_state(label)
+        self.lock = threading.Lock()
+        # detail URLs queued but not yet stored (streaming mode keeps this live)
+        self.pending: Dict[str, None] = {}
+        self.streaming = False
+        self.wrote = 0
+        self.last_page = 0
+
+    def checkpoint(self) -> None:
+        with self.lock:
+            if self.streaming:
+                self.state.pending_details = list(self.pending)
+            save_state(self.state)
+
+    def iter_pages(self) -> Iterator[Tuple[int, List[ListingItem]]]:
+        state = self.state
+        # incremental runs stop on a page whose URLs are all stored already
+        known = self.backend.known_urls(self.label)
+        start = state.resume_page() if self.resume and self.window is None else 1
+        if start > 1:
+            say(f"[state] {self.label}: resuming backfill at page {start}")
+
+        def _on_stop(reason: str, page: int) -> None:
+            if self.write and reason == "end" and self.window is None:
+                state.complete = True
+
+        try:
+            for page, page_items in self.crawler(
+                max_pages=self.max_pages,
+                known_urls=known,
+                start_page=start,
+                on_stop=_on_stop,
+                window=self.window,
+            ):
+                self.last_page = page
+                say(f"[pages] {self.label}: page {page} → {len(page_items)} card(s)")
+                state.note_items(page_items)
+                if self.streaming:
+                    # queue details before the checkpoint that records this page
+                    with self.lock:
+                        self.pending.update(dict.fromkeys(it.url for it in page_items))
+                if self.write:
+                    self.wrote += self.backend.write_listings(self.label, page_items)
+                    if self.window is None:
+                        state.last_page = max(state.last_page, page)
+                    self.checkpoint()
+                yield page, page_items
+        except Exception as e:
+            # prefer partial data over crashes
+            say(f"[error] pagination failed for {self.label} after page {self.last_page}: {e}")
+        if self.write:
+            self.checkpoint()
+
+    def collect(self) -> List[ListingItem]:
+        items: List[ListingItem] = []
+        seen = set()
+        for _, page_items in self.iter_pages():
+            for it in page_items:
+                if it.url not in seen:
+                    seen.add(it.url)
+                    items.append(it)
+        return items
+
+
+_DONE = object()
+
+
+def stream_type(
+    crawl: ListingCrawl,
+    details: bool = False,
+    detail_options: Optional[Dict[str, Any]] = None,
+    queue_size: int = 64,
+    on_page: Optional[PageCallback] = None,
+) -> Dict[str, int]:
+    """
+    Streaming crawl for one type: pages are written as they are parsed and,
+    with details=True, their items feed the detail pipeline through a bounded
+    queue (the crawler blocks when details fall behind). Detail records are
+    written one by one. Memory stays flat regardless of archive size.
+    Returns counters {pages, listings, details}.
+    """
+    from .details import iter_details
+
+    stats = {"pages": 0, "listings": 0, "details": 0}
+
+    if not details:
+        for page, page_items in crawl.iter_pages():
+            stats["pages"] += 1
+            if on_page:
+                on_page(crawl.label, page, page_items)
+        stats["listings"] = crawl.wrote
+        return stats
+
+    crawl.streaming = True
+    q: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+
+    def _put(obj: Any) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(obj, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            carried = list(crawl.state.pending_details) if crawl.resume else []
+            if carried:
+                say(f"[state] {crawl.label}: {len(carried)} pending detail(s) from last run")
+                with crawl.lock:
+                    crawl.pending.update(dict.fromkeys(carried))
+                for url in carried:
+                    if not _put(ListingItem(content_type=crawl.label, title="", url=url)):
+                        return
+            for page, page_items in crawl.iter_pages():
+                stats["pages"] += 1
+                if on_page:
+                    on_page(crawl.label, page, page_items)
+                for it in page_items:
+                    if not _put(it):
+                        return
+        finally:
+            _put(_DONE)
+
+    def _drain() -> Iterator[ListingItem]:
+        while True:
+            it = q.get()
+            if it is _DONE:
+                return
+            yield it
+
+    producer = threading.Thread(target=_produce, name=f"cei6-stream-{crawl.label}", daemon=True)
+    producer.start()
+    try:
+        for detail in iter_details(_drain(), **(detail_options or {})):
+            stats["details"] += crawl.backend.write_details(crawl.label, [detail])
+            with crawl.lock:
+                crawl.pending.pop(detail.url, None)
+    finally:
+        stop.set()
+        producer.join()
+        crawl.checkpoint()
+    stats["listings"] = crawl.wrote
+    return stats
+
+
+TypeResult = Tuple[Any, Optional[BaseException]]
+
+
+def run_per_type(
+    jobs: Dict[str, Callable[[], Any]],
+    workers: Optional[int] = None,
+) -> Dict[str, TypeResult]:
+    """
+    Run one job per content type, each in its own thread (up to `workers` at
+    once; default all). A job that raises is reported and recorded as
+    (None, error) without affecting the others. All jobs share the process-wide
+    HTTP session and per-host rate controller; to share in-flight caps too,
+    give their detail pipelines one HostLimiter. Returns {type: (result, error)}
+    in the order of `jobs`.
+    """
+    results: Dict[str, TypeResult] = {}
+    if not jobs:
+        return results
+
+    def _run(label: str, job: Callable[[], Any]) -> TypeResult:
+        started = time.monotonic()
+        say(f"[types] {label}: started")
+        try:
+            out = job()
+        except Exception as e:
+            say(f"[error] {label} failed after {time.monotonic() - started:.1f}s: {e}")
+            return None, e
+        say(f"[types] {label}: done in {time.monotonic() - started:.1f}s")
+        return out, None
+
+    n = max(1, min(workers or len(jobs), len(jobs)))
+    if n == 1:
+        for label, job in jobs.items():
+            results[label] = _run(label, job)
+        return results
+    with ThreadPoolExecutor(max_workers=n, thread_name_prefix="cei6-type") as pool:
+        futures = {label: pool.submit(_run, label, job) for label, job in jobs.items()}
+        for label, fut in futures.items():
+            results[label] = fut.result()
+    return results
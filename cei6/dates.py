@@ -0,0 +1,138 @@
+# cei6/dates.py
+# Date normalization for listings and details. CEI pages use a handful of
+# formats (ISO datetime attributes, "August 12, 2025", "August 12, 2025 9:30 am");
+# those are matched by precompiled regexes without raising, and only anything
+# else falls back to format probing. Results are memoized on the raw string,
+# since a listing page repeats the same few dates.
+#
+# Output is timezone-aware UTC. Dates without an offset are site-local
+# (America/New_York), so a date-only value keeps its calendar day.
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Any, Optional
+
+try:
+    from zoneinfo import ZoneInfo
+
+    SITE_TZ: tzinfo = ZoneInfo("America/New_York")
+except Exception:  # pragma: no cover - no tz database (e.g. Windows without tzdata)
+    SITE_TZ = timezone.utc
+
+_ISO = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6})\d*)?)?)?"
+    r"\s*(Z|[+-]\d{2}:?\d{2})?"
+)
+_MONTH_NAME = re.compile(
+    r"([A-Za-z]{3,9})\.?\s+(\d{1,2}),?\s+(\d{4})"
+    r"(?:\s*(?:at\s+)?(\d{1,2}):(\d{2})\s*([AaPp])\.?\s*[Mm]\.?)?"
+)
+_MONTHS = {
+    name: i
+    for i, names in enumerate(
+        [
+            ("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"),
+            ("may",), ("june", "jun"), ("july", "jul"), ("august", "aug"),
+            ("september", "sep", "sept"), ("october", "oct"), ("november", "nov"),
+            ("december", "dec"),
+        ],
+        1,
+    )
+    for name in names
+}
+_FALLBACK_FORMATS = ("%B %d, %Y %I:%M %p", "%B %d, %Y", "%Y-%m-%d", "%m/%d/%Y")
+
+
+def _offset(text: str) -> timezone:
+    if text == "Z":
+        return timezone.utc
+    sign = -1 if text[0] == "-" else 1
+    digits = text[1:].replace(":", "")
+    minutes = int(digits[:2]) * 60 + int(digits[2:])
+    return timezone(sign * timedelta(minutes=minutes))
+
+
+def _from_iso(m: "re.Match[str]") -> datetime:
+    y, mo, d, hh, mm, ss, frac, off = m.groups()
+    micro = int(frac.ljust(6, "0")) if frac else 0
+    tz = _offset(off) if off else SITE_TZ
+    return datetime(int(y), int(mo), int(d), int(hh or 0), int(mm or 0), int(ss or 0), micro, tzinfo=tz)
+
+
+def _from_month_name(m: "re.Match[str]") -> Optional[datetime]:
+    month = _MONTHS.get(m.group(1).lower())
+    if month is None:
+        return None
+    _, d, y, hh, mm, ampm = m.groups()
+    hour = 0
+    if hh:
+        hour = int(hh) % 12 + (12 if ampm in "Pp" else 0)
+    return datetime(int(y), month, int(d), hour, int(mm or 0), tzinfo=SITE_TZ)
+
+
+def _probe(text: str) -> Optional[datetime]:
+    # slow path for formats not seen on CEI pages so far
+    try:
+        dt = datetime.fromisoformat(text.replace(" ", "T"))
+    except ValueError:
+        dt = None
+    for fmt in _FALLBACK_FORMATS:
+        if dt is not None:
+            break
+        try:
+            dt = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return dt
+
+
+@lru_cache(maxsize=4096)
+def _parse_text(text: str) -> Optional[datetime]:
+    t = text.strip()
+    if not t:
+        return None
+    dt: Optional[datetime] = None
+    try:
+        m = _ISO.fullmatch(t)
+        if m:
+            dt = _from_iso(m)
+        else:
+            m = _MONTH_NAME.fullmatch(t)
+            if m:
+                dt = _from_month_name(m)
+    except ValueError:  # out-of-range day/month
+        return None
+    if dt is None:
+        dt = _probe(t)
+        if dt is None:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=SITE_TZ)
+    return dt.astimezone(timezone.utc)
+
+
+def parse_date(value: Any) -> Optional[datetime]:
+    """A datetime or date text as an aware UTC datetime; None if unparseable."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=SITE_TZ)
+        return value.astimezone(timezone.utc)
+    if isinstance(value, str):
+        return _parse_text(value)
+    return None
+
+
+def normalize_date(value: Any) -> Optional[str]:
+    """
+    ISO 8601 UTC string for a date value (e.g. "2025-08-12T04:00:00+00:00").
+    Unparseable text is kept as found rather than dropped.
+    """
+    dt = parse_date(value)
+    if dt is not None:
+        return dt.isoformat()
+    if isinstance(value, str):
+        return value.strip() or None
+    return None
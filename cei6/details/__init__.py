@@ -1,32 +1,174 @@
 ﻿# cei6/details/__init__.py
 from __future__ import annotations
 
-from typing import Iterable, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from ..models import ListingItem
-from .blogs_details import parse_blog_detail as fetch_blog_detail, BlogDetail
+from ..console import say
+from ..models import DateWindow, ListingItem
+from . import blogs_details, news_details, opeds_details, studies_details
+from .blogs_details import (
+    parse_blog_detail as fetch_blog_detail,
+    parse_blog_html,
+    BlogDetail,
+)
+from .news_details import NewsReleaseDetail, parse_news_release_detail, parse_news_release_html
+from .opeds_details import OpEdDetail, parse_oped_detail, parse_oped_html
+from .studies_details import StudyDetail, parse_study_detail, parse_study_html
+from .article import ArticleDetail
+from .engine import HostLimiter, run_detail_jobs
+from .fingerprint import content_hash, stamp
+
+# content_type -> (fetch_html(url), parse_html(html, url)); parse functions are
+# pure and module-level so the process-pool pipeline can pickle them.
+DETAIL_PARSERS: Dict[str, Tuple[Callable[[str], str], Callable[[str, str], object]]] = {
+    "blogs": (blogs_details._fetch_html, parse_blog_html),
+    "news_releases": (news_details._fetch_html, parse_news_release_html),
+    "op_eds": (opeds_details._fetch_html, parse_oped_html),
+    "studies": (studies_details._fetch_html, parse_study_html),
+}
+
+DETAIL_TYPES = tuple(DETAIL_PARSERS)
+
+# content_type -> listing page sent as Referer with detail fetches
+REFERERS: Dict[str, str] = {
+    "blogs": blogs_details.REFERER,
+    "news_releases": news_details.REFERER,
+    "op_eds": opeds_details.REFERER,
+    "studies": studies_details.REFERER,
+}
+
+
+def iter_details(
+    items: Iterable[ListingItem],
+    max_details: int | None = None,
+    concurrency: int = 1,
+    per_host: Optional[int] = None,
+    ordered: bool = True,
+    parse_workers: Optional[int] = None,
+    window: Optional[DateWindow] = None,
+    limiter: Optional[HostLimiter] = None,
+) -> Iterator[object]:
+    """
+    Yield detail records for listing items of any supported type, all through
+    one bounded pipeline (up to `concurrency` fetches in flight). Items of
+    unsupported types are skipped; failures are logged and skipped.
+    With parse_workers set, HTML is parsed in a process pool (see cei6.pipeline).
+    With a date window, items dated outside it are skipped without a fetch.
+    A shared limiter caps in-flight fetches across every pipeline using it.
+    Each record is stamped with its content hash and fetch metadata.
+    """
+    wanted = (it for it in items if it.content_type in DETAIL_PARSERS)
+    if window:
+        wanted = (it for it in wanted if window.contains(it.date_published))
+    if max_details is not None and max_details <= 0:
+        return
+    count = 0
+    if parse_workers is not None:
+        from ..pipeline import iter_pipeline
+
+        jobs = iter_pipeline(
+            wanted,
+            {t: fp[0] for t, fp in DETAIL_PARSERS.items()},
+            {t: fp[1] for t, fp in DETAIL_PARSERS.items()},
+            concurrency=concurrency,
+            per_host=per_host,
+            parse_workers=parse_workers,
+            ordered=ordered,
+            limiter=limiter,
+            max_results=max_details,
+        )
+    else:
+        def _fetch_one(it: ListingItem) -> object:
+            fetch_html, parse_html = DETAIL_PARSERS[it.content_type]
+            return parse_html(fetch_html(it.url), it.url)
+
+        jobs = run_detail_jobs(
+            wanted,
+            _fetch_one,
+            concurrency=concurrency,
+            per_host=per_host,
+            ordered=ordered,
+            limiter=limiter,
+            max_results=max_details,
+        )
+    try:
+        for it, detail, err in jobs:
+            if err is not None:
+                say(f"[warn] fetch detail failed ({it.content_type}): {it.url} :: {err}")
+                continue
+            yield stamp(detail)
+            count += 1
+            if max_details is not None and count >= max_details:
+                break
+    finally:
+        jobs.close()
+
+
+def iter_blog_details(
+    items: Iterable[ListingItem],
+    max_details: int | None = None,
+    concurrency: int = 1,
+    per_host: Optional[int] = None,
+    ordered: bool = True,
+    parse_workers: Optional[int] = None,
+) -> Iterator[BlogDetail]:
+    """Blogs-only view of iter_details (kept for existing callers)."""
+    return iter_details(
+        (it for it in items if it.content_type == "blogs"),
+        max_details=max_details,
+        concurrency=concurrency,
+        per_host=per_host,
+        ordered=ordered,
+        parse_workers=parse_workers,
+    )
 
 
 def fetch_blog_details_batch(
     items: Iterable[ListingItem],
     max_details: int | None = None,
+    concurrency: int = 1,
+    per_host: Optional[int] = None,
+    ordered: bool = True,
+    parse_workers: Optional[int] = None,
 ) -> List[BlogDetail]:
     """
     Fetch blog details for a slice of listing items (blogs only).
     Respects max_details if provided.
     """
-    out: List[BlogDetail] = []
-    count = 0
-    for it in items:
-        if it.content_type != "blogs":
-            # Only blogs are wired up right now
-            continue
-        if max_details is not None and count >= max_details:
-            break
-        try:
-            detail = fetch_blog_detail(it.url)
-            out.append(detail)
-            count += 1
-        except Exception as e:
-            print(f"[warn] fetch detail failed (blogs): {it.url} :: {e}")
-    return out
+    return list(
+        iter_blog_details(
+            items,
+            max_details=max_details,
+            concurrency=concurrency,
+            per_host=per_host,
+            ordered=ordered,
+            parse_workers=parse_workers,
+        )
+    )
+
+
+__all__ = [
+    "ArticleDetail",
+    "BlogDetail",
+    "DETAIL_PARSERS",
+    "DETAIL_TYPES",
+    "HostLimiter",
+    "NewsReleaseDetail",
+    "OpEdDetail",
+    "REFERERS",
+    "StudyDetail",
+    "content_hash",
+    "fetch_blog_detail",
+    "fetch_blog_details_batch",
+    "iter_blog_details",
+    "iter_details",
+    "parse_blog_html",
+    "parse_news_release_detail",
+    "parse_news_release_html",
+    "parse_oped_detail",
+    "parse_oped_html",
+    "parse_study_detail",
+    "parse_study_html",
+    "run_detail_jobs",
+    "stamp",
+]
@@ -0,0 +1,115 @@
+# cei6/details/article.py
+# Field extraction shared by the per-type detail parsers. CEI single pages use the
+# same WordPress template (entry-title / entry-meta / entry-content) across types;
+# anything type-specific (op-ed outlet, study PDFs) stays in the type's module.
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+
+from .. import metrics
+from ..dates import normalize_date
+from ..http import fetch_text
+from ..parsing import DETAIL_ONLY, has_detail_parts, targeted_soup
+
+
+@dataclass
+class ArticleParts:
+    title: str = ""
+    date_published: Optional[str] = None
+    issue: Optional[str] = None
+    authors: List[str] = field(default_factory=list)
+    paragraphs: List[str] = field(default_factory=list)
+    documents: List[str] = field(default_factory=list)
+    content_root: Optional[BeautifulSoup] = None
+
+    @property
+    def content(self) -> str:
+        return "\n\n".join(self.paragraphs)
+
+
+@dataclass
+class ArticleDetail:
+    """
+    A parsed detail page: the schema every type's detail record shares. Each
+    type subclasses it (adding its own fields, like an op-ed's outlet), so a
+    field added here reaches every type.
+    """
+    content_type: str
+    url: str
+    title: str
+    date_published: Optional[str]
+    issue: Optional[str]
+    authors: List[str]
+    content: str
+    paragraphs: List[str]
+    documents: List[str]
+    # set by iter_details (cei6.details.fingerprint.stamp)
+    content_hash: Optional[str] = None
+    fetched_at: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def fetch_detail_html(url: str, referer: str) -> str:
+    # Retries/backoff on 403/429/5xx are handled by the shared transport.
+    return fetch_text(url, headers={"Referer": referer})
+
+
+def detail_soup(html: str) -> BeautifulSoup:
+    return targeted_soup(html, DETAIL_ONLY, has_detail_parts(html))
+
+
+@metrics.timed("extract_seconds", field="article")
+def extract_article(soup: BeautifulSoup) -> ArticleParts:
+    parts = ArticleParts()
+
+    # Title
+    title_el = soup.find(["h1", "h2"], class_="entry-title") or soup.find("h1")
+    parts.title = (title_el.get_text(strip=True) if title_el else "").strip()
+
+    # Header area: author/date/issue often live here on CEI posts
+    header = soup.find(class_="entry-meta") or soup.find("header")
+    if header:
+        # authors: find links with /experts/ or rel="author"
+        author_links = header.select('a[href*="/experts/"], a[rel="author"]')
+        for a in author_links:
+            name = a.get_text(strip=True)
+            if name:
+                parts.authors.append(name)
+
+        # date: <time> or text like "August 12, 2025"
+        time_el = header.find("time")
+        if time_el and time_el.has_attr("datetime"):
+            parts.date_published = normalize_date(time_el["datetime"])
+        elif time_el:
+            parts.date_published = normalize_date(time_el.get_text(" ", strip=True))
+
+        # issue: look for a visible label/badge near meta
+        issue_el = header.find(class_="badge") or header.find(class_="entry-category")
+        if issue_el:
+            parts.issue = issue_el.get_text(" ", strip=True)
+
+    # Content & paragraphs
+    # Most CEI single posts wrap content in .entry-content or .post-content
+    content_root = soup.find(class_="entry-content") or soup.find(class_="post-content") or soup
+    parts.content_root = content_root
+    for p in content_root.find_all("p"):
+        txt = p.get_text(" ", strip=True)
+        if txt:
+            parts.paragraphs.append(txt)
+
+    # Any documents/PDF links?
+    parts.documents = pdf_links(content_root)
+    return parts
+
+
+def pdf_links(root: BeautifulSoup) -> List[str]:
+    out: List[str] = []
+    for a in root.find_all("a", href=True):
+        href = a["href"]
+        if href.lower().split("?", 1)[0].endswith(".pdf") and href not in out:
+            out.append(href)
+    return out
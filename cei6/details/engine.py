@@ -0,0 +1,151 @@
+# cei6/details/engine.py
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class HostLimiter:
+    """
+    Caps the number of in-flight requests per host, and optionally in total.
+    One limiter shared by several pipelines (e.g. one per content type) holds
+    all of them to the same caps; each worker pool only bounds its own threads.
+    """
+
+    def __init__(self, per_host: int, total: Optional[int] = None):
+        self.per_host = max(1, int(per_host))
+        self.total = max(1, int(total)) if total else None
+        self._lock = threading.Lock()
+        self._sems: Dict[str, threading.BoundedSemaphore] = {}
+        self._all = threading.BoundedSemaphore(self.total) if self.total else None
+
+    def _sem_for(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            sem = self._sems.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.per_host)
+                self._sems[host] = sem
+            return sem
+
+    @contextmanager
+    def slot(self, url: str):
+        sem = self._sem_for(url)
+        # always total first, then host, so sharing pipelines can't deadlock
+        if self._all is not None:
+            self._all.acquire()
+        try:
+            with sem:
+                yield
+        finally:
+            if self._all is not None:
+                self._all.release()
+
+
+# (item, result, error) — exactly one of result/error is set
+JobResult = Tuple[Any, Any, Optional[BaseException]]
+
+
+def _item_url(item: Any) -> str:
+    if isinstance(item, str):
+        return item
+    return getattr(item, "url", "") or ""
+
+
+def run_detail_jobs(
+    items: Iterable[Any],
+    fetch_one: Callable[[Any], Any],
+    concurrency: int = 1,
+    per_host: Optional[int] = None,
+    ordered: bool = True,
+    limiter: Optional[HostLimiter] = None,
+    max_results: Optional[int] = None,
+) -> Iterator[JobResult]:
+    """
+    Run fetch_one(item) over items with bounded concurrency.
+    Yields (item, result, error) either in input order (ordered=True) or as
+    jobs complete. Only ~2x concurrency jobs are queued at once, so large
+    inputs are not materialized. Pass a shared limiter to hold concurrent
+    runs to one set of caps; otherwise this run gets its own (per_host).
+    With max_results, no more jobs are started once that many could still
+    succeed (submitted minus failed), so a cap doesn't fetch pages it drops.
+    """
+    concurrency = max(1, int(concurrency or 1))
+    if limiter is None:
+        limiter = HostLimiter(per_host or concurrency)
+
+    def _run(item: Any) -> Any:
+        with limiter.slot(_item_url(item)):
+            return fetch_one(item)
+
+    if concurrency == 1:
+        # Serial path: no pool, same semantics as the old loop.
+        ok = 0
+        for item in items:
+            if max_results is not None and ok >= max_results:
+                return
+            try:
+                result = _run(item)
+            except Exception as e:
+                yield (item, None, e)
+                continue
+            ok += 1
+            yield (item, result, None)
+        return
+
+    window = concurrency * 2
+    it = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cei6-detail") as pool:
+        # Submission order is kept in `order`; `owner` maps futures back to items.
+        order: Deque[Future] = deque()
+        owner: Dict[Future, Any] = {}
+        exhausted = False
+        submitted = failed = 0
+
+        def _fill() -> None:
+            nonlocal exhausted, submitted
+            while not exhausted and len(owner) < window:
+                if max_results is not None and submitted - failed >= max_results:
+                    return
+                try:
+                    item = next(it)
+                except StopIteration:
+                    exhausted = True
+                    return
+                fut = pool.submit(_run, item)
+                submitted += 1
+                owner[fut] = item
+                if ordered:
+                    order.append(fut)
+
+        def _take(fut: Future) -> JobResult:
+            nonlocal failed
+            item = owner.pop(fut)
+            err = fut.exception()
+            if err is not None:
+                failed += 1  # frees a slot under max_results
+                return (item, None, err)
+            return (item, fut.result(), None)
+
+        try:
+            _fill()
+            while owner:
+                if ordered:
+                    fut = order.popleft()
+                    wait([fut])
+                    done = [fut]
+                else:
+                    done_set, _ = wait(list(owner), return_when=FIRST_COMPLETED)
+                    done = list(done_set)
+                results = [_take(f) for f in done]
+                _fill()
+                for res in results:
+                    yield res
+        finally:
+            # Consumer stopped early (cap reached): drop queued work.
+            for fut in owner:
+                fut.cancel()
@@ -0,0 +1,69 @@
+# cei6/details/fingerprint.py
+# Content hash + fetch metadata for detail records. The hash covers what a
+# reader sees (title, date, issue, authors, paragraphs, documents, and an
+# op-ed's outlet) after whitespace and date normalization, so template or
+# markup churn around an article doesn't register as an edit.
+from __future__ import annotations
+
+import hashlib
+import re
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+from .. import http
+from ..dates import normalize_date
+
+_WS = re.compile(r"\s+")
+_SEP = b"\x1f"
+_GROUP = b"\x1e"
+# hashed only when set, so types without them keep their existing hashes
+_OPTIONAL = ("outlet", "outlet_url")
+
+
+def _get(rec: Any, key: str) -> Any:
+    if isinstance(rec, dict):
+        return rec.get(key)
+    return getattr(rec, key, None)
+
+
+def _norm(text: Any) -> bytes:
+    if text is None:
+        return b""
+    return _WS.sub(" ", str(text)).strip().encode("utf-8")
+
+
+def _strings(value: Any) -> Iterable[Any]:
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return value
+
+
+def content_hash(rec: Any) -> str:
+    """sha256 hex of the normalized content of a detail (dataclass or stored dict)."""
+    docs = _get(rec, "pdf_links")
+    if docs is None:
+        docs = _get(rec, "documents")
+    h = hashlib.sha256()
+    for part in (_get(rec, "title"), normalize_date(_get(rec, "date_published")), _get(rec, "issue")):
+        h.update(_norm(part))
+        h.update(_SEP)
+    for group in (_get(rec, "authors"), _get(rec, "paragraphs"), docs):
+        h.update(_GROUP)
+        for s in _strings(group):
+            h.update(_norm(s))
+            h.update(_SEP)
+    for name in _OPTIONAL:
+        value = _norm(_get(rec, name))
+        if value:
+            h.update(_GROUP + name.encode("ascii") + _SEP + value + _SEP)
+    return h.hexdigest()
+
+
+def stamp(detail: Any, fetched_at: Optional[str] = None) -> Any:
+    """Set content_hash, fetched_at and the response validators on a freshly parsed detail."""
+    detail.content_hash = content_hash(detail)
+    detail.fetched_at = fetched_at or datetime.now(timezone.utc).isoformat(timespec="seconds")
+    detail.etag, detail.last_modified = http.validators(detail.url)
+    return detail
@@ -0,0 +1,38 @@
+# cei6/details/news_details.py
+from __future__ import annotations
+
+from .article import ArticleDetail, detail_soup, extract_article, fetch_detail_html
+
+
+class NewsReleaseDetail(ArticleDetail):
+    """A news release (content_type "news_releases")."""
+
+
+REFERER = "https://cei.org/news_releases/"
+
+
+def _fetch_html(url: str) -> str:
+    return fetch_detail_html(url, REFERER)
+
+
+def parse_news_release_detail(url: str) -> NewsReleaseDetail:
+    return parse_news_release_html(_fetch_html(url), url)
+
+
+def parse_news_release_html(html: str, url: str) -> NewsReleaseDetail:
+    parts = extract_article(detail_soup(html))
+    paras = parts.paragraphs
+    # Releases end with a boilerplate "###" marker; drop it and anything after.
+    if "###" in paras:
+        paras = paras[: paras.index("###")]
+    return NewsReleaseDetail(
+        content_type="news_releases",
+        url=url,
+        title=parts.title,
+        date_published=parts.date_published,
+        issue=parts.issue,
+        authors=parts.authors,
+        content="\n\n".join(paras),
+        paragraphs=paras,
+        documents=parts.documents,
+    )
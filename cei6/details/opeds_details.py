@@ -0,0 +1,77 @@
+# cei6/details/opeds_details.py
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup
+
+from .article import ArticleDetail, detail_soup, extract_article, fetch_detail_html
+
+
+@dataclass
+class OpEdDetail(ArticleDetail):
+    """An op-ed (content_type "op_eds") and the outlet it ran in."""
+    outlet: Optional[str] = None
+    outlet_url: Optional[str] = None
+
+
+REFERER = "https://cei.org/opeds_articles/"
+
+# "Originally published in The Hill", "This piece appeared in ...", "Read at ..."
+_OUTLET_LEAD = re.compile(
+    r"(originally\s+(published|appeared)|appeared\s+(in|at|on)|published\s+(in|at|by)|read\s+(it\s+)?(at|on|in))",
+    re.I,
+)
+
+
+def _fetch_html(url: str) -> str:
+    return fetch_detail_html(url, REFERER)
+
+
+def _is_external(href: str) -> bool:
+    host = urlsplit(href).netloc.lower()
+    return bool(host) and not host.endswith("cei.org")
+
+
+def _extract_outlet(soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
+    # 1) Explicit outlet/source element
+    el = soup.select_one('[class*="outlet"], [class*="publication"], .source')
+    if el:
+        a = el.find("a", href=True)
+        name = (a or el).get_text(" ", strip=True) or None
+        return (name, a["href"] if a else None)
+    # 2) "Originally published in <a>Outlet</a>" line
+    for p in soup.find_all(["p", "em", "div", "span"]):
+        txt = p.get_text(" ", strip=True)
+        if not txt or len(txt) > 300 or not _OUTLET_LEAD.search(txt):
+            continue
+        for a in p.find_all("a", href=True):
+            if _is_external(a["href"]):
+                return (a.get_text(" ", strip=True) or None, a["href"])
+    return (None, None)
+
+
+def parse_oped_detail(url: str) -> OpEdDetail:
+    return parse_oped_html(_fetch_html(url), url)
+
+
+def parse_oped_html(html: str, url: str) -> OpEdDetail:
+    soup = detail_soup(html)
+    parts = extract_article(soup)
+    outlet, outlet_url = _extract_outlet(soup)
+    return OpEdDetail(
+        content_type="op_eds",
+        url=url,
+        title=parts.title,
+        date_published=parts.date_published,
+        issue=parts.issue,
+        authors=parts.authors,
+        outlet=outlet,
+        outlet_url=outlet_url,
+        content=parts.content,
+        paragraphs=parts.paragraphs,
+        documents=parts.documents,
+    )
@@ -0,0 +1,43 @@
+# cei6/details/studies_details.py
+from __future__ import annotations
+
+from urllib.parse import urljoin
+
+from .article import ArticleDetail, detail_soup, extract_article, fetch_detail_html, pdf_links
+
+
+class StudyDetail(ArticleDetail):
+    """A study (content_type "studies"); documents include its PDFs."""
+
+
+REFERER = "https://cei.org/studies/"
+
+
+def _fetch_html(url: str) -> str:
+    return fetch_detail_html(url, REFERER)
+
+
+def parse_study_detail(url: str) -> StudyDetail:
+    return parse_study_html(_fetch_html(url), url)
+
+
+def parse_study_html(html: str, url: str) -> StudyDetail:
+    soup = detail_soup(html)
+    parts = extract_article(soup)
+    # The "Download PDF" button usually sits outside .entry-content.
+    documents = list(parts.documents)
+    for href in pdf_links(soup):
+        if href not in documents:
+            documents.append(href)
+    documents = [urljoin(url, h) for h in documents]
+    return StudyDetail(
+        content_type="studies",
+        url=url,
+        title=parts.title,
+        date_published=parts.date_published,
+        issue=parts.issue,
+        authors=parts.authors,
+        content=parts.content,
+        paragraphs=parts.paragraphs,
+        documents=documents,
+    )
@@ -1,18 +1,376 @@
 # cei6/http.py
+# Shared HTTP transport: every indexer and detail parser fetches through the one
+# pooled Session here, so connections (and TLS handshakes) are reused across
+# pages and worker threads.
 from __future__ import annotations
-from typing import Tuple
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Mapping, Optional, Tuple
+
 import requests
+from requests.adapters import HTTPAdapter, Retry
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from . import metrics
+from .cache import DEFAULT_MAX_BYTES, CacheEntry, ResponseCache
+from .ratelimit import RateController, parse_retry_after
 
 HEADERS = {
-    "User-Agent": "CEI6/0.1 (+https://github.com/yourname/cei-archive-engine-6)"
+    # Use a real UA to avoid 403 blocks
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Connection": "keep-alive",
+}
+
+DEFAULT_TIMEOUT = 20
+
+# Statuses retried by get(); the pause before each retry comes from the per-host
+# rate controller (Retry-After, else exponential backoff), not a fixed sleep.
+RETRY_STATUSES = (403, 429, 500, 502, 503, 504)
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_config = {
+    "pool_size": 10,
+    "retries": 3,
+    "backoff": 0.5,
 }
+_stats = {"requests": 0, "cache_hits": 0, "cache_revalidated": 0, "cache_misses": 0}
+
+_cache: Optional[ResponseCache] = None
+_offline = False
+# origin rewrites, e.g. {"https://cei.org": "http://127.0.0.1:8765"} for the benchmark server
+_origins: Dict[str, str] = {}
+_rate = RateController()
 
-def fetch_html(url: str, timeout: int = 20) -> Tuple[str, str]:
+
+class OfflineCacheMiss(requests.ConnectionError):
+    """Raised in offline mode when a URL is not in the response cache."""
+
+
+def configure(
+    pool_size: Optional[int] = None,
+    retries: Optional[int] = None,
+    backoff: Optional[float] = None,
+    cache_dir: Optional[str] = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES,
+    offline: Optional[bool] = None,
+    rate: Optional[float] = None,
+    max_rate: Optional[float] = None,
+    adaptive: Optional[bool] = None,
+    origins: Optional[Mapping[str, str]] = None,
+) -> None:
+    """
+    Tune the shared transport. pool_size should be >= the number of worker
+    threads, otherwise extra connections are opened and thrown away.
+    cache_dir enables the on-disk response cache (conditional GET); offline
+    serves only from that cache. rate/max_rate set the starting and ceiling
+    requests per second per host; adaptive=False disables rate control (only
+    Retry-After and backoff still apply). origins maps an origin to the one
+    requests are actually sent to (cache keys and returned URLs keep the
+    original); pass {} to clear. Rebuilds the session on the next request.
+    """
+    global _session, _cache, _offline, _rate, _origins
+    with _lock:
+        if origins is not None:
+            _origins = {k.rstrip("/"): v.rstrip("/") for k, v in origins.items()}
+        if rate is not None or max_rate is not None or adaptive is not None:
+            kwargs = dict(_rate.host_kwargs)
+            if rate is not None:
+                kwargs["rate"] = float(rate)
+            if max_rate is not None:
+                kwargs["max_rate"] = float(max_rate)
+            if "rate" in kwargs and "max_rate" in kwargs:
+                kwargs["max_rate"] = max(kwargs["max_rate"], kwargs["rate"])
+            enabled = _rate.enabled if adaptive is None else bool(adaptive)
+            _rate = RateController(enabled=enabled, **kwargs)
+        if cache_dir:
+            _cache = ResponseCache(cache_dir, max_bytes=cache_max_bytes)
+        if offline is not None:
+            _offline = bool(offline)
+        if pool_size is not None:
+            _config["pool_size"] = max(1, int(pool_size))
+        if retries is not None:
+            _config["retries"] = max(0, int(retries))
+        if backoff is not None:
+            _config["backoff"] = max(0.0, float(backoff))
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+# Connection classes that time connect() (DNS + TCP + TLS handshake) for metrics.
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        with metrics.timer("http_connect_seconds", scheme="http"):
+            super().connect()
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        with metrics.timer("http_connect_seconds", scheme="https"):
+            super().connect()
+
+
+class _TimedHTTPPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+def _build_session() -> requests.Session:
+    s = requests.Session()
+    # urllib3 only retries connection-level failures; status retries go
+    # through get() so the rate controller sees every throttle signal.
+    retries = Retry(
+        total=_config["retries"],
+        status=0,
+        backoff_factor=_config["backoff"],
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,  # distinct hosts kept warm (cei.org + CDN)
+        pool_maxsize=_config["pool_size"],
+        max_retries=retries,
+    )
+    adapter.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPPool, "https": _TimedHTTPSPool}
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    s.headers.update(HEADERS)
+    return s
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+_CACHE_EVENTS = {"cache_hits": "hit", "cache_revalidated": "revalidated", "cache_misses": "miss"}
+
+
+def _count(key: str) -> None:
+    with _lock:
+        _stats[key] += 1
+    event = _CACHE_EVENTS.get(key)
+    if event is not None:
+        metrics.inc("cache_events_total", event=event)
+
+
+def _cached_response(entry: CacheEntry, cache: ResponseCache) -> Optional[requests.Response]:
+    # None if the body was evicted since lookup(): the caller treats it as a miss
+    body = cache.read_body(entry)
+    if body is None:
+        return None
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = body
+    resp.url = entry.final_url
+    resp.encoding = entry.encoding
+    resp.headers = CaseInsensitiveDict({"X-CEI6-Cache": "hit"})
+    if entry.content_type:
+        resp.headers["Content-Type"] = entry.content_type
+    if entry.etag:
+        resp.headers["ETag"] = entry.etag
+    if entry.last_modified:
+        resp.headers["Last-Modified"] = entry.last_modified
+    return resp
+
+
+# url -> (ETag, Last-Modified) of recent successful fetches, for callers that
+# only get the body back (detail records keep them for later revalidation).
+_VALIDATORS_MAX = 4096
+_validators: "OrderedDict[str, Tuple[Optional[str], Optional[str]]]" = OrderedDict()
+_validators_lock = threading.Lock()
+
+
+def _remember(url: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+    with _validators_lock:
+        _validators[url] = (etag, last_modified)
+        _validators.move_to_end(url)
+        while len(_validators) > _VALIDATORS_MAX:
+            _validators.popitem(last=False)
+
+
+def validators(url: str) -> Tuple[Optional[str], Optional[str]]:
+    """(ETag, Last-Modified) from the last successful get(url), consumed on read."""
+    with _validators_lock:
+        return _validators.pop(url, (None, None))
+
+
+def _rewrite(url: str, mapping: Mapping[str, str]) -> str:
+    for src, dst in mapping.items():
+        if url == src or url.startswith(src + "/"):
+            return dst + url[len(src):]
+    return url
+
+
+def get(
+    url: str,
+    timeout: float = DEFAULT_TIMEOUT,
+    headers: Optional[Mapping[str, str]] = None,
+    use_cache: bool = True,
+) -> requests.Response:
+    """
+    GET through the shared session. Raises requests.HTTPError for non-2xx.
+    With a cache configured, sends If-None-Match / If-Modified-Since and
+    serves 304s (and offline mode) from disk. A 304 answering the caller's
+    own conditional headers is returned as is and never cached.
+    use_cache=False bypasses the cache both ways, so the caller's validators
+    are the ones sent and a 304 reaches the caller.
+    """
+    cache = _cache if use_cache else None
+    entry = cache.lookup(url) if cache is not None else None
+    if _offline:
+        cached = _cached_response(entry, cache) if entry is not None else None
+        if cached is None:
+            _count("cache_misses")
+            raise OfflineCacheMiss(f"offline: {url} not in cache")
+        _count("cache_hits")
+        return cached
+
+    req_headers = dict(headers) if headers else {}
+    if entry is not None:
+        if entry.etag:
+            req_headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            req_headers["If-Modified-Since"] = entry.last_modified
+
+    s = get_session()
+    rate = _rate
+    origins = _origins
+    wire_url = _rewrite(url, origins) if origins else url
+    attempts = _config["retries"] + 1
+    for attempt in range(attempts):
+        rate.acquire(wire_url)
+        _count("requests")
+        started = time.monotonic()
+        resp = s.get(wire_url, timeout=timeout, headers=req_headers or None)
+        took = time.monotonic() - started
+        retry = resp.status_code in RETRY_STATUSES and attempt + 1 < attempts
+        if metrics.enabled():
+            # elapsed = send -> headers parsed; the body is read after that
+            wait = resp.elapsed.total_seconds()
+            metrics.observe("http_wait_seconds", wait)
+            metrics.observe("http_download_seconds", max(0.0, took - wait))
+            metrics.inc("http_responses_total", status=resp.status_code)
+            metrics.inc("http_response_bytes_total", len(resp.content))
+            if retry:
+                metrics.inc("http_retries_total", status=resp.status_code)
+        rate.record(
+            wire_url,
+            resp.status_code,
+            took,
+            retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+            backoff=_config["backoff"] * (2 ** attempt) if retry else 0.0,
+        )
+        if not retry:
+            break
+        resp.close()
+    if origins:
+        resp.url = _rewrite(str(resp.url), {v: k for k, v in origins.items()})
+    if resp.status_code == 304 and entry is not None:
+        cached = _cached_response(entry, cache)
+        if cached is None:
+            # evicted while we asked: the entry is dropped, so this refetches in full
+            return get(url, timeout=timeout, headers=headers, use_cache=use_cache)
+        _count("cache_revalidated")
+        _remember(url, entry.etag, entry.last_modified)
+        return cached
+    resp.raise_for_status()
+    if resp.status_code == 304:
+        # answers the caller's own validators: nothing to cache
+        return resp
+    _remember(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+    if cache is not None:
+        _count("cache_misses")
+        cache.store(
+            url,
+            resp.content,
+            final_url=str(resp.url),
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            encoding=resp.encoding,
+            content_type=resp.headers.get("Content-Type"),
+        )
+    return resp
+
+
+def fetch_text(
+    url: str,
+    timeout: float = DEFAULT_TIMEOUT,
+    encoding: Optional[str] = None,
+    headers: Optional[Mapping[str, str]] = None,
+) -> str:
+    resp = get(url, timeout=timeout, headers=headers)
+    if encoding:
+        resp.encoding = encoding
+    # Some CEI pages can be mis-encoded; requests handles most.
+    return resp.text
+
+
+def fetch_html(url: str, timeout: int = DEFAULT_TIMEOUT) -> Tuple[str, str]:
     """
     Returns (html_text, final_url).
     Raises requests.HTTPError for non-200 responses.
     """
-    resp = requests.get(url, headers=HEADERS, timeout=timeout)
-    resp.raise_for_status()
+    resp = get(url, timeout=timeout)
     # requests guesses encoding; keep its guess
     return resp.text, str(resp.url)
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hits (offline), 304 revalidations and misses (full downloads stored)."""
+    out = {k: _stats[k] for k in ("cache_hits", "cache_revalidated", "cache_misses")}
+    if _cache is not None:
+        out.update(_cache.stats())
+    return out
+
+
+def rate_stats() -> Dict[str, Dict[str, float]]:
+    """Per host: requests sent, throttled responses, current limit, achieved req/s."""
+    return _rate.stats()
+
+
+def connection_stats() -> Dict[str, int]:
+    """
+    Connection reuse counters, summed over the live urllib3 pools.
+    `reused` = requests that went out on an already-open connection.
+    """
+    opened = 0
+    sent = 0
+    s = _session
+    if s is not None:
+        seen = set()
+        for adapter in s.adapters.values():
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                opened += getattr(pool, "num_connections", 0)
+                sent += getattr(pool, "num_requests", 0)
+    return {
+        "requests": _stats["requests"],
+        "wire_requests": sent,  # includes retries
+        "connections_opened": opened,
+        "reused": max(0, sent - opened),
+    }
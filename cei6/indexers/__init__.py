@@ -1,14 +1,24 @@
 ﻿# Aggregator for indexer entry points.
 # These names match the actual files in this folder: *_indexer.py
 
-from .blogs_indexer import fetch_blogs_first_page
-from .news_indexer import fetch_news_releases_first_page
-from .opeds_indexer import fetch_opeds_first_page
-from .studies_indexer import fetch_studies_first_page
+from .blogs_indexer import fetch_blogs_first_page, iter_blogs_pages
+from .news_indexer import fetch_news_releases_first_page, iter_news_releases_pages
+from .opeds_indexer import fetch_opeds_first_page, iter_opeds_pages
+from .studies_indexer import fetch_studies_first_page, iter_studies_pages
+from .engine import ListingSpec, parse_listing
+from .pagination import crawl_listing, page_url
 
 __all__ = [
     "fetch_blogs_first_page",
     "fetch_news_releases_first_page",
     "fetch_opeds_first_page",
     "fetch_studies_first_page",
+    "iter_blogs_pages",
+    "iter_news_releases_pages",
+    "iter_opeds_pages",
+    "iter_studies_pages",
+    "ListingSpec",
+    "parse_listing",
+    "crawl_listing",
+    "page_url",
 ]
@@ -0,0 +1,176 @@
+# cei6/indexers/engine.py
+# Declarative listing extraction shared by every *_indexer.py. A ListingSpec
+# says where a type's listing lives and how its cards look; the selectors are
+# compiled once per process and each card's fields are read in a single walk
+# over its subtree instead of one select() call per field.
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+
+import soupsieve as sv
+from bs4 import BeautifulSoup, Tag
+
+from .. import metrics
+from ..dates import parse_date
+from ..http import fetch_text
+from ..models import DateWindow, ListingItem
+from ..parsing import LISTING_CARDS, LISTING_ONLY, has_listing_cards, targeted_soup
+from .pagination import crawl_listing
+
+ORIGIN = "https://cei.org"
+
+# Field selectors, shared by all CEI listing templates. Attribute-only tests
+# (author/issue links, the per-type fallback link) are plain string checks on
+# href; the structural ones are compiled with soupsieve once, at import.
+AUTHOR_PATHS = ("/experts/", "/people/", "/author/", "/staff/")
+ISSUE_PATH = "/issues/"
+TITLE_LINK = "h2 a, h3 a, .entry-title a"
+CATEGORY_LINK = ".cat-links a, .entry-categories a, a[rel='category tag']"
+POSTED = ".posted-on, .entry-date"
+
+_TITLE = sv.compile(TITLE_LINK)
+_CATEGORY = sv.compile(CATEGORY_LINK)
+_POSTED = sv.compile(POSTED)
+
+
+def _fetch_html(url: str) -> str:
+    return fetch_text(url, timeout=30, encoding="utf-8")
+
+
+@dataclass(frozen=True)
+class ListingSpec:
+    """
+    One content type's listing: where it lives and how its cards look.
+
+    url_prefix is the site path detail URLs start with (used when a card has
+    no title heading); page_cap is how many cards the first listing page shows.
+    """
+    content_type: str
+    listing_url: str
+    url_prefix: str
+    page_cap: int
+    card_selector: str = LISTING_CARDS
+
+    @cached_property
+    def cards(self) -> "sv.SoupSieve":
+        return sv.compile(self.card_selector)
+
+    @cached_property
+    def fallback_hrefs(self) -> Tuple[str, str]:
+        return (f"{ORIGIN}{self.url_prefix}", self.url_prefix)
+
+
+@dataclass
+class CardFields:
+    title: Optional[str] = None
+    url: Optional[str] = None
+    date_published: Optional[datetime] = None
+    issue: Optional[str] = None
+    authors: Tuple[str, ...] = ()
+
+
+@metrics.timed("extract_seconds", field="card")
+def extract_card(spec: ListingSpec, card: Tag) -> CardFields:
+    """
+    All fields of one card from a single walk over its descendants. The
+    structural selectors only run afterwards, on the card's few links, and
+    only when the cheaper signal is missing.
+    """
+    anchors: List[Tag] = []
+    issue_a = time_dt = time_text = None
+    authors: List[str] = []
+
+    for el in card.descendants:
+        if not isinstance(el, Tag):
+            continue
+        name = el.name
+        if name == "a":
+            anchors.append(el)
+            href = el.get("href") or ""
+            if issue_a is None and ISSUE_PATH in href:
+                issue_a = el
+            # Authors are links to people/experts pages
+            if any(p in href for p in AUTHOR_PATHS):
+                author = el.get_text(strip=True)
+                if author and author not in authors:
+                    authors.append(author)
+        elif name == "time":
+            if time_dt is None and el.has_attr("datetime"):
+                time_dt = el
+            elif time_text is None:
+                time_text = el
+
+    out = CardFields(authors=tuple(authors))
+    # Standard: title in h2/h3 a; fallback: any link into this type's section
+    title_a = next((a for a in anchors if _TITLE.match(a)), None)
+    if title_a is None or not title_a.get("href"):
+        prefixes = spec.fallback_hrefs
+        title_a = next((a for a in anchors if (a.get("href") or "").startswith(prefixes)), None)
+    if title_a is not None and title_a.get("href"):
+        out.title, out.url = title_a.get_text(strip=True), title_a["href"]
+
+    if time_dt is not None:
+        out.date_published = parse_date(time_dt["datetime"])
+    elif time_text is not None:
+        out.date_published = parse_date(time_text.get_text(" ", strip=True))
+    else:
+        # Some cards show a "posted on" span
+        posted = _POSTED.select_one(card)
+        if posted is not None:
+            out.date_published = parse_date(posted.get_text(" ", strip=True))
+
+    # CEI links issue tags like /issues/healthcare/; else category/tag chips
+    if issue_a is None:
+        issue_a = next((a for a in anchors if _CATEGORY.match(a)), None)
+    if issue_a is not None:
+        out.issue = issue_a.get_text(strip=True) or None
+    return out
+
+
+def parse_listing(spec: ListingSpec, html: str) -> List[ListingItem]:
+    soup: BeautifulSoup = targeted_soup(html, LISTING_ONLY, has_listing_cards)
+    items: List[ListingItem] = []
+    for card in spec.cards.select(soup):
+        f = extract_card(spec, card)
+        if not f.url or not f.title:
+            continue
+        items.append(
+            ListingItem(
+                content_type=spec.content_type,
+                title=f.title,
+                url=f.url if f.url.startswith("http") else f"{ORIGIN}{f.url}",
+                date_published=f.date_published,
+                issue=f.issue,
+                authors=f.authors,
+            )
+        )
+    return items
+
+
+def fetch_first_page(spec: ListingSpec) -> List[ListingItem]:
+    # Only keep as many cards as the site's first page shows
+    return parse_listing(spec, _fetch_html(spec.listing_url))[: spec.page_cap]
+
+
+def iter_pages(
+    spec: ListingSpec,
+    max_pages: Optional[int] = None,
+    known_urls: Optional[Set[str]] = None,
+    start_page: int = 1,
+    on_stop: Optional[Callable[[str, int], None]] = None,
+    window: Optional[DateWindow] = None,
+) -> Iterator[Tuple[int, List[ListingItem]]]:
+    """Yield (page, items) across /page/N/ listing pages (see crawl_listing)."""
+    return crawl_listing(
+        spec.listing_url,
+        _fetch_html,
+        lambda html: parse_listing(spec, html),
+        max_pages=max_pages,
+        known_urls=known_urls,
+        start_page=start_page,
+        on_stop=on_stop,
+        window=window,
+    )
@@ -0,0 +1,150 @@
+# cei6/indexers/pagination.py
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import requests
+
+from ..models import DateWindow, ListingItem
+
+
+def page_url(listing_url: str, page: int) -> str:
+    # WordPress-style archive pages: /blog/ , /blog/page/2/ , ...
+    if page <= 1:
+        return listing_url
+    return f"{listing_url.rstrip('/')}/page/{page}/"
+
+
+def _is_not_found(err: BaseException) -> bool:
+    resp = getattr(err, "response", None)
+    return isinstance(err, requests.HTTPError) and resp is not None and resp.status_code == 404
+
+
+def _seek_until(
+    fetch: Callable[[int], Optional[str]],
+    parse_page: Callable[[str], List[ListingItem]],
+    window: DateWindow,
+    cache: Dict[int, Optional[str]],
+) -> int:
+    """
+    First page holding anything older than window.until: an exponential probe
+    (1, 2, 4, 8, ...) then a binary search, so skipping years of newer posts
+    costs O(log pages) requests. Fetched pages are left in cache for the crawl.
+    """
+    def reached(n: int) -> bool:
+        if n not in cache:
+            cache[n] = fetch(n)
+        html = cache[n]
+        if html is None:
+            return True  # past the end
+        items = parse_page(html)
+        return not items or any(not window.newer(it.date_published) for it in items)
+
+    if reached(1):
+        return 1
+    lo, hi = 1, 2
+    while not reached(hi):
+        lo, hi = hi, hi * 2
+    # reached(lo) is False, reached(hi) is True
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if reached(mid):
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+
+def crawl_listing(
+    listing_url: str,
+    fetch_html: Callable[[str], str],
+    parse_page: Callable[[str], List[ListingItem]],
+    max_pages: Optional[int] = None,
+    known_urls: Optional[Set[str]] = None,
+    start_page: int = 1,
+    on_stop: Optional[Callable[[str, int], None]] = None,
+    window: Optional[DateWindow] = None,
+) -> Iterator[Tuple[int, List[ListingItem]]]:
+    """
+    Walk listing pages newest-first, yielding (page_number, items).
+
+    The next page is fetched in the background while the current one is
+    parsed. Stops on: max_pages reached, a 404 / empty page (end of archive),
+    or a page whose URLs are all in known_urls (everything older is indexed).
+    Once a page overlaps known_urls we stop prefetching, so a daily run costs
+    one or two requests.
+
+    With a date window only in-window (or undated) items are yielded. An
+    until bound seeks straight to the first page reaching it (when starting
+    from page 1); a since bound stops the walk on the first page whose dated
+    items are all older than it. Backfilling one quarter is then a handful
+    of requests.
+
+    on_stop(reason, page) is called with reason "end", "known", "max_pages"
+    or "since".
+    """
+    known = known_urls or set()
+    window = window or None
+    cache: Dict[int, Optional[str]] = {}
+
+    def _stop(reason: str, page: int) -> None:
+        if on_stop is not None:
+            on_stop(reason, page)
+
+    def _fetch(n: int) -> Optional[str]:
+        if n in cache:
+            return cache.pop(n)
+        try:
+            return fetch_html(page_url(listing_url, n))
+        except requests.HTTPError as e:
+            if n > 1 and _is_not_found(e):
+                return None  # ran past the last page
+            raise
+
+    if window is not None and window.until is not None and start_page == 1:
+        start_page = _seek_until(_fetch, parse_page, window, cache)
+        cache = {n: html for n, html in cache.items() if n >= start_page}
+
+    last_page = start_page + max_pages - 1 if max_pages else None
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="cei6-prefetch") as pool:
+        page = start_page
+        current: Future = pool.submit(_fetch, page)
+        overlapped = False
+        while True:
+            html = current.result()
+            if html is None:
+                _stop("end", page)
+                return
+            has_next = last_page is None or page < last_page
+            nxt: Optional[Future] = None
+            if has_next and not overlapped:
+                nxt = pool.submit(_fetch, page + 1)
+
+            items = parse_page(html)
+            if not items:
+                _stop("end", page)
+                return
+            n_known = sum(1 for it in items if it.url in known)
+            if n_known == len(items):
+                _stop("known", page)
+                return
+            crossed = False
+            if window is not None:
+                # a pinned old post alone doesn't end the walk: every dated item must be older
+                dated = [it.date_published for it in items if it.date_published is not None]
+                crossed = bool(dated) and all(window.older(d) for d in dated)
+                items = [it for it in items if window.contains(it.date_published)]
+            yield page, items
+
+            if crossed:
+                _stop("since", page)
+                return
+
+            if not has_next:
+                _stop("max_pages", page)
+                return
+            overlapped = n_known > 0
+            page += 1
+            current = nxt if nxt is not None else pool.submit(_fetch, page)
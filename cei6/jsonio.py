@@ -0,0 +1,194 @@
+# cei6/jsonio.py
+# JSON encode/decode for the JSONL datasets. Uses orjson (or msgspec) when
+# installed and falls back to the stdlib; all three write the same compact,
+# UTF-8 (non-ASCII-escaped) lines. Also: typed decoding into the model classes
+# and a URL-only scan that skips full parsing for dedupe/index rebuilds.
+#
+# CEI6_JSON=stdlib|orjson|msgspec forces a backend (e.g. to compare outputs).
+from __future__ import annotations
+
+import json
+import os
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional, Type, TypeVar
+
+from .models import DetailRecord, ListingItem
+
+T = TypeVar("T")
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _pick_backend() -> tuple[str, Callable[[Any], bytes], Callable[[Any], Any]]:
+    wanted = os.environ.get("CEI6_JSON", "").strip().lower()
+    if wanted in ("", "orjson"):
+        try:
+            import orjson
+
+            return "orjson", orjson.dumps, orjson.loads
+        except ImportError:
+            pass
+    if wanted in ("", "msgspec"):
+        try:
+            import msgspec
+
+            enc, dec = msgspec.json.Encoder(), msgspec.json.Decoder()
+            return "msgspec", enc.encode, dec.decode
+        except ImportError:
+            pass
+    return "stdlib", _stdlib_dumps, json.loads
+
+
+BACKEND, _dumps, _loads = _pick_backend()
+
+
+def dumps(obj: Any) -> str:
+    """One compact JSON document (no trailing newline)."""
+    return _dumps(obj).decode("utf-8")
+
+
+def dumps_line(obj: Any) -> str:
+    return _dumps(obj).decode("utf-8") + "\n"
+
+
+def loads(data: str | bytes) -> Any:
+    return _loads(data)
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield each JSON object in a JSONL file; blank and malformed lines are skipped."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = _loads(line)
+            except Exception:  # malformed line; backends raise different types
+                continue
+            if isinstance(obj, dict):
+                yield obj
+
+
+# --- URL-only scan -------------------------------------------------------------
+
+# First top-level-looking "url" key per line. A "url" inside a string value is
+# escaped (\"url\") and so never matches; escapes inside the URL itself fall
+# back to a real parse of the string literal.
+_URL_RE = re.compile(rb'"url"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def url_of(line: bytes) -> Optional[str]:
+    m = _URL_RE.search(line)
+    if m is None or not line.endswith(b"}"):
+        # no url key, or a truncated/odd line: let the real parser decide
+        try:
+            obj = _loads(line)
+        except Exception:
+            return None
+        url = obj.get("url") if isinstance(obj, dict) else None
+        return url if isinstance(url, str) else None
+    raw = m.group(1)
+    if b"\\" in raw:
+        return json.loads(b'"' + raw + b'"')
+    return raw.decode("utf-8", "replace")
+
+
+def scan_urls(path: str) -> Iterator[str]:
+    """Yield the url of every record in a JSONL file without decoding whole records."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            url = url_of(line)
+            if url:
+                yield url
+
+
+# --- typed decoding --------------------------------------------------------------
+
+def _parse_dt(value: Any) -> Any:
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _tuple(value: Any) -> tuple:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(value)
+
+
+def listing_from_record(obj: Dict[str, Any]) -> ListingItem:
+    return ListingItem(
+        obj.get("content_type") or "",
+        obj.get("title") or "",
+        obj["url"],
+        _parse_dt(obj.get("date_published")),
+        obj.get("issue"),
+        obj.get("authors") or (),
+    )
+
+
+def detail_from_record(obj: Dict[str, Any]) -> DetailRecord:
+    docs = obj.get("pdf_links")
+    if docs is None:
+        docs = obj.get("documents")
+    return DetailRecord(
+        content_type=obj.get("content_type") or "",
+        url=obj["url"],
+        title=obj.get("title"),
+        date_published=obj.get("date_published"),
+        issue=obj.get("issue"),
+        authors=_tuple(obj.get("authors")),
+        outlet=obj.get("outlet"),
+        outlet_url=obj.get("outlet_url"),
+        pdf_links=_tuple(docs),
+        paragraphs=_tuple(obj.get("paragraphs")),
+        content_hash=obj.get("content_hash"),
+        fetched_at=obj.get("fetched_at"),
+        etag=obj.get("etag"),
+        last_modified=obj.get("last_modified"),
+    )
+
+
+_DECODERS: Dict[type, Callable[[Dict[str, Any]], Any]] = {
+    ListingItem: listing_from_record,
+    DetailRecord: detail_from_record,
+}
+
+
+def iter_models(path: str, model: Type[T]) -> Iterator[T]:
+    """Decode a JSONL file straight into ListingItem or DetailRecord instances."""
+    convert = _DECODERS[model]
+    for obj in iter_jsonl(path):
+        if not obj.get("url"):
+            continue
+        yield convert(obj)
+
+
+__all__ = [
+    "BACKEND",
+    "detail_from_record",
+    "dumps",
+    "dumps_line",
+    "iter_jsonl",
+    "iter_models",
+    "listing_from_record",
+    "loads",
+    "scan_urls",
+    "url_of",
+]
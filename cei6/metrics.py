@@ -0,0 +1,258 @@
+# cei6/metrics.py
+# In-process metrics: counters and latency histograms, keyed by name + labels,
+# exported as JSON or Prometheus text at the end of a run (cli --metrics).
+#
+# Disabled by default; every hook checks one module flag first, so the
+# instrumented hot paths cost a function call when metrics are off.
+# Work done in parse worker processes (--parse-workers) is not collected.
+from __future__ import annotations
+
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+PREFIX = "cei6_"
+# seconds: sub-millisecond extract helpers up to slow origin responses
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_enabled = False
+_lock = threading.Lock()
+_counters: Dict[str, Dict[LabelKey, float]] = {}
+_histograms: Dict[str, Dict[LabelKey, "Histogram"]] = {}
+_help: Dict[str, str] = {}
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot = +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        i = 0
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Bucket upper bound containing the q-th observation (Prometheus-style estimate)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+
+def _key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def enable(on: bool = True) -> None:
+    global _enabled
+    _enabled = bool(on)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def describe(name: str, text: str) -> None:
+    """HELP text for the Prometheus export."""
+    _help[name] = text
+
+
+def inc(name: str, value: float = 1, **labels: Any) -> None:
+    if not _enabled:
+        return
+    key = _key(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + value
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    if not _enabled:
+        return
+    key = _key(labels)
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        h = series.get(key)
+        if h is None:
+            h = series[key] = Histogram()
+        h.observe(value)
+
+
+@contextmanager
+def timer(name: str, **labels: Any) -> Iterator[None]:
+    """Record the duration of the with-block in histogram `name` (seconds)."""
+    if not _enabled:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - t0, **labels)
+
+
+def timed(name: str, **labels: Any) -> Callable[[F], F]:
+    """Decorator form of timer()."""
+
+    def deco(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - t0, **labels)
+
+        return wrapper  # type: ignore[return-value]
+
+    return deco
+
+
+# ---- export ------------------------------------------------------------------
+
+def _labels_dict(key: LabelKey) -> Dict[str, str]:
+    return dict(key)
+
+
+def snapshot() -> Dict[str, Any]:
+    """JSON-ready view: counters, histogram summaries and derived rates."""
+    with _lock:
+        counters = {
+            name: [{"labels": _labels_dict(k), "value": v} for k, v in sorted(series.items())]
+            for name, series in sorted(_counters.items())
+        }
+        histograms = {
+            name: [
+                {
+                    "labels": _labels_dict(k),
+                    "count": h.count,
+                    "sum": round(h.sum, 6),
+                    "mean": round(h.sum / h.count, 6) if h.count else 0.0,
+                    "min": round(h.min, 6) if h.count else 0.0,
+                    "max": round(h.max, 6),
+                    "p50": h.quantile(0.5),
+                    "p95": h.quantile(0.95),
+                    "buckets": dict(zip([str(b) for b in h.buckets] + ["+Inf"], h.counts)),
+                }
+                for k, h in sorted(series.items())
+            ]
+            for name, series in sorted(_histograms.items())
+        }
+    derived: Dict[str, float] = {}
+    cache = {row["labels"].get("event"): row["value"] for row in counters.get("cache_events_total", [])}
+    lookups = sum(cache.values())
+    if lookups:
+        derived["cache_hit_rate"] = round((cache.get("hit", 0) + cache.get("revalidated", 0)) / lookups, 4)
+    return {"counters": counters, "histograms": histograms, "derived": derived}
+
+
+def to_json(indent: Optional[int] = 2) -> str:
+    return json.dumps(snapshot(), indent=indent)
+
+
+def _fmt_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs)
+    return "{" + body + "}"
+
+
+def to_prometheus() -> str:
+    lines: List[str] = []
+    with _lock:
+        for name, series in sorted(_counters.items()):
+            full = PREFIX + name
+            if name in _help:
+                lines.append(f"# HELP {full} {_help[name]}")
+            lines.append(f"# TYPE {full} counter")
+            for k, v in sorted(series.items()):
+                lines.append(f"{full}{_fmt_labels(k)} {v:g}")
+        for name, series in sorted(_histograms.items()):
+            full = PREFIX + name
+            if name in _help:
+                lines.append(f"# HELP {full} {_help[name]}")
+            lines.append(f"# TYPE {full} histogram")
+            for k, h in sorted(series.items()):
+                cumulative = 0
+                for bound, c in zip(list(h.buckets) + [None], h.counts):
+                    cumulative += c
+                    le = "+Inf" if bound is None else f"{bound:g}"
+                    lines.append(f"{full}_bucket{_fmt_labels(k, ('le', le))} {cumulative}")
+                lines.append(f"{full}_sum{_fmt_labels(k)} {h.sum:.6f}")
+                lines.append(f"{full}_count{_fmt_labels(k)} {h.count}")
+    return "\n".join(lines) + "\n"
+
+
+def summary_lines() -> List[str]:
+    """Short human-readable digest: one line per histogram series."""
+    out: List[str] = []
+    for name, rows in snapshot()["histograms"].items():
+        for r in rows:
+            labels = ",".join(f"{k}={v}" for k, v in r["labels"].items())
+            out.append(
+                f"{name}{'{' + labels + '}' if labels else ''}: n={r['count']} total={r['sum']:.3f}s"
+                f" mean={r['mean'] * 1000:.2f}ms p95≤{r['p95'] * 1000:.1f}ms max={r['max'] * 1000:.1f}ms"
+            )
+    return out
+
+
+def write(path: str, fmt: Optional[str] = None) -> None:
+    """Write the export to `path`; fmt defaults from the extension (.prom/.txt -> Prometheus)."""
+    if fmt is None:
+        fmt = "prometheus" if path.endswith((".prom", ".txt")) else "json"
+    text = to_prometheus() if fmt == "prometheus" else to_json()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+describe("http_connect_seconds", "New connection setup (DNS + TCP + TLS).")
+describe("http_wait_seconds", "Request sent to response headers received (server wait).")
+describe("http_download_seconds", "Response body transfer after the headers.")
+describe("http_response_bytes_total", "Response body bytes received.")
+describe("http_retries_total", "Requests retried, by status.")
+describe("cache_events_total", "Response cache outcomes (hit, revalidated, miss).")
+describe("parse_seconds", "HTML -> soup.")
+describe("extract_seconds", "Field extraction from parsed soup.")
+describe("storage_write_seconds", "Time in storage writers.")
+describe("storage_records_total", "Records written.")
+describe("storage_bytes_total", "Bytes appended to JSONL.")
@@ -1,20 +1,31 @@
 # cei6/models.py
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import Iterable, List, Optional, Dict, Any, Tuple, Union
 import re
+import sys
+
+from .dates import parse_date
 
+_WS = re.compile(r"\s+")
+_TRAILING = re.compile(r"[,\s]+$")
 
+
+@lru_cache(maxsize=8192)
 def _normalize_author(name: str) -> str:
     # collapse whitespace
-    name = re.sub(r"\s+", " ", name).strip()
+    name = _WS.sub(" ", name).strip()
     # remove trailing commas/spaces
-    name = re.sub(r"[,\s]+$", "", name)
-    return name
+    name = _TRAILING.sub("", name)
+    # the same few hundred names repeat across the archive: share one string each
+    return sys.intern(name)
+
 
-def normalize_authors(authors: List[str]) -> List[str]:
+@lru_cache(maxsize=8192)
+def _normalize_tuple(authors: Tuple[str, ...]) -> Tuple[str, ...]:
     out: List[str] = []
     seen = set()
     for a in authors:
@@ -26,33 +37,48 @@ def normalize_authors(authors: List[str]) -> List[str]:
         if clean not in seen:
             seen.add(clean)
             out.append(clean)
-    return out
+    return tuple(out)
+
+
+def _author_tuple(authors: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    if not authors:
+        return ()
+    try:
+        return _normalize_tuple(tuple(authors))
+    except TypeError:  # unhashable junk in the list; normalize uncached
+        return _normalize_tuple.__wrapped__(tuple(authors))
+
+
+def normalize_authors(authors: Iterable[str]) -> List[str]:
+    return list(_author_tuple(authors))
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ListingItem:
     content_type: str           # "blogs" | "news_releases" | "op_eds" | "studies"
     title: str
     url: str
     date_published: Optional[datetime] = None
     issue: Optional[str] = None
-    authors: List[str] = None   # normalized at construction
+    authors: Tuple[str, ...] = ()   # normalized (and interned) at construction
 
     def __post_init__(self):
-        if self.authors is None:
-            self.authors = []
-        self.authors = normalize_authors(self.authors)
+        object.__setattr__(self, "authors", _author_tuple(self.authors))
 
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
-        # serialize datetime -> ISO string
-        if self.date_published and isinstance(self.date_published, datetime):
-            d["date_published"] = self.date_published.isoformat()
-        return d
+        dp = self.date_published
+        return {
+            "content_type": self.content_type,
+            "title": self.title,
+            "url": self.url,
+            # serialize datetime -> ISO string
+            "date_published": dp.isoformat() if isinstance(dp, datetime) else dp,
+            "issue": self.issue,
+            "authors": list(self.authors),
+        }
 
-from dataclasses import dataclass, field
-from typing import Tuple, Optional, Dict, Any
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DetailRecord:
     content_type: str                   # "blogs" | "op_eds" | ...
     url: str
@@ -64,6 +90,13 @@ class DetailRecord:
     outlet_url: Optional[str] = None    # op-eds only (future)
     pdf_links: Tuple[str, ...] = field(default_factory=tuple)
     paragraphs: Tuple[str, ...] = field(default_factory=tuple)
+    content_hash: Optional[str] = None  # see cei6.details.fingerprint
+    fetched_at: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "authors", _author_tuple(self.authors))
 
     def to_json_obj(self) -> Dict[str, Any]:
         return {
@@ -77,4 +110,42 @@ class DetailRecord:
             "outlet_url": self.outlet_url,
             "pdf_links": list(self.pdf_links),
             "paragraphs": list(self.paragraphs),
+            "content_hash": self.content_hash,
+            "fetched_at": self.fetched_at,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
         }
+
+    to_dict = to_json_obj
+
+
+DateLike = Union[datetime, str, None]
+
+
+@dataclass(frozen=True, slots=True)
+class DateWindow:
+    """
+    Publication-date filter: since inclusive, until exclusive. Undated items are
+    kept. Bounds and dates compare as aware UTC (naive values are site-local).
+    """
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "since", parse_date(self.since))
+        object.__setattr__(self, "until", parse_date(self.until))
+
+    def __bool__(self) -> bool:
+        return self.since is not None or self.until is not None
+
+    def older(self, value: DateLike) -> bool:
+        """Published before the window (i.e. past it, on a newest-first listing)."""
+        dt = parse_date(value)
+        return dt is not None and self.since is not None and dt < self.since
+
+    def newer(self, value: DateLike) -> bool:
+        dt = parse_date(value)
+        return dt is not None and self.until is not None and dt >= self.until
+
+    def contains(self, value: DateLike) -> bool:
+        return not self.older(value) and not self.newer(value)
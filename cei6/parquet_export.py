@@ -0,0 +1,165 @@
+# cei6/parquet_export.py
+# JSONL -> partitioned Parquet for analysis (pyarrow is optional and only
+# imported here, when an export actually runs).
+#
+#   {out}/{index,details}/content_type={type}/year={yyyy}/part-0.parquet
+#
+# Records are read and converted in batches, with one ParquetWriter open per
+# partition, so memory is bounded by batch_size rather than file size.
+from __future__ import annotations
+
+import os
+import re
+import shutil
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from . import jsonio
+from .dates import SITE_TZ, parse_date
+from .storage import OUT_DETAILS_DIR, OUT_INDEX_DIR, ROOT_DIR
+
+DEFAULT_PARQUET_DIR = os.path.join(ROOT_DIR, "outputs", "parquet")
+DEFAULT_BATCH_SIZE = 5000
+UNKNOWN_YEAR = "unknown"
+
+_YEAR = re.compile(r"\b(19|20)\d{2}\b")
+
+# column -> is a list<string> column. content_type (and year) are not stored in
+# the files: they come from the hive-style partition directories.
+INDEX_COLUMNS: Tuple[Tuple[str, bool], ...] = (
+    ("url", False),
+    ("title", False),
+    ("date_published", False),
+    ("issue", False),
+    ("authors", True),
+)
+DETAIL_COLUMNS: Tuple[Tuple[str, bool], ...] = (
+    ("url", False),
+    ("title", False),
+    ("date_published", False),
+    ("issue", False),
+    ("authors", True),
+    ("outlet", False),
+    ("outlet_url", False),
+    ("pdf_links", True),
+    ("paragraphs", True),
+    ("content_hash", False),
+    ("fetched_at", False),
+)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)") from e
+    return pyarrow, pyarrow.parquet
+
+
+def year_of(date_published: Any) -> str:
+    """
+    Site-local (US/Eastern) year: stored dates are UTC, so an evening post on
+    Dec 31 would otherwise land in the next year's partition.
+    """
+    dt = parse_date(date_published)
+    if dt is not None:
+        return str(dt.astimezone(SITE_TZ).year)
+    m = _YEAR.search(date_published) if isinstance(date_published, str) else None
+    return m.group(0) if m else UNKNOWN_YEAR
+
+
+def _str_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(v) for v in value if v is not None]
+
+
+def _row(rec: Dict[str, Any], columns: Tuple[Tuple[str, bool], ...]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {}
+    for name, is_list in columns:
+        value = rec.get(name)
+        if name == "pdf_links" and value is None:
+            value = rec.get("documents")  # detail JSONL calls these "documents"
+        if is_list:
+            row[name] = _str_list(value)
+        else:
+            row[name] = None if value is None else str(value)
+    return row
+
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for r in rows:
+        batch.append(r)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def export_parquet(
+    kind: str,
+    type_name: str,
+    out_dir: str = DEFAULT_PARQUET_DIR,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    compression: str = "zstd",
+) -> Dict[str, int]:
+    """
+    Convert outputs/{kind}/{type}.jsonl into Parquet partitioned by year of
+    date_published. Replaces this type's previous export. Returns rows per year.
+    """
+    pa, pq = _require_pyarrow()
+    columns = INDEX_COLUMNS if kind == "index" else DETAIL_COLUMNS
+    schema = pa.schema(
+        [pa.field(name, pa.list_(pa.string()) if is_list else pa.string()) for name, is_list in columns]
+    )
+    src = os.path.join(OUT_INDEX_DIR if kind == "index" else OUT_DETAILS_DIR, f"{type_name}.jsonl")
+    base = os.path.join(out_dir, kind, f"content_type={type_name}")
+    # dot-prefixed, so dataset readers skip it while the export is in progress
+    tmp_base = os.path.join(out_dir, kind, f".tmp-content_type={type_name}")
+    if os.path.isdir(tmp_base):
+        shutil.rmtree(tmp_base)
+
+    writers: Dict[str, Any] = {}
+    counts: Dict[str, int] = {}
+    try:
+        rows = (_row(rec, columns) for rec in jsonio.iter_jsonl(src) if rec.get("url"))
+        for batch in _batches(rows, max(1, batch_size)):
+            by_year: Dict[str, List[Dict[str, Any]]] = {}
+            for row in batch:
+                by_year.setdefault(year_of(row["date_published"]), []).append(row)
+            for year, year_rows in by_year.items():
+                w = writers.get(year)
+                if w is None:
+                    part_dir = os.path.join(tmp_base, f"year={year}")
+                    os.makedirs(part_dir, exist_ok=True)
+                    w = writers[year] = pq.ParquetWriter(
+                        os.path.join(part_dir, "part-0.parquet"), schema, compression=compression
+                    )
+                w.write_table(pa.Table.from_pylist(year_rows, schema=schema))
+                counts[year] = counts.get(year, 0) + len(year_rows)
+    except BaseException:
+        for w in writers.values():
+            w.close()
+        shutil.rmtree(tmp_base, ignore_errors=True)
+        raise
+    for w in writers.values():
+        w.close()
+
+    # swap in the new export only once it is complete
+    if os.path.isdir(base):
+        shutil.rmtree(base)
+    if os.path.isdir(tmp_base):
+        os.replace(tmp_base, base)
+    return counts
+
+
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "DEFAULT_PARQUET_DIR",
+    "export_parquet",
+    "year_of",
+]
@@ -0,0 +1,97 @@
+# cei6/parsing.py
+# One place to build soups. Defaults to lxml (much faster than html.parser) and,
+# when "targeted" is on, parses only the <main>/<article> subtree the indexers
+# and detail parsers actually read, falling back to a full parse if the
+# strained tree is missing what the caller needs.
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from . import metrics
+
+try:
+    import lxml  # noqa: F401
+
+    DEFAULT_PARSER = "lxml"
+except ImportError:  # pragma: no cover - lxml is in requirements.txt
+    DEFAULT_PARSER = "html.parser"
+
+# Listing cards, as selected by every *_indexer.py
+LISTING_CARDS = "article, .post, .card, .post-card"
+
+# Skip site header/nav/footer/sidebars: content lives in <main> (or bare <article>).
+LISTING_ONLY = SoupStrainer(["main", "article"])
+DETAIL_ONLY = SoupStrainer(["main", "article", "h1"])
+
+_config = {"parser": DEFAULT_PARSER, "targeted": True}
+
+
+def configure(parser: Optional[str] = None, targeted: Optional[bool] = None) -> None:
+    """parser: "lxml" | "html.parser" | "html5lib"; targeted: use SoupStrainer subtrees."""
+    if parser is not None:
+        _config["parser"] = parser
+    if targeted is not None:
+        _config["targeted"] = bool(targeted)
+
+
+def current_parser() -> str:
+    return _config["parser"]
+
+
+def is_targeted() -> bool:
+    return bool(_config["targeted"])
+
+
+def make_soup(html: str, only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    targeted = only is not None and _config["targeted"]
+    with metrics.timer("parse_seconds", parser=_config["parser"], targeted=targeted):
+        if targeted:
+            return BeautifulSoup(html, _config["parser"], parse_only=only)
+        return BeautifulSoup(html, _config["parser"])
+
+
+def targeted_soup(
+    html: str,
+    only: SoupStrainer,
+    ok: Callable[[BeautifulSoup], bool],
+) -> BeautifulSoup:
+    """
+    Parse just the `only` subtree; if ok(soup) says the strained tree lacks what
+    the caller needs (unusual template), re-parse the whole page.
+    """
+    if _config["targeted"]:
+        soup = make_soup(html, only)
+        if ok(soup):
+            return soup
+    return make_soup(html)
+
+
+def has_listing_cards(soup: BeautifulSoup) -> bool:
+    return soup.select_one(LISTING_CARDS) is not None
+
+
+def has_entry_content(soup: BeautifulSoup) -> bool:
+    return (
+        soup.find(class_="entry-content") is not None
+        or soup.find(class_="post-content") is not None
+    )
+
+
+# Post header parts read by the detail parsers (authors/date/issue, title).
+DETAIL_HEADER_CLASSES = ("entry-meta", "entry-title")
+
+
+def has_detail_parts(html: str) -> Callable[[BeautifulSoup], bool]:
+    """
+    ok() for detail pages: the strained tree has the entry content and every
+    header part the page has at all. A theme that puts the header outside
+    <main>/<article> then gets a full parse instead of empty authors/dates.
+    """
+    on_page = [c for c in DETAIL_HEADER_CLASSES if c in html]  # cheap substring scan
+
+    def ok(soup: BeautifulSoup) -> bool:
+        return has_entry_content(soup) and all(soup.find(class_=c) is not None for c in on_page)
+
+    return ok
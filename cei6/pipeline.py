@@ -0,0 +1,130 @@
+# cei6/pipeline.py
+# Two-stage detail pipeline:
+#   I/O stage    — worker threads download raw HTML (run_detail_jobs)
+#   parse stage  — a ProcessPoolExecutor runs pure parse_*_html(html, url) functions
+# Both stages are bounded, so at most ~2x threads pages and ~2x processes
+# parses are in flight regardless of input size.
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Mapping, Optional, Tuple, Union
+
+from . import parsing
+from .details.engine import HostLimiter, JobResult, run_detail_jobs
+
+
+def _init_worker(parser: str, targeted: bool) -> None:
+    # Child processes don't inherit runtime configuration on spawn platforms.
+    parsing.configure(parser=parser, targeted=targeted)
+
+
+FetchFn = Callable[[str], str]
+ParseFn = Callable[[str, str], Any]
+
+
+def _for_item(fn: Union[Callable, Mapping[str, Callable]], item: Any) -> Callable:
+    # A mapping dispatches on item.content_type, so mixed types share one pipeline.
+    if isinstance(fn, Mapping):
+        return fn[item.content_type]
+    return fn
+
+
+def default_parse_workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def iter_pipeline(
+    items: Iterable[Any],
+    fetch_html: Union[FetchFn, Mapping[str, FetchFn]],
+    parse_html: Union[ParseFn, Mapping[str, ParseFn]],
+    concurrency: int = 4,
+    per_host: Optional[int] = None,
+    parse_workers: Optional[int] = None,
+    ordered: bool = True,
+    limiter: Optional[HostLimiter] = None,
+    max_results: Optional[int] = None,
+) -> Iterator[JobResult]:
+    """
+    Yield (item, record, error) for each item (anything with a .url).
+    fetch_html(url) runs in threads; parse_html(html, url) must be a picklable
+    module-level function and runs in a process pool. parse_workers=0 parses
+    inline in this process. Either may be a {content_type: fn} mapping.
+    limiter and max_results are passed to run_detail_jobs (only fetch failures
+    count against max_results there, not parse failures).
+    """
+    fetched = run_detail_jobs(
+        items,
+        lambda it: _for_item(fetch_html, it)(it.url),
+        concurrency=concurrency,
+        per_host=per_host,
+        ordered=ordered,
+        limiter=limiter,
+        max_results=max_results,
+    )
+
+    if parse_workers == 0:
+        try:
+            for item, html, err in fetched:
+                if err is not None:
+                    yield (item, None, err)
+                    continue
+                try:
+                    yield (item, _for_item(parse_html, item)(html, item.url), None)
+                except Exception as e:
+                    yield (item, None, e)
+        finally:
+            fetched.close()
+        return
+
+    workers = parse_workers or default_parse_workers()
+    window = workers * 2
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(parsing.current_parser(), parsing.is_targeted()),
+    )
+    # Fetch failures are queued alongside parse futures so ordering holds.
+    order: Deque[Tuple[Any, Optional[Future], Optional[BaseException]]] = deque()
+    owner: Dict[Future, Any] = {}
+
+    def _take(item: Any, fut: Future) -> JobResult:
+        owner.pop(fut, None)
+        err = fut.exception()
+        if err is not None:
+            return (item, None, err)
+        return (item, fut.result(), None)
+
+    def _drain(block_until: int) -> Iterator[JobResult]:
+        # Yield finished work until at most block_until parses are outstanding.
+        if ordered:
+            while order and (len(owner) > block_until or order[0][1] is None or order[0][1].done()):
+                item, fut, err = order.popleft()
+                if fut is None:
+                    yield (item, None, err)
+                else:
+                    yield _take(item, fut)
+        else:
+            while order and order[0][1] is None:
+                item, _, err = order.popleft()
+                yield (item, None, err)
+            while len(owner) > block_until:
+                done, _ = wait(list(owner), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield _take(owner[fut], fut)
+
+    try:
+        for item, html, err in fetched:
+            if err is not None:
+                order.append((item, None, err))
+            else:
+                fut = pool.submit(_for_item(parse_html, item), html, item.url)
+                owner[fut] = item
+                if ordered:
+                    order.append((item, fut, None))
+            yield from _drain(window - 1)
+        yield from _drain(0)
+    finally:
+        fetched.close()
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,183 @@
+# cei6/ratelimit.py
+# Adaptive per-host rate control (AIMD token bucket) for cei6.http.
+#
+# Each host gets a token bucket whose rate rises additively while responses are
+# healthy and is cut multiplicatively on 429/403/5xx or when latency climbs well
+# above the best seen. Retry-After (seconds or HTTP date) pauses the whole host,
+# so every worker thread backs off together instead of hammering in lockstep.
+from __future__ import annotations
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+THROTTLE_STATUSES = (403, 429, 503)
+ERROR_STATUSES = (500, 502, 504)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class HostRate:
+    def __init__(
+        self,
+        rate: float = 2.0,
+        min_rate: float = 0.2,
+        max_rate: float = 10.0,
+        increase: float = 0.5,
+        latency_factor: float = 3.0,
+    ):
+        self.rate = float(rate)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase = float(increase)
+        self.latency_factor = float(latency_factor)
+        self.tokens = 1.0
+        self.blocked_until = 0.0
+        self._last = time.monotonic()
+        self._last_cut = 0.0
+        self._best_latency: Optional[float] = None
+        self._ewma: Optional[float] = None
+        self._lock = threading.Lock()
+        # counters
+        self.requests = 0
+        self.throttled = 0
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+
+    def _refill(self, now: float) -> None:
+        burst = max(1.0, self.rate)
+        self.tokens = min(burst, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def wait_unblocked(self) -> None:
+        """Sleep out a host-wide pause (Retry-After / backoff) without rate limiting."""
+        while True:
+            with self._lock:
+                wait = self.blocked_until - time.monotonic()
+            if wait <= 0:
+                return
+            time.sleep(min(wait, 5.0))
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1.0:
+                        self.tokens -= 1.0
+                        self.requests += 1
+                        if self.first_ts is None:
+                            self.first_ts = now
+                        return
+                    wait = (1.0 - self.tokens) / self.rate
+            time.sleep(min(wait, 5.0))
+
+    def _cut(self, factor: float, now: float) -> None:
+        # at most one cut per second, so a burst of errors from in-flight
+        # requests counts as one congestion signal
+        if now - self._last_cut >= 1.0:
+            self.rate = max(self.min_rate, self.rate * factor)
+            self.tokens = min(self.tokens, 1.0)
+            self._last_cut = now
+
+    def record(self, status: int, latency: float, retry_after: Optional[float] = None,
+               backoff: float = 0.0) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.last_ts = now
+            if status in THROTTLE_STATUSES or status in ERROR_STATUSES:
+                self.throttled += 1
+                self._cut(0.5 if status in THROTTLE_STATUSES else 0.7, now)
+                pause = retry_after if retry_after is not None else backoff
+                if pause:
+                    self.blocked_until = max(self.blocked_until, now + pause)
+                return
+            if status >= 400:
+                return  # 404 etc. say nothing about load
+            self._ewma = latency if self._ewma is None else 0.8 * self._ewma + 0.2 * latency
+            if self._best_latency is None or latency < self._best_latency:
+                self._best_latency = latency
+            if self._ewma > self.latency_factor * max(self._best_latency, 0.05):
+                self._cut(0.9, now)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase / max(self.rate, 1.0))
+
+    def achieved_rps(self) -> float:
+        if self.first_ts is None or self.last_ts is None or self.last_ts <= self.first_ts:
+            return 0.0
+        return self.requests / (self.last_ts - self.first_ts)
+
+
+class RateController:
+    """Per-host HostRate registry; hosts are created on first use."""
+
+    def __init__(self, enabled: bool = True, **host_kwargs: float):
+        self.enabled = enabled
+        self.host_kwargs = host_kwargs
+        self._hosts: Dict[str, HostRate] = {}
+        self._lock = threading.Lock()
+
+    def host(self, url: str) -> HostRate:
+        key = urlsplit(url).netloc.lower()
+        with self._lock:
+            hr = self._hosts.get(key)
+            if hr is None:
+                hr = HostRate(**self.host_kwargs)
+                self._hosts[key] = hr
+            return hr
+
+    def acquire(self, url: str) -> None:
+        if self.enabled:
+            self.host(url).acquire()
+        else:
+            self.host(url).wait_unblocked()
+
+    def record(self, url: str, status: int, latency: float,
+               retry_after: Optional[float] = None, backoff: float = 0.0) -> None:
+        hr = self.host(url)
+        if not self.enabled:
+            # no rate control, but a pause still holds every thread on this host
+            # (the next acquire() waits it out rather than this worker sleeping now)
+            with hr._lock:
+                hr.requests += 1
+                now = time.monotonic()
+                hr.first_ts = hr.first_ts or now - latency
+                hr.last_ts = now
+                pause = retry_after if retry_after is not None else backoff
+                if pause:
+                    hr.blocked_until = max(hr.blocked_until, now + pause)
+            return
+        hr.record(status, latency, retry_after=retry_after, backoff=backoff)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            hosts = dict(self._hosts)
+        for host, hr in hosts.items():
+            out[host] = {
+                "requests": hr.requests,
+                "throttled": hr.throttled,
+                "rate_limit": round(hr.rate, 2),
+                "achieved_rps": round(hr.achieved_rps(), 2),
+            }
+        return out
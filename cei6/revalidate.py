@@ -0,0 +1,176 @@
+# cei6/revalidate.py
+# Catch edits to already-archived articles without a full re-crawl: pick the
+# stored detail records fetched (or re-checked) longest ago, re-fetch them with
+# a conditional GET on their stored ETag/Last-Modified, and rewrite only the
+# records whose content hash changed.
+#
+# Re-check times and the latest validators live in outputs/state/{type}.checked.json,
+# so unchanged records are never rewritten yet still rotate to the back of the queue.
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from . import http
+from .backends import StorageBackend
+from .console import say
+from .dates import parse_date
+from .details import DETAIL_PARSERS, REFERERS, HostLimiter, content_hash, run_detail_jobs, stamp
+from .state import load_checked, save_checked
+
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_LIMIT = 100
+
+_NEVER = datetime.min.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class RevalidateStats:
+    checked: int = 0
+    not_modified: int = 0   # 304 to the conditional GET
+    unchanged: int = 0      # re-downloaded, same content hash
+    changed: int = 0        # rewritten
+    gone: int = 0           # 404/410 now; the stored record is kept
+    failed: int = 0
+
+
+@dataclass(frozen=True)
+class Candidate:
+    url: str
+    content_type: str
+    content_hash: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def _last_seen(rec: Dict[str, Any], log: Optional[Dict[str, Any]]) -> datetime:
+    seen = [parse_date(rec.get("fetched_at")), parse_date((log or {}).get("at"))]
+    return max((d for d in seen if d is not None), default=_NEVER)
+
+
+def select_stale(
+    type_name: str,
+    records: Iterable[Dict[str, Any]],
+    checked: Dict[str, Dict[str, Any]],
+    max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    limit: int = DEFAULT_LIMIT,
+    now: Optional[datetime] = None,
+) -> List[Candidate]:
+    """
+    Up to `limit` records not fetched or re-checked within max_age_days,
+    oldest first (never-stamped records first of all). Streams the records;
+    only the `limit` oldest are held at once.
+    """
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=max_age_days)
+
+    def _aged() -> Iterable[Tuple[datetime, Dict[str, Any]]]:
+        for rec in records:
+            url = rec.get("url")
+            if not url:
+                continue
+            seen = _last_seen(rec, checked.get(url))
+            if seen <= cutoff:
+                yield seen, rec
+
+    out: List[Candidate] = []
+    for _, rec in heapq.nsmallest(max(0, limit), _aged(), key=lambda pair: pair[0]):
+        log = checked.get(rec["url"]) or {}
+        out.append(
+            Candidate(
+                url=rec["url"],
+                content_type=type_name,
+                # records stored before hashing existed are hashed from what was stored
+                content_hash=rec.get("content_hash") or content_hash(rec),
+                etag=log.get("etag") or rec.get("etag"),
+                last_modified=log.get("last_modified") or rec.get("last_modified"),
+            )
+        )
+    return out
+
+
+def _recheck(c: Candidate) -> Optional[Any]:
+    """The re-parsed, stamped detail; None if the server answered 304."""
+    headers = {"Referer": REFERERS[c.content_type]}
+    if c.etag:
+        headers["If-None-Match"] = c.etag
+    if c.last_modified:
+        headers["If-Modified-Since"] = c.last_modified
+    # the stored record's validators decide, not whatever the response cache holds
+    resp = http.get(c.url, headers=headers, use_cache=False)
+    if resp.status_code == 304:
+        return None
+    parse_html = DETAIL_PARSERS[c.content_type][1]
+    return stamp(parse_html(resp.text, c.url))
+
+
+def _is_gone(err: BaseException) -> bool:
+    resp = getattr(err, "response", None)
+    return isinstance(err, requests.HTTPError) and resp is not None and resp.status_code in (404, 410)
+
+
+def revalidate_type(
+    backend: StorageBackend,
+    type_name: str,
+    max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    limit: int = DEFAULT_LIMIT,
+    concurrency: int = 1,
+    per_host: Optional[int] = None,
+    limiter: Optional[HostLimiter] = None,
+) -> RevalidateStats:
+    """
+    Re-check one type's stalest detail records; rewrite those that changed.
+    limiter is shared with other types' jobs, as in run_detail_jobs.
+    """
+    stats = RevalidateStats()
+    if type_name not in DETAIL_PARSERS:
+        return stats
+    checked = load_checked(type_name)
+    candidates = select_stale(
+        type_name,
+        backend.iter_records("details", type_name),
+        checked,
+        max_age_days=max_age_days,
+        limit=limit,
+    )
+    if not candidates:
+        return stats
+
+    changed: List[Any] = []
+    jobs = run_detail_jobs(
+        candidates,
+        _recheck,
+        concurrency=concurrency,
+        per_host=per_host,
+        ordered=False,
+        limiter=limiter,
+    )
+    try:
+        for c, detail, err in jobs:
+            stats.checked += 1
+            now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            log = {"at": now, "etag": c.etag, "last_modified": c.last_modified}
+            if err is not None:
+                if not _is_gone(err):
+                    stats.failed += 1
+                    say(f"[warn] revalidate failed ({type_name}): {c.url} :: {err}")
+                    continue  # not logged: retried on the next run
+                stats.gone += 1
+            elif detail is None:
+                stats.not_modified += 1
+            else:
+                log.update(etag=detail.etag, last_modified=detail.last_modified)
+                if detail.content_hash == c.content_hash:
+                    stats.unchanged += 1
+                else:
+                    changed.append(detail)
+            checked[c.url] = log
+    finally:
+        jobs.close()
+        if changed:
+            stats.changed = backend.replace_details(type_name, changed)
+        save_checked(type_name, checked)
+    return stats
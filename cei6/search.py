@@ -0,0 +1,287 @@
+# cei6/search.py
+# Full-text search over detail paragraphs (SQLite FTS5), kept in its own
+# database next to the datasets so it works with either storage backend.
+#
+# Each document (title + paragraphs) is one FTS row in `documents`, which is
+# what queries match and bm25 ranks, so words may sit in different paragraphs.
+# Each paragraph (and the title) is also a row in `paragraphs`, used only to
+# pick the snippets shown per hit. The index is fed incrementally by the
+# storage backends as details are written; rebuild() back-fills it from
+# existing records.
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import storage
+
+DEFAULT_SEARCH_DB = os.path.join(storage.ROOT_DIR, "outputs", "search.sqlite")
+BATCH_SIZE = 200
+TITLE_ROW = -1  # paragraph number used for the title row
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id             INTEGER PRIMARY KEY,
+    url            TEXT NOT NULL UNIQUE,
+    content_type   TEXT,
+    title          TEXT,
+    date_published TEXT,
+    authors        TEXT
+);
+CREATE TABLE IF NOT EXISTS doc_authors (
+    doc_id INTEGER NOT NULL,
+    author TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (doc_id, author)
+);
+CREATE INDEX IF NOT EXISTS ix_docs_type_date ON docs(content_type, date_published);
+CREATE INDEX IF NOT EXISTS ix_doc_authors_author ON doc_authors(author);
+CREATE VIRTUAL TABLE IF NOT EXISTS paragraphs USING fts5(
+    text,
+    doc_id UNINDEXED,
+    n UNINDEXED,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5(
+    text,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+# indexes built before `documents` existed: one row per doc from its paragraphs
+_BACKFILL_DOCUMENTS = """
+INSERT INTO documents (rowid, text)
+SELECT doc_id, group_concat(text, char(10))
+FROM (SELECT doc_id, text FROM paragraphs ORDER BY doc_id, n)
+GROUP BY doc_id
+"""
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def to_match_query(text: str, any_word: bool = False) -> str:
+    """
+    Plain words -> an FTS5 query matching all of them, or any of them with
+    any_word=True (no FTS syntax errors).
+    """
+    return (" OR " if any_word else " ").join(f'"{t}"' for t in _TOKEN.findall(text))
+
+
+def _like_escape(text: str) -> str:
+    # the author filter is a substring match: % and _ in the input are literal
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@dataclass
+class SearchHit:
+    url: str
+    title: str
+    content_type: str
+    date_published: Optional[str]
+    authors: List[str]
+    score: float
+    snippets: List[Tuple[int, str]] = field(default_factory=list)  # (paragraph number, snippet)
+
+
+class SearchIndex:
+    def __init__(self, path: str = DEFAULT_SEARCH_DB):
+        self.path = path
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            upgrade = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'paragraphs'"
+                " AND NOT EXISTS (SELECT 1 FROM sqlite_master WHERE name = 'documents')"
+            ).fetchone()
+            self._conn.executescript(SCHEMA)
+            if upgrade:
+                self._conn.execute(_BACKFILL_DOCUMENTS)
+
+    # ---- writes ----
+    def add_details(self, type_name: str, details: Iterable[Any], replace: bool = False) -> int:
+        """
+        Index detail records (objects or dicts). Like the JSONL writers, the
+        first copy of a URL wins unless replace=True. Returns documents added.
+        """
+        added = 0
+        batch: List[dict] = []
+        for obj in details or []:
+            rec = storage._to_record(obj)
+            if not rec.get("url"):
+                continue
+            rec.setdefault("content_type", type_name)
+            batch.append(rec)
+            if len(batch) >= BATCH_SIZE:
+                added += self._flush(batch, replace)
+                batch = []
+        if batch:
+            added += self._flush(batch, replace)
+        return added
+
+    def _flush(self, recs: List[dict], replace: bool) -> int:
+        added = 0
+        with self._lock, self._conn:
+            for rec in recs:
+                url = rec["url"]
+                row = self._conn.execute("SELECT id FROM docs WHERE url = ?", (url,)).fetchone()
+                if row is not None:
+                    if not replace:
+                        continue
+                    self._delete_doc(row[0])
+                authors = [a for a in (rec.get("authors") or []) if isinstance(a, str) and a]
+                cur = self._conn.execute(
+                    "INSERT INTO docs (url, content_type, title, date_published, authors) VALUES (?, ?, ?, ?, ?)",
+                    (url, rec.get("content_type"), rec.get("title"), rec.get("date_published"), " | ".join(authors)),
+                )
+                doc_id = cur.lastrowid
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO doc_authors (doc_id, author) VALUES (?, ?)",
+                    [(doc_id, a) for a in authors],
+                )
+                rows = [(p, doc_id, n) for n, p in enumerate(rec.get("paragraphs") or []) if p]
+                if rec.get("title"):
+                    rows.insert(0, (rec["title"], doc_id, TITLE_ROW))
+                self._conn.executemany("INSERT INTO paragraphs (text, doc_id, n) VALUES (?, ?, ?)", rows)
+                self._conn.execute(
+                    "INSERT INTO documents (rowid, text) VALUES (?, ?)",
+                    (doc_id, "\n".join(text for text, _, _ in rows)),
+                )
+                added += 1
+        return added
+
+    def _delete_doc(self, doc_id: int) -> None:
+        self._conn.execute("DELETE FROM paragraphs WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM documents WHERE rowid = ?", (doc_id,))
+        self._conn.execute("DELETE FROM doc_authors WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+    def tap(self, type_name: str, details: Iterable[Any], replace: bool = False) -> Iterator[Any]:
+        """Pass details through unchanged, indexing them in batches on the way."""
+        batch: List[Any] = []
+        for obj in details or []:
+            batch.append(obj)
+            yield obj
+            if len(batch) >= BATCH_SIZE:
+                self.add_details(type_name, batch, replace=replace)
+                batch = []
+        if batch:
+            self.add_details(type_name, batch, replace=replace)
+
+    def rebuild(self, type_name: str, records: Iterable[Any]) -> int:
+        """Drop this type's documents and index `records` from scratch."""
+        with self._lock, self._conn:
+            ids = [r[0] for r in self._conn.execute("SELECT id FROM docs WHERE content_type = ?", (type_name,))]
+            for doc_id in ids:
+                self._delete_doc(doc_id)
+        return self.add_details(type_name, records)
+
+    # ---- reads ----
+    def search(
+        self,
+        query: str,
+        content_type: Optional[str] = None,
+        author: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 20,
+        raw: bool = False,
+        snippets_per_hit: int = 3,
+        snippet_tokens: int = 16,
+        mark: Tuple[str, str] = ("[", "]"),
+    ) -> List[SearchHit]:
+        """
+        Ranked hits (bm25 over the whole document), each with up to
+        snippets_per_hit of its best-matching paragraphs. raw=True passes FTS5
+        query syntax through; otherwise all words must occur somewhere in the
+        document. Dates compare as ISO strings (since inclusive, until
+        exclusive), as in SqliteBackend.query.
+        """
+        match = query if raw else to_match_query(query)
+        if not match:
+            return []
+        # one FTS row per document (rank is bm25), so LIMIT counts documents
+        sql = [
+            "SELECT d.id, d.url, d.title, d.content_type, d.date_published, d.authors, m.score",
+            "FROM (SELECT rowid AS doc_id, rank AS score FROM documents WHERE documents MATCH ?) m",
+            "JOIN docs d ON d.id = m.doc_id",
+            "WHERE 1",
+        ]
+        params: List[Any] = [match]
+        if content_type:
+            sql.append("AND d.content_type = ?")
+            params.append(content_type)
+        if author:
+            sql.append(
+                "AND EXISTS (SELECT 1 FROM doc_authors a WHERE a.doc_id = d.id AND a.author LIKE ? ESCAPE '\\')"
+            )
+            params.append(f"%{_like_escape(author)}%")
+        if since:
+            sql.append("AND d.date_published >= ?")
+            params.append(since)
+        if until:
+            sql.append("AND d.date_published < ?")
+            params.append(until)
+        sql.append("ORDER BY m.score LIMIT ?")
+        params.append(max(1, limit))
+        with self._lock:
+            rows = self._conn.execute(" ".join(sql), params).fetchall()
+            hits: Dict[int, SearchHit] = {}
+            for doc_id, url, title, ctype, date, authors, score in rows:
+                hits[doc_id] = SearchHit(
+                    url=url,
+                    title=title or "",
+                    content_type=ctype or "",
+                    date_published=date,
+                    authors=[a for a in (authors or "").split(" | ") if a],
+                    score=-score,  # bm25() is lower-is-better
+                )
+            if hits and snippets_per_hit > 0:
+                # the words may be spread over paragraphs: show those holding any of them
+                snip_match = query if raw else to_match_query(query, any_word=True)
+                self._add_snippets(hits, snip_match, snippets_per_hit, snippet_tokens, mark)
+        return list(hits.values())
+
+    def _add_snippets(
+        self,
+        hits: Dict[int, SearchHit],
+        match: str,
+        per_hit: int,
+        tokens: int,
+        mark: Tuple[str, str],
+    ) -> None:
+        """Best-matching paragraphs (not the title) of just these documents."""
+        ids = list(hits)
+        rows = self._conn.execute(
+            "SELECT doc_id, n, snippet(paragraphs, 0, ?, ?, '…', ?) FROM paragraphs"
+            f" WHERE paragraphs MATCH ? AND doc_id IN ({', '.join('?' * len(ids))}) AND n != ?"
+            " ORDER BY rank",
+            [mark[0], mark[1], max(1, min(64, tokens)), match, *ids, TITLE_ROW],
+        )
+        for doc_id, n, snip in rows:
+            snippets = hits[doc_id].snippets
+            if len(snippets) < per_hit:
+                snippets.append((n, snip))
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = [
+    "DEFAULT_SEARCH_DB",
+    "SearchHit",
+    "SearchIndex",
+    "to_match_query",
+]
@@ -0,0 +1,207 @@
+# cei6/segments.py
+# Compressed segment archive for the JSONL datasets.
+#
+#   {name}.seg      independent compressed frames (gzip members, or zstd frames),
+#                   each holding up to `frame_records` JSONL lines
+#   {name}.seg.idx  JSON index: codec, frame offsets/lengths, url -> (frame, line)
+#
+# A lookup seeks to one frame and decompresses only that; iteration streams the
+# frames in order. The .seg file is still a valid .gz (concatenated members) for
+# the gzip codec, so `zcat` works on it.
+from __future__ import annotations
+
+import gzip
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import jsonio
+
+CODECS = ("gzip", "zstd")
+DEFAULT_FRAME_RECORDS = 256
+INDEX_SUFFIX = ".idx"
+
+
+def _codec(name: str) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    if name == "gzip":
+        return (lambda b: gzip.compress(b, compresslevel=6, mtime=0)), gzip.decompress
+    if name == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise RuntimeError("zstd segments need the 'zstandard' package (pip install zstandard)") from e
+        cctx, dctx = zstandard.ZstdCompressor(level=10), zstandard.ZstdDecompressor()
+        # frames are written with their content size, so decompress() can size the buffer
+        return cctx.compress, dctx.decompress
+    raise ValueError(f"unknown segment codec: {name!r} (expected one of {', '.join(CODECS)})")
+
+
+class SegmentWriter:
+    """
+    Append records (dicts) into a new segment file. Records are deduped by URL
+    (first wins, like the JSONL writers). The file and its index are written to
+    temp paths and renamed into place on close().
+    """
+
+    def __init__(self, path: str, codec: str = "gzip", frame_records: int = DEFAULT_FRAME_RECORDS):
+        self.path = path
+        self.codec = codec
+        self.frame_records = max(1, int(frame_records))
+        self._compress, _ = _codec(codec)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._tmp = path + ".tmp"
+        self._f = open(self._tmp, "wb")
+        self._frames: List[List[int]] = []  # [offset, length, records]
+        self._urls: Dict[str, List[int]] = {}
+        self._buf: List[str] = []
+        self._offset = 0
+        self.count = 0
+
+    def write(self, rec: Dict[str, Any]) -> bool:
+        url = rec.get("url")
+        if not url or url in self._urls:
+            return False
+        self._urls[url] = [len(self._frames), len(self._buf)]
+        self._buf.append(jsonio.dumps_line(rec))
+        self.count += 1
+        if len(self._buf) >= self.frame_records:
+            self._flush()
+        return True
+
+    def _flush(self) -> None:
+        if not self._buf:
+            return
+        data = self._compress("".join(self._buf).encode("utf-8"))
+        self._f.write(data)
+        self._frames.append([self._offset, len(data), len(self._buf)])
+        self._offset += len(data)
+        self._buf = []
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self._flush()
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._f.close()
+        index = {
+            "version": 1,
+            "codec": self.codec,
+            "frames": self._frames,
+            "urls": self._urls,
+        }
+        idx_tmp = self.path + INDEX_SUFFIX + ".tmp"
+        with open(idx_tmp, "w", encoding="utf-8") as f:
+            f.write(jsonio.dumps(index))
+        # data first: a new index never points into an old data file
+        os.replace(self._tmp, self.path)
+        os.replace(idx_tmp, self.path + INDEX_SUFFIX)
+
+    def abort(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+    def __enter__(self) -> "SegmentWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class SegmentReader:
+    """
+    Random access by URL and streaming iteration over a segment file.
+    Keeps the last few decompressed frames, so lookups of neighbouring
+    records (same listing page, same day) don't re-inflate.
+    """
+
+    def __init__(self, path: str, cache_frames: int = 4):
+        self.path = path
+        with open(path + INDEX_SUFFIX, "r", encoding="utf-8") as f:
+            index = jsonio.loads(f.read())
+        self.codec: str = index["codec"]
+        self._frames: List[List[int]] = index["frames"]
+        self._urls: Dict[str, List[int]] = index["urls"]
+        _, self._decompress = _codec(self.codec)
+        self._f = open(path, "rb")
+        self._cache: "OrderedDict[int, List[bytes]]" = OrderedDict()
+        self._cache_frames = max(1, cache_frames)
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._urls
+
+    def urls(self) -> Iterable[str]:
+        return self._urls.keys()
+
+    def _frame_lines(self, n: int) -> List[bytes]:
+        lines = self._cache.get(n)
+        if lines is not None:
+            self._cache.move_to_end(n)
+            return lines
+        offset, length, _ = self._frames[n]
+        self._f.seek(offset)
+        lines = self._decompress(self._f.read(length)).splitlines()
+        self._cache[n] = lines
+        if len(self._cache) > self._cache_frames:
+            self._cache.popitem(last=False)
+        return lines
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        loc = self._urls.get(url)
+        if loc is None:
+            return None
+        return jsonio.loads(self._frame_lines(loc[0])[loc[1]])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # stream frame by frame without touching the lookup cache
+        for offset, length, _ in self._frames:
+            self._f.seek(offset)
+            for line in self._decompress(self._f.read(length)).splitlines():
+                if line:
+                    yield jsonio.loads(line)
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "SegmentReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def pack_jsonl(
+    src: str,
+    dest: str,
+    codec: str = "gzip",
+    frame_records: int = DEFAULT_FRAME_RECORDS,
+) -> int:
+    """Convert a JSONL file into a segment file (streaming). Returns records packed."""
+    with SegmentWriter(dest, codec=codec, frame_records=frame_records) as w:
+        for rec in jsonio.iter_jsonl(src):
+            w.write(rec)
+    return w.count
+
+
+def iter_segment(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream every record of a segment file."""
+    with SegmentReader(path) as r:
+        yield from r
+
+
+__all__ = [
+    "CODECS",
+    "DEFAULT_FRAME_RECORDS",
+    "SegmentReader",
+    "SegmentWriter",
+    "iter_segment",
+    "pack_jsonl",
+]
@@ -0,0 +1,243 @@
+# cei6/sqlite_store.py
+# SQLite storage backend: listings and details keyed by URL, WAL mode,
+# batched transactional upserts, indexes for author/date/issue/type queries.
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from . import jsonio, metrics, storage
+from .backends import StorageBackend
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    url            TEXT PRIMARY KEY,
+    content_type   TEXT NOT NULL,
+    title          TEXT,
+    date_published TEXT,
+    issue          TEXT,
+    record         TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS details (
+    url            TEXT PRIMARY KEY,
+    content_type   TEXT NOT NULL,
+    title          TEXT,
+    date_published TEXT,
+    issue          TEXT,
+    outlet         TEXT,
+    record         TEXT NOT NULL
+);
+-- one row per (record, author) so author lookups hit an index
+CREATE TABLE IF NOT EXISTS authors (
+    kind   TEXT NOT NULL,          -- 'index' | 'details'
+    url    TEXT NOT NULL,
+    author TEXT NOT NULL,
+    PRIMARY KEY (kind, url, author)
+);
+CREATE INDEX IF NOT EXISTS ix_listings_type_date ON listings(content_type, date_published);
+CREATE INDEX IF NOT EXISTS ix_listings_date ON listings(date_published);
+CREATE INDEX IF NOT EXISTS ix_listings_issue ON listings(issue);
+CREATE INDEX IF NOT EXISTS ix_details_type_date ON details(content_type, date_published);
+CREATE INDEX IF NOT EXISTS ix_details_date ON details(date_published);
+CREATE INDEX IF NOT EXISTS ix_details_issue ON details(issue);
+CREATE INDEX IF NOT EXISTS ix_authors_author ON authors(author, kind);
+"""
+
+BATCH_SIZE = 500
+
+_TABLES = {"index": "listings", "details": "details"}
+
+
+class SqliteBackend(StorageBackend):
+    name = "sqlite"
+
+    def __init__(self, path: str, batch_size: int = BATCH_SIZE):
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    # ---- writes ----
+    def write_listings(self, type_name: str, items: Iterable[Any]) -> int:
+        return self._write("index", type_name, items, upsert=False)
+
+    def write_details(self, type_name: str, details: Iterable[Any]) -> int:
+        return self._write("details", type_name, self._tap(type_name, details), upsert=False)
+
+    def upsert_details(self, type_name: str, details: Iterable[Any]) -> int:
+        """Insert or replace by URL (unlike write_details, which keeps the first copy)."""
+        return self._write("details", type_name, self._tap(type_name, details, replace=True), upsert=True)
+
+    replace_details = upsert_details
+
+    def _write(self, kind: str, type_name: str, objs: Iterable[Any], upsert: bool) -> int:
+        written = 0
+        batch: List[dict] = []
+        for obj in objs or []:
+            rec = storage._to_record(obj)
+            if not rec.get("url"):
+                continue
+            rec.setdefault("content_type", type_name)
+            batch.append(rec)
+            if len(batch) >= self.batch_size:
+                written += self._flush(kind, batch, upsert)
+                batch = []
+        if batch:
+            written += self._flush(kind, batch, upsert)
+        return written
+
+    def _flush(self, kind: str, recs: List[dict], upsert: bool) -> int:
+        with metrics.timer("storage_write_seconds", backend="sqlite", kind=kind):
+            n = self._flush_batch(kind, recs, upsert)
+        metrics.inc("storage_records_total", n, backend="sqlite", kind=kind)
+        return n
+
+    def _flush_batch(self, kind: str, recs: List[dict], upsert: bool) -> int:
+        table = _TABLES[kind]
+        if kind == "index":
+            cols = ("url", "content_type", "title", "date_published", "issue", "record")
+        else:
+            cols = ("url", "content_type", "title", "date_published", "issue", "outlet", "record")
+        rows = []
+        for rec in recs:
+            row = {c: rec.get(c) for c in cols if c != "record"}
+            row["record"] = jsonio.dumps(rec)
+            rows.append(tuple(row[c] for c in cols))
+        placeholders = ", ".join("?" for _ in cols)
+        if upsert:
+            updates = ", ".join(f"{c}=excluded.{c}" for c in cols if c != "url")
+            sql = (
+                f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(url) DO UPDATE SET {updates}"
+            )
+        else:
+            sql = f"INSERT OR IGNORE INTO {table} ({', '.join(cols)}) VALUES ({placeholders})"
+        with self._lock, self._conn:  # one transaction per batch
+            if upsert:
+                fresh = recs
+            else:
+                # author rows only for URLs this batch actually inserts
+                marks = ", ".join("?" for _ in recs)
+                existing = {
+                    r[0]
+                    for r in self._conn.execute(
+                        f"SELECT url FROM {table} WHERE url IN ({marks})",
+                        [rec["url"] for rec in recs],
+                    )
+                }
+                fresh = [rec for rec in recs if rec["url"] not in existing]
+            author_rows = [
+                (kind, rec["url"], a) for rec in fresh for a in (rec.get("authors") or []) if a
+            ]
+            before = self._conn.total_changes
+            self._conn.executemany(sql, rows)
+            changed = self._conn.total_changes - before
+            if upsert:
+                self._conn.executemany(
+                    "DELETE FROM authors WHERE kind = ? AND url = ?",
+                    [(kind, rec["url"]) for rec in recs],
+                )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO authors (kind, url, author) VALUES (?, ?, ?)",
+                author_rows,
+            )
+        return changed
+
+    # ---- reads ----
+    def known_urls(self, type_name: str, kind: str = "index") -> set[str]:
+        table = _TABLES[kind]
+        with self._lock:
+            cur = self._conn.execute(
+                f"SELECT url FROM {table} WHERE content_type = ?", (type_name,)
+            )
+            return {r[0] for r in cur}
+
+    def query(
+        self,
+        kind: str = "details",
+        content_type: Optional[str] = None,
+        author: Optional[str] = None,
+        issue: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Filtered lookup; dates compare as ISO strings (since inclusive,
+        until exclusive). Returns the stored records, newest first.
+        """
+        table = _TABLES[kind]
+        sql = [f"SELECT t.record FROM {table} t"]
+        where: List[str] = []
+        params: List[Any] = []
+        if author:
+            sql.append("JOIN authors a ON a.kind = ? AND a.url = t.url")
+            params.append(kind)
+            where.append("a.author = ?")
+            params.append(author)
+        if content_type:
+            where.append("t.content_type = ?")
+            params.append(content_type)
+        if issue:
+            where.append("t.issue = ?")
+            params.append(issue)
+        if since:
+            where.append("t.date_published >= ?")
+            params.append(since)
+        if until:
+            where.append("t.date_published < ?")
+            params.append(until)
+        if where:
+            sql.append("WHERE " + " AND ".join(where))
+        sql.append("ORDER BY t.date_published DESC")
+        if limit:
+            sql.append("LIMIT ?")
+            params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(" ".join(sql), params).fetchall()
+        return [jsonio.loads(r[0]) for r in rows]
+
+    def iter_records(self, kind: str, type_name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a type's records, batch_size rows at a time. Reads go through
+        their own connection (a WAL snapshot), so writers aren't held up.
+        """
+        table = _TABLES[kind]
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        try:
+            cur = conn.execute(
+                f"SELECT record FROM {table} WHERE content_type = ? ORDER BY date_published",
+                (type_name,),
+            )
+            while True:
+                rows = cur.fetchmany(self.batch_size)
+                if not rows:
+                    return
+                for r in rows:
+                    yield jsonio.loads(r[0])
+        finally:
+            conn.close()
+
+    def export_jsonl(self, kind: str, type_name: str) -> int:
+        """Append this type's rows to the JSONL dataset via the JSONL writers."""
+        recs = self.iter_records(kind, type_name)
+        if kind == "index":
+            return storage.write_index_jsonl(type_name, recs)
+        return storage.write_details_jsonl(type_name, recs)
+
+    def describe(self, kind: str, type_name: str) -> str:
+        return f"{self.path} [{_TABLES[kind]}:{type_name}]"
+
+    def close(self) -> None:
+        super().close()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,107 @@
+# cei6/state.py
+# Per-type crawl checkpoint: outputs/state/{type}.json
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from .models import ListingItem
+from .storage import ROOT_DIR
+
+OUT_STATE_DIR = os.path.join(ROOT_DIR, "outputs", "state")
+
+
+@dataclass
+class CrawlState:
+    content_type: str
+    # newest listing seen, for reporting (incremental runs stop on the stored URLs)
+    newest_url: Optional[str] = None
+    newest_date: Optional[str] = None
+    last_page: int = 0                  # deepest listing page reached by a backfill
+    complete: bool = False              # backfill reached the end of the archive
+    pending_details: List[str] = field(default_factory=list)
+    updated_at: Optional[str] = None
+
+    def resume_page(self) -> int:
+        """First listing page a resumed backfill should fetch."""
+        if self.complete or self.last_page <= 0:
+            return 1
+        return self.last_page + 1
+
+    def note_items(self, items: Iterable[ListingItem]) -> None:
+        """Track the newest listing seen (by date_published)."""
+        for it in items:
+            dp = it.date_published
+            iso = dp.isoformat() if isinstance(dp, datetime) else dp
+            if not iso:
+                continue
+            if self.newest_date is None or iso > self.newest_date:
+                self.newest_date = iso
+                self.newest_url = it.url
+
+
+def _state_path(type_name: str) -> str:
+    os.makedirs(OUT_STATE_DIR, exist_ok=True)
+    return os.path.join(OUT_STATE_DIR, f"{type_name}.json")
+
+
+def load_state(type_name: str) -> CrawlState:
+    path = _state_path(type_name)
+    if not os.path.exists(path):
+        return CrawlState(content_type=type_name)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            obj = json.load(f)
+    except Exception as e:
+        print(f"[warn] unreadable crawl state {path}: {e} (starting fresh)")
+        return CrawlState(content_type=type_name)
+    known = {f.name for f in fields(CrawlState)}
+    obj = {k: v for k, v in obj.items() if k in known}
+    obj["content_type"] = type_name
+    return CrawlState(**obj)
+
+
+def save_state(state: CrawlState) -> None:
+    """Atomic write (temp file + rename) so a crash never leaves a torn checkpoint."""
+    state.updated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    path = _state_path(state.content_type)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        json.dump(asdict(state), f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# Revalidation log: outputs/state/{type}.checked.json, {url: last re-check (UTC ISO)}.
+# Kept apart from the crawl checkpoint, which is rewritten after every page.
+
+def _checked_path(type_name: str) -> str:
+    os.makedirs(OUT_STATE_DIR, exist_ok=True)
+    return os.path.join(OUT_STATE_DIR, f"{type_name}.checked.json")
+
+
+def load_checked(type_name: str) -> Dict[str, str]:
+    path = _checked_path(type_name)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            obj = json.load(f)
+    except Exception as e:
+        print(f"[warn] unreadable revalidation log {path}: {e} (starting fresh)")
+        return {}
+    return obj if isinstance(obj, dict) else {}
+
+
+def save_checked(type_name: str, checked: Dict[str, str]) -> None:
+    path = _checked_path(type_name)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        json.dump(checked, f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
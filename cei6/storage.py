@@ -1,11 +1,14 @@
 # cei6/storage.py
 from __future__ import annotations
 
-import json
 import os
-from dataclasses import asdict, is_dataclass
+import threading
+from dataclasses import fields, is_dataclass
 from datetime import datetime
-from typing import Iterable, Union, Any
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Any
+
+from . import jsonio, metrics
+from .models import DetailRecord, ListingItem
 
 # Paths
 PKG_DIR = os.path.dirname(__file__)
@@ -26,29 +29,138 @@ def _jsonl_path(kind: str, type_name: str) -> str:
 
 
 def _iter_existing_urls(path: str) -> set[str]:
-    seen: set[str] = set()
-    if not os.path.exists(path):
-        return seen
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-                url = obj.get("url")
-                if url:
-                    seen.add(url)
-            except Exception:
-                # ignore malformed lines
-                continue
+    # URL-only scan: records are not fully decoded; malformed lines are ignored
+    return set(jsonio.scan_urls(path))
+
+
+# Sidecar URL index: outputs/{index,details}/{type}.urls, one URL per line.
+# Loaded once per process, appended alongside the JSONL, rebuilt from the JSONL
+# whenever the JSONL is newer (i.e. it was edited by something else).
+_URL_SETS: Dict[str, set[str]] = {}
+_URL_LOCK = threading.RLock()
+
+
+def _sidecar_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".urls"
+
+
+def _rebuild_sidecar(path: str) -> set[str]:
+    seen = _iter_existing_urls(path)
+    side = _sidecar_path(path)
+    tmp = side + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        for url in seen:
+            f.write(url + "\n")
+    os.replace(tmp, side)
     return seen
 
 
+def _url_set(path: str) -> set[str]:
+    with _URL_LOCK:
+        seen = _URL_SETS.get(path)
+        if seen is not None:
+            return seen
+        side = _sidecar_path(path)
+        if not os.path.exists(path):
+            seen = set()
+        elif os.path.exists(side) and os.path.getmtime(side) >= os.path.getmtime(path):
+            with open(side, "r", encoding="utf-8") as f:
+                seen = {line.rstrip("\n") for line in f if line.strip()}
+        else:
+            seen = _rebuild_sidecar(path)
+        _URL_SETS[path] = seen
+        return seen
+
+
+def _append_records(path: str, recs: Iterable[dict]) -> int:
+    """Append new-by-URL records to the JSONL and its sidecar. Caller holds _URL_LOCK."""
+    kind = os.path.basename(os.path.dirname(path))
+    with metrics.timer("storage_write_seconds", backend="jsonl", kind=kind):
+        n, size = _append_lines(path, recs)
+    if n:
+        metrics.inc("storage_records_total", n, backend="jsonl", kind=kind)
+        metrics.inc("storage_bytes_total", size, backend="jsonl", kind=kind)
+    return n
+
+
+def _append_lines(path: str, recs: Iterable[dict]) -> Tuple[int, int]:
+    seen = _url_set(path)
+    lines = []
+    urls = []
+    for rec in recs:
+        url = rec.get("url")
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        urls.append(url)
+        lines.append(jsonio.dumps_line(rec))
+    if not lines:
+        return 0, 0
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        start = f.tell()
+        f.writelines(lines)
+        size = f.tell() - start
+    # sidecar last, so its mtime stays >= the JSONL's
+    with open(_sidecar_path(path), "a", encoding="utf-8", newline="") as f:
+        f.writelines(u + "\n" for u in urls)
+    return len(lines), size
+
+
+def forget_url_index(path: str | None = None) -> None:
+    """Drop the in-process URL set(s), e.g. after rewriting a JSONL file."""
+    with _URL_LOCK:
+        if path is None:
+            _URL_SETS.clear()
+        else:
+            _URL_SETS.pop(path, None)
+
+
+def rebuild_url_index(path: str) -> set[str]:
+    """Rebuild a JSONL file's URL sidecar after the file was rewritten."""
+    with _URL_LOCK:
+        forget_url_index(path)
+        return _rebuild_sidecar(path)
+
+
+def load_index_urls(type_name: str) -> set[str]:
+    """URLs already in outputs/index/{type}.jsonl (used for crawl early-stop)."""
+    return set(_url_set(_jsonl_path("index", type_name)))
+
+
+def load_detail_urls(type_name: str) -> set[str]:
+    """URLs already in outputs/details/{type}.jsonl."""
+    return set(_url_set(_jsonl_path("details", type_name)))
+
+
+def iter_index_items(type_name: str) -> Iterator[ListingItem]:
+    """Listings in outputs/index/{type}.jsonl, decoded into ListingItem."""
+    return jsonio.iter_models(_jsonl_path("index", type_name), ListingItem)
+
+
+def iter_detail_records(type_name: str) -> Iterator[DetailRecord]:
+    """Details in outputs/details/{type}.jsonl, decoded into DetailRecord."""
+    return jsonio.iter_models(_jsonl_path("details", type_name), DetailRecord)
+
+
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def _field_names(cls: type) -> Tuple[str, ...]:
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls))
+    return names
+
+
 def _to_record(obj: Any) -> dict:
+    # Fast path: model classes serialize themselves without asdict's deep copy
+    cls = type(obj)
+    if cls is ListingItem or cls is DetailRecord:
+        return obj.to_dict()
     # Accept dataclass, dict, or any object with the expected attributes
-    if is_dataclass(obj):
-        d = asdict(obj)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        # shallow: field values are only read from here on, never mutated
+        d = {name: getattr(obj, name) for name in _field_names(cls)}
     elif isinstance(obj, dict):
         d = dict(obj)
     else:
@@ -65,6 +177,10 @@ def _to_record(obj: Any) -> dict:
             "documents",
             "content",
             "paragraphs",
+            "content_hash",
+            "fetched_at",
+            "etag",
+            "last_modified",
         ):
             if hasattr(obj, key):
                 d[key] = getattr(obj, key)
@@ -78,6 +194,8 @@ def _to_record(obj: Any) -> dict:
     if "authors" in d:
         if isinstance(d["authors"], str):
             d["authors"] = [a.strip() for a in d["authors"].split(",") if a.strip()]
+        elif isinstance(d["authors"], tuple):
+            d["authors"] = list(d["authors"])
         elif not isinstance(d["authors"], list) and d["authors"] is not None:
             d["authors"] = [str(d["authors"])]
 
@@ -100,29 +218,8 @@ def write_index_jsonl(arg1: Any, arg2: Any) -> int:
         )
 
     path = _jsonl_path("index", type_name)
-    seen = _iter_existing_urls(path)
-
-    new_items = []
-    for it in items or []:
-        url = None
-        try:
-            url = it["url"] if isinstance(it, dict) else getattr(it, "url", None)
-        except Exception:
-            url = None
-        if not url or url in seen:
-            continue
-        new_items.append(it)
-
-    if not new_items:
-        return 0
-
-    written = 0
-    with open(path, "a", encoding="utf-8", newline="") as f:
-        for it in new_items:
-            rec = _to_record(it)
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-            written += 1
-    return written
+    with _URL_LOCK:
+        return _append_records(path, (_to_record(it) for it in items or []))
 
 
 def write_detail_jsonl(arg1: Any, arg2: Any) -> int:
@@ -141,13 +238,75 @@ def write_detail_jsonl(arg1: Any, arg2: Any) -> int:
         )
 
     path = _jsonl_path("details", type_name)
-    seen = _iter_existing_urls(path)
+    with _URL_LOCK:
+        return _append_records(path, [_to_record(detail)])
 
-    rec = _to_record(detail)
-    url = rec.get("url")
-    if not url or url in seen:
-        return 0
 
-    with open(path, "a", encoding="utf-8", newline="") as f:
-        f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-    return 1
+def write_details_jsonl(type_name: str, details: Iterable[Any], batch_size: int = 100) -> int:
+    """
+    Batch form of write_detail_jsonl: appends in chunks of batch_size and
+    returns the number of new lines written. Accepts any iterable/generator.
+    """
+    path = _jsonl_path("details", type_name)
+    written = 0
+    batch: list = []
+    for d in details:
+        batch.append(_to_record(d))
+        if len(batch) >= batch_size:
+            with _URL_LOCK:
+                written += _append_records(path, batch)
+            batch = []
+    if batch:
+        with _URL_LOCK:
+            written += _append_records(path, batch)
+    return written
+
+
+def _full_parse_url(line: bytes) -> Optional[str]:
+    # url_of's fast path can miss on unusual lines; never leave a stale duplicate behind
+    try:
+        obj = jsonio.loads(line)
+    except Exception:
+        return None
+    url = obj.get("url") if isinstance(obj, dict) else None
+    return url if isinstance(url, str) and url else None
+
+
+def replace_details_jsonl(type_name: str, details: Iterable[Any]) -> int:
+    """
+    Store these records in place of the lines with the same URLs in
+    outputs/details/{type}.jsonl (streamed to a temp file, then renamed over
+    it; other lines are copied untouched). URLs not stored yet are appended.
+    Returns the number of records replaced or added.
+    """
+    path = _jsonl_path("details", type_name)
+    updates: Dict[str, dict] = {}
+    for d in details:
+        rec = _to_record(d)
+        if rec.get("url"):
+            updates[rec["url"]] = rec
+    if not updates:
+        return 0
+    with _URL_LOCK:
+        done: set[str] = set()
+        if os.path.exists(path):
+            tmp = path + ".tmp"
+            with metrics.timer("storage_write_seconds", backend="jsonl", kind="details"):
+                with open(path, "rb") as src, open(tmp, "wb") as dst:
+                    for line in src:
+                        stripped = line.strip()
+                        url = jsonio.url_of(stripped) if stripped else None
+                        if url is None and stripped:
+                            url = _full_parse_url(stripped)
+                        rec = updates.get(url) if url else None
+                        if rec is None:
+                            dst.write(line if line.endswith(b"\n") else line + b"\n")
+                        elif url not in done:  # later duplicates of a replaced URL are dropped
+                            done.add(url)
+                            dst.write(jsonio.dumps_line(rec).encode("utf-8"))
+                os.replace(tmp, path)
+            forget_url_index(path)  # the sidecar is now older than the JSONL: rebuilt on next use
+        added = _append_records(path, (rec for url, rec in updates.items() if url not in done))
+    if done:
+        metrics.inc("storage_records_total", len(done), backend="jsonl", kind="details")
+    return len(done) + added
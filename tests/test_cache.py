@@ -0,0 +1,52 @@
+import os
+
+from cei6 import cache as cache_mod
+from cei6.cache import ResponseCache
+
+
+def _body(i):
+    return (b"%03d" % i) * 33 + b"x"  # 100 bytes, distinct per i
+
+
+def test_eviction_is_lru_down_to_low_water_without_rescanning(tmp_path, monkeypatch):
+    c = ResponseCache(str(tmp_path), max_bytes=1000)
+    for i in range(10):
+        c.store(f"https://cei.org/{i}/", _body(i))
+    assert c.lookup("https://cei.org/0/") is not None  # 0 is now the most recent
+
+    def _no_listdir(path):
+        raise AssertionError("store() rescanned the cache dir")
+
+    monkeypatch.setattr(cache_mod.os, "listdir", _no_listdir)
+    c.store("https://cei.org/10/", _body(10))
+
+    assert c.stats()["bytes"] <= 1000 * cache_mod.LOW_WATER
+    assert c.lookup("https://cei.org/0/") is not None
+    assert c.lookup("https://cei.org/10/") is not None
+    assert c.lookup("https://cei.org/1/") is None
+    assert c.lookup("https://cei.org/2/") is None
+
+
+def test_recency_survives_reopening(tmp_path):
+    c = ResponseCache(str(tmp_path), max_bytes=1000)
+    for i in range(10):
+        c.store(f"https://cei.org/{i}/", _body(i))
+    meta = c._meta_path("https://cei.org/0/")
+    os.utime(meta, (os.path.getmtime(meta) + 60,) * 2)
+
+    c = ResponseCache(str(tmp_path), max_bytes=1000)
+    c.store("https://cei.org/10/", _body(10))
+
+    assert c.lookup("https://cei.org/0/") is not None
+    assert c.lookup("https://cei.org/1/") is None
+
+
+def test_vanished_blob_is_a_miss(tmp_path):
+    c = ResponseCache(str(tmp_path))
+    c.store("https://cei.org/a/", b"body")
+    entry = c.lookup("https://cei.org/a/")
+    os.remove(c._blob_path(entry.body_sha))
+
+    assert c.read_body(entry) is None
+    assert c.lookup("https://cei.org/a/") is None
+    assert c.stats() == {"entries": 0, "bytes": 0}
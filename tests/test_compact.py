@@ -0,0 +1,37 @@
+import json
+
+from cei6 import jsonio
+from cei6.compact import compact_jsonl
+
+
+def _line(url, date=None, fetched=None, title=""):
+    rec = {"url": f"https://cei.org/{url}/", "title": title}
+    if date:
+        rec["date_published"] = date
+    if fetched:
+        rec["fetched_at"] = fetched
+    return json.dumps(rec)
+
+
+def test_compact_keeps_newest_version_sorted_by_date(tmp_path):
+    path = tmp_path / "blogs_details.jsonl"
+    lines = [
+        _line("b", "2023-05-01", "2024-01-02T00:00:00Z", "b new"),
+        _line("undated", None, "2024-01-01T00:00:00Z"),
+        _line("a", "2021-02-03", "2024-01-01T00:00:00Z", "a old"),
+        "{not json",
+        _line("c", "2022-07-08", "2024-01-01T00:00:00Z"),
+        _line("a", "2021-02-03", "2024-03-01T00:00:00Z", "a new"),
+        _line("b", "2023-05-01", "2024-01-01T00:00:00Z", "b old"),
+        json.dumps({"title": "no url"}),
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    stats = compact_jsonl(str(path), chunk_bytes=64)  # forces several spilled runs
+
+    out = list(jsonio.iter_jsonl(str(path)))
+    assert [r["url"].split("/")[3] for r in out] == ["a", "c", "b", "undated"]
+    assert [r["title"] for r in out if r["title"]] == ["a new", "b new"]
+    assert (stats.read, stats.kept, stats.duplicates, stats.corrupt) == (8, 4, 2, 2)
+    # temp output and sort runs are cleaned up; the URL index is rebuilt alongside
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["blogs_details.jsonl", "blogs_details.urls"]
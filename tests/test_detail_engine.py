@@ -0,0 +1,25 @@
+import threading
+
+import pytest
+
+from cei6.details import run_detail_jobs
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+@pytest.mark.parametrize("ordered", [True, False])
+def test_max_results_stops_submitting(concurrency, ordered):
+    calls = []
+    lock = threading.Lock()
+
+    def fetch(url):
+        with lock:
+            calls.append(url)
+        if url.endswith(("/1/", "/3/")):
+            raise RuntimeError("boom")
+        return url
+
+    urls = [f"https://cei.org/blog/{i}/" for i in range(100)]
+    results = list(run_detail_jobs(urls, fetch, concurrency=concurrency, ordered=ordered, max_results=5))
+
+    assert sum(err is None for _, _, err in results) == 5
+    assert len(calls) == 7  # 5 successes + the 2 failures they replaced
@@ -0,0 +1,32 @@
+from cei6 import parsing
+from cei6.details import parse_blog_html
+
+URL = "https://cei.org/blog/header-outside-main/"
+
+# theme variant: the post header sits above <main>, not inside it
+HEADER_OUTSIDE_MAIN = """<!doctype html>
+<html><body>
+<nav><a href="/">CEI</a></nav>
+<div class="post-header">
+  <h2 class="entry-title">Header Outside Main</h2>
+  <div class="entry-meta">
+    <a href="https://cei.org/experts/jane-doe/">Jane Doe</a>
+    <time datetime="2024-12-31T21:00:00-05:00">December 31, 2024</time>
+    <span class="badge">Energy</span>
+  </div>
+</div>
+<main><article><div class="entry-content"><p>First paragraph.</p><p>Second paragraph.</p></div></article></main>
+</body></html>
+"""
+
+
+def test_header_outside_main_falls_back_to_full_parse():
+    assert parsing.is_targeted()
+
+    detail = parse_blog_html(HEADER_OUTSIDE_MAIN, URL)
+
+    assert detail.title == "Header Outside Main"
+    assert detail.authors == ["Jane Doe"]
+    assert detail.date_published == "2025-01-01T02:00:00+00:00"
+    assert detail.issue == "Energy"
+    assert detail.paragraphs == ["First paragraph.", "Second paragraph."]
@@ -0,0 +1,19 @@
+from cei6.details import content_hash
+
+BLOG = {"url": "https://cei.org/blog/a/", "title": "A", "date_published": "2024-01-02", "paragraphs": ["p"]}
+
+
+def test_outlet_changes_the_hash():
+    oped = dict(BLOG, outlet="The Hill", outlet_url="https://thehill.com/x")
+
+    assert content_hash(oped) != content_hash(dict(oped, outlet="Fox News"))
+    assert content_hash(oped) != content_hash(dict(oped, outlet_url="https://thehill.com/y"))
+
+
+def test_absent_outlet_keeps_existing_hashes():
+    assert content_hash(dict(BLOG, outlet=None, outlet_url="")) == content_hash(BLOG)
+    # value pinned from before outlets were hashed
+    assert content_hash(BLOG) == HASH_BEFORE
+
+
+HASH_BEFORE = "8168ea46cf7d3154ff5f572cc30260b59aac284f4eb8c40553ed317180ae6f04"
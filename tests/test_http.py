@@ -0,0 +1,29 @@
+import hashlib
+
+import pytest
+
+from benchmarks.server import FixtureServer
+from cei6 import http
+
+URL = "https://cei.org/blog/cached/"
+BODY = b"<html><body><p>cached page</p></body></html>"
+ETAG = '"%s"' % hashlib.sha1(BODY).hexdigest()[:16]
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(http, "_cache", None)
+    monkeypatch.setattr(http, "_origins", {})
+    with FixtureServer({"/blog/cached/": BODY}) as srv:
+        http.configure(cache_dir=str(tmp_path / "cache"), origins={"https://cei.org": srv.origin})
+        yield srv
+    http.configure(origins={})
+
+
+def test_caller_conditional_304_is_not_cached(server):
+    resp = http.get(URL, headers={"If-None-Match": ETAG})
+    assert resp.status_code == 304
+
+    resp = http.get(URL)
+    assert resp.status_code == 200
+    assert resp.content == BODY
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from cei6.indexers.pagination import crawl_listing, page_url
+from cei6.models import DateWindow, ListingItem
+
+LISTING = "https://cei.org/blog/"
+
+
+def _item(n: int, date: str) -> ListingItem:
+    return ListingItem("blogs", f"post {n}", f"https://cei.org/blog/post-{n}/", datetime.fromisoformat(date))
+
+
+PAGES = {
+    # page 1 opens with a pinned post from years ago
+    page_url(LISTING, 1): [_item(0, "2019-05-01"), _item(1, "2025-03-10"), _item(2, "2025-03-01")],
+    page_url(LISTING, 2): [_item(3, "2025-02-10"), _item(4, "2024-12-20")],
+    page_url(LISTING, 3): [_item(5, "2024-12-01"), _item(6, "2024-11-01")],
+    page_url(LISTING, 4): [_item(7, "2024-10-01")],
+}
+
+
+def test_since_stop_ignores_a_pinned_old_post():
+    stops = []
+    pages = list(
+        crawl_listing(
+            LISTING,
+            lambda url: url,
+            PAGES.__getitem__,
+            on_stop=lambda reason, page: stops.append((reason, page)),
+            window=DateWindow(since="2025-01-01"),
+        )
+    )
+
+    urls = [it.url for _, items in pages for it in items]
+    assert urls == [f"https://cei.org/blog/post-{n}/" for n in (1, 2, 3)]
+    assert stops == [("since", 3)]
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from cei6 import parquet_export
+from cei6.parquet_export import UNKNOWN_YEAR, export_parquet, year_of
+
+
+def test_year_is_site_local():
+    # 9pm on Dec 31 in New York, stored as UTC
+    assert year_of("2025-01-01T02:00:00+00:00") == "2024"
+    assert year_of("2024-12-31") == "2024"
+    assert year_of("December 31, 2024") == "2024"
+    assert year_of("sometime in 2019") == "2019"
+    assert year_of(None) == UNKNOWN_YEAR
+
+
+def test_export_partitions_by_year(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    src = tmp_path / "details"
+    src.mkdir()
+    recs = [
+        {"url": "https://cei.org/blog/a/", "title": "A", "date_published": "2025-01-01T02:00:00+00:00"},
+        {"url": "https://cei.org/blog/b/", "title": "B", "date_published": "2024-06-01T12:00:00+00:00"},
+        {"url": "https://cei.org/blog/c/", "title": "C", "date_published": "2025-03-01T12:00:00+00:00",
+         "authors": ["X"], "paragraphs": ["p1", "p2"]},
+        {"url": "https://cei.org/blog/d/", "title": "D"},
+    ]
+    (src / "blogs.jsonl").write_text("".join(json.dumps(r) + "\n" for r in recs), encoding="utf-8")
+    monkeypatch.setattr(parquet_export, "OUT_DETAILS_DIR", str(src))
+    out = tmp_path / "parquet"
+
+    counts = export_parquet("details", "blogs", out_dir=str(out), batch_size=2)
+
+    assert counts == {"2024": 2, "2025": 1, UNKNOWN_YEAR: 1}
+    base = out / "details" / "content_type=blogs"
+    for year, n in counts.items():
+        table = pq.read_table(base / f"year={year}" / "part-0.parquet")
+        assert table.num_rows == n
+    row = pq.read_table(base / "year=2025" / "part-0.parquet").to_pylist()[0]
+    assert row["authors"] == ["X"] and row["paragraphs"] == ["p1", "p2"]
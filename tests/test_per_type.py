@@ -0,0 +1,55 @@
+import threading
+import time
+from collections import Counter
+
+from cei6.crawl import run_per_type
+from cei6.details import HostLimiter, run_detail_jobs
+
+
+class InFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.now = Counter()
+        self.peak = Counter()
+        self.total_peak = 0
+
+    def fetch(self, url):
+        host = url.split("/")[2]
+        with self.lock:
+            self.now[host] += 1
+            self.peak[host] = max(self.peak[host], self.now[host])
+            self.total_peak = max(self.total_peak, sum(self.now.values()))
+        time.sleep(0.01)
+        with self.lock:
+            self.now[host] -= 1
+        return url
+
+
+def test_types_share_per_host_and_total_caps():
+    seen = InFlight()
+    limiter = HostLimiter(2, total=3)
+
+    def _job(label):
+        urls = [f"https://cei.org/{label}/{i}/" for i in range(20)]
+        urls += [f"https://example.org/{label}/{i}/" for i in range(5)]
+        return list(run_detail_jobs(urls, seen.fetch, concurrency=4, ordered=False, limiter=limiter))
+
+    results = run_per_type({"blogs": lambda: _job("blogs"), "studies": lambda: _job("studies")})
+
+    assert all(err is None and len(out) == 25 for out, err in results.values())
+    assert seen.peak["cei.org"] <= 2
+    assert seen.total_peak <= 3
+
+
+
+def test_failing_type_does_not_affect_the_others():
+    def _boom():
+        raise RuntimeError("listing down")
+
+    results = run_per_type({"studies": lambda: "ok", "blogs": _boom, "news": lambda: "ok"}, workers=2)
+
+    assert list(results) == ["studies", "blogs", "news"]
+    assert results["studies"] == ("ok", None)
+    assert results["news"] == ("ok", None)
+    out, err = results["blogs"]
+    assert out is None and isinstance(err, RuntimeError)
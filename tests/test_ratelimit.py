@@ -0,0 +1,30 @@
+import threading
+import time
+
+from cei6.ratelimit import RateController
+
+URL = "https://cei.org/blog/"
+
+
+def test_disabled_pause_holds_the_host_not_the_worker():
+    rc = RateController(enabled=False)
+
+    started = time.monotonic()
+    rc.record(URL, 503, 0.01, retry_after=0.3)
+    assert time.monotonic() - started < 0.1
+
+    waited = []
+
+    def _other_worker():
+        t = time.monotonic()
+        rc.acquire(URL)
+        waited.append(time.monotonic() - t)
+
+    th = threading.Thread(target=_other_worker)
+    th.start()
+    th.join()
+    assert waited[0] >= 0.2
+
+    started = time.monotonic()
+    rc.acquire("https://example.org/")  # other hosts are not paused
+    assert time.monotonic() - started < 0.1
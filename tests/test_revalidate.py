@@ -0,0 +1,31 @@
+import hashlib
+
+import pytest
+
+from benchmarks.server import FixtureServer
+from cei6 import http
+from cei6.revalidate import Candidate, _recheck
+
+URL = "https://cei.org/blog/edited/"
+BODY = b"<html><body><h1>Edited</h1><div class='entry-content'><p>text</p></div></body></html>"
+ETAG = '"%s"' % hashlib.sha1(BODY).hexdigest()[:16]
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(http, "_cache", None)
+    monkeypatch.setattr(http, "_origins", {})
+    with FixtureServer({"/blog/edited/": BODY}) as srv:
+        http.configure(cache_dir=str(tmp_path / "cache"), origins={"https://cei.org": srv.origin})
+        yield srv
+    http.configure(origins={})
+
+
+def test_recheck_sends_record_validators_past_the_cache(server):
+    http.get(URL)  # response cache now holds the page and its ETag
+
+    assert _recheck(Candidate(URL, "blogs", "", etag=ETAG)) is None
+
+    detail = _recheck(Candidate(URL, "blogs", "", etag='"stale"'))
+    assert detail is not None
+    assert detail.etag == ETAG
@@ -0,0 +1,51 @@
+from cei6.search import SearchIndex
+
+
+def _doc(i, paragraphs, **extra):
+    rec = {"url": f"https://cei.org/blog/{i}/", "title": f"Post {i}", "paragraphs": paragraphs}
+    rec.update(extra)
+    return rec
+
+
+def test_limit_counts_documents_not_paragraphs(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.sqlite"))
+    index.add_details("blogs", [_doc(i, [f"carbon tax, part {j}" for j in range(10)]) for i in range(30)])
+
+    hits = index.search("carbon tax", limit=25, snippets_per_hit=1)
+
+    assert len(hits) == 25
+    assert all(len(h.snippets) == 1 for h in hits)
+    index.close()
+
+
+def test_words_may_sit_in_different_paragraphs(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.sqlite"))
+    index.add_details(
+        "blogs",
+        [
+            _doc(1, ["Rules on carbon emissions.", "A note on tariff policy."]),
+            _doc(2, ["Carbon emissions only."]),
+        ],
+    )
+
+    hits = index.search("carbon tariff")
+
+    assert [h.url for h in hits] == ["https://cei.org/blog/1/"]
+    assert sorted(n for n, _ in hits[0].snippets) == [0, 1]
+    index.close()
+
+
+def test_author_filter_treats_wildcards_literally(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.sqlite"))
+    index.add_details(
+        "blogs",
+        [
+            _doc(1, ["carbon"], authors=["Jane Doe"]),
+            _doc(2, ["carbon"], authors=["Jane_Doe 100%"]),
+        ],
+    )
+
+    assert [h.url for h in index.search("carbon", author="_")] == ["https://cei.org/blog/2/"]
+    assert [h.url for h in index.search("carbon", author="100%")] == ["https://cei.org/blog/2/"]
+    assert len(index.search("carbon", author="jane")) == 2
+    index.close()
@@ -0,0 +1,29 @@
+import gzip
+import json
+
+from cei6.segments import SegmentReader, iter_segment, pack_jsonl
+
+
+def _rec(n):
+    return {"url": f"https://cei.org/blog/post-{n}/", "title": f"Post {n}", "n": n}
+
+
+def test_pack_and_look_up_by_url(tmp_path):
+    src = tmp_path / "blogs.jsonl"
+    lines = [json.dumps(_rec(n)) for n in range(25)] + [json.dumps(dict(_rec(3), title="dupe"))]
+    src.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    seg = str(tmp_path / "blogs.seg")
+
+    assert pack_jsonl(str(src), seg, frame_records=4) == 25
+
+    with SegmentReader(seg, cache_frames=1) as r:
+        assert len(r) == 25
+        assert len(r._frames) == 7
+        # random access across frames, in reverse so every lookup seeks
+        for n in reversed(range(25)):
+            assert r.get(_rec(n)["url"]) == _rec(n)
+        assert r.get("https://cei.org/blog/missing/") is None
+        assert _rec(3)["url"] in r
+    assert [rec["n"] for rec in iter_segment(seg)] == list(range(25))
+    # gzip segments stay readable as one concatenated .gz
+    assert len(gzip.decompress(open(seg, "rb").read()).splitlines()) == 25
@@ -0,0 +1,21 @@
+from cei6.sqlite_store import SqliteBackend
+
+
+def _rec(i):
+    return {"url": f"https://cei.org/blog/{i}/", "title": f"Post {i}", "date_published": f"2024-01-{i % 28 + 1:02d}"}
+
+
+def test_iter_records_streams_in_batches_alongside_writes(tmp_path):
+    backend = SqliteBackend(str(tmp_path / "cei6.sqlite"), batch_size=50)
+    backend.write_details("blogs", [_rec(i) for i in range(120)])
+
+    it = backend.iter_records("details", "blogs")
+    first = next(it)
+    # a write while the read is open neither blocks nor shows up in the read's snapshot
+    backend.write_details("blogs", [_rec(1000)])
+    rest = list(it)
+
+    dates = [r["date_published"] for r in [first, *rest]]
+    assert dates == sorted(dates)
+    assert {r["url"] for r in [first, *rest]} == {_rec(i)["url"] for i in range(120)}
+    backend.close()
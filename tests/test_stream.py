@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from cei6 import state as state_mod
+from cei6.crawl import ListingCrawl, stream_type
+from cei6.details import DETAIL_PARSERS, BlogDetail
+from cei6.models import ListingItem
+from cei6.sqlite_store import SqliteBackend
+from cei6.state import load_state, save_state
+
+PAGE_SIZE = 10
+
+
+def _url(n):
+    return f"https://cei.org/blog/post-{n}/"
+
+
+class Site:
+    """Fake listing crawler plus detail fetcher, counting what was produced and fetched."""
+
+    def __init__(self, pages, fail=()):
+        self.pages = pages
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+        self.produced = 0
+        self.fetched = []
+        self.max_lag = 0
+
+    def crawler(self, max_pages=None, known_urls=None, start_page=1, on_stop=None, window=None):
+        for page in range(start_page, self.pages + 1):
+            items = [
+                ListingItem("blogs", f"Post {n}", _url(n))
+                for n in range((page - 1) * PAGE_SIZE, page * PAGE_SIZE)
+            ]
+            with self.lock:
+                self.produced += len(items)
+            yield page, items
+        if on_stop:
+            on_stop("end", self.pages)
+
+    def fetch(self, url):
+        with self.lock:
+            self.fetched.append(url)
+            self.max_lag = max(self.max_lag, self.produced - len(self.fetched))
+        if url in self.fail:
+            raise RuntimeError("detail down")
+        return url
+
+    @staticmethod
+    def parse(html, url):
+        return BlogDetail("blogs", url, url, None, None, [], "", [], [])
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    monkeypatch.setattr(state_mod, "OUT_STATE_DIR", str(tmp_path / "state"))
+    backend = SqliteBackend(str(tmp_path / "cei6.sqlite"))
+    yield backend
+    backend.close()
+
+
+def _use(monkeypatch, site):
+    monkeypatch.setitem(DETAIL_PARSERS, "blogs", (site.fetch, site.parse))
+
+
+def test_stream_queue_bounds_how_far_listings_run_ahead(env, monkeypatch):
+    site = Site(pages=20)
+    _use(monkeypatch, site)
+    crawl = ListingCrawl("blogs", site.crawler, env, write=True)
+
+    stats = stream_type(crawl, details=True, detail_options={"concurrency": 1}, queue_size=4)
+
+    assert stats == {"pages": 20, "listings": 200, "details": 200}
+    # queue + the page the producer is blocked in + the item being fetched
+    assert site.max_lag <= 4 + PAGE_SIZE + 1
+    assert load_state("blogs").pending_details == []
+
+
+def test_stream_resume_fetches_pending_details_first(env, monkeypatch):
+    site = Site(pages=1, fail={_url(3)})
+    _use(monkeypatch, site)
+    carried = ["https://cei.org/blog/left-over-1/", "https://cei.org/blog/left-over-2/"]
+    st = load_state("blogs")
+    st.pending_details = carried
+    save_state(st)
+
+    crawl = ListingCrawl("blogs", site.crawler, env, write=True, resume=True)
+    stats = stream_type(crawl, details=True, detail_options={"concurrency": 2})
+
+    assert site.fetched[:2] == carried
+    assert stats["details"] == 2 + PAGE_SIZE - 1
+    assert env.known_urls("blogs", kind="details") >= set(carried)
+    # the failed fetch stays queued for the next run
+    assert load_state("blogs").pending_details == [_url(3)]